@@ -0,0 +1,228 @@
+"""
+JSON API 벤치마크
+utils.api 서버를 새 프로세스로 띄우고(--url을 주면 떠 있는 서버 사용) keep-alive 연결 여러 개로
+끝점마다 초당 처리 요청 수와 지연 시간 백분위(p50/p90/p99/최대)를 측정
+
+서버는 프로세스 하나(코어 하나)로 실행되고, 클라이언트가 병목이 되지 않도록
+요청 보내는 쪽은 --client-procs개 프로세스로 나누어 실행함
+
+실행:
+    python -m benchmarks.bench_api --duration 5 --connections 64 --scenarios problem grade grade-batch
+    python -m benchmarks.bench_api --url 127.0.0.1:8080 --scenarios grade
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from utils.session import ProblemRecord
+from utils.units import QUANTITIES
+
+SCENARIOS = ('health', 'problem', 'problems', 'grade', 'grade-batch', 'mix')
+
+# 묶음 끝점의 묶음 크기
+BATCH_SIZE = 100
+# 채점 시나리오에서 틀린 답을 낼 비율
+WRONG_RATE = 0.3
+
+
+def _request(method, path, payload=None):
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    return (f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode('ascii') + body
+
+
+async def _exchange(reader, writer, request):
+    """요청 하나를 보내고 (상태, 본문) 반환"""
+    writer.write(request)
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line[:15].lower() == b'content-length:':
+            length = int(line[15:])
+    return status, await reader.readexactly(length)
+
+
+async def _tokens(host, port, count):
+    """채점 시나리오에 쓸 문제와 정답 (영역을 골고루)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(os.getpid())
+    items = []
+    quantities = ('length', 'capacity', 'weight')
+    for index in range(count // BATCH_SIZE + 1):
+        _, body = await _exchange(reader, writer, _request(
+            'POST', '/v1/problems', {'quantity': quantities[index % 3], 'count': BATCH_SIZE}))
+        items.extend(json.loads(body)['problems'])
+    writer.close()
+    graded = []
+    for problem in items[:count]:
+        # 클라이언트가 아는 것(영역, 제시값, 제시 단위)만으로 정답 계산
+        quantity = QUANTITIES[problem['quantity']]
+        unit_code = quantity.unit_index[problem['unit']]
+        value = Decimal(problem['display_value']).scaleb(quantity.units[unit_code].exponent)
+        answers = [format(answer, 'f') for answer in ProblemRecord(quantity, int(value), unit_code).correct_answers]
+        if rng.random() < WRONG_RATE:
+            target = rng.randrange(len(answers))
+            answers[target] = format(Decimal(answers[target]).scaleb(rng.choice((-3, -1, 1, 3))), 'f')
+        graded.append({'token': problem['token'], 'answers': answers})
+    return graded
+
+
+def _requests(scenario, items, rng):
+    """시나리오의 요청 바이트를 끝없이 만들어 내는 생성기"""
+    problem_paths = [_request('GET', f'/v1/problem?quantity={key}') for key in ('length', 'capacity', 'weight')]
+    problems = _request('POST', '/v1/problems', {'quantity': 'length', 'count': BATCH_SIZE})
+    grades = [_request('POST', '/v1/grade', item) for item in items]
+    batches = [
+        _request('POST', '/v1/grade/batch', {'items': [items[(start + k) % len(items)] for k in range(BATCH_SIZE)]})
+        for start in range(0, len(items), BATCH_SIZE)
+    ]
+    health = _request('GET', '/v1/health')
+    while True:
+        kind = scenario
+        if scenario == 'mix':
+            # 키오스크 사용 흉내: 문제 받기와 채점이 반반
+            kind = 'problem' if rng.random() < 0.5 else 'grade'
+        if kind == 'health':
+            yield health
+        elif kind == 'problem':
+            yield rng.choice(problem_paths)
+        elif kind == 'problems':
+            yield problems
+        elif kind == 'grade':
+            yield rng.choice(grades)
+        else:
+            yield rng.choice(batches)
+
+
+async def _client(host, port, scenario, connections, duration, items):
+    rng = random.Random(os.getpid())
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def connection():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        sock = writer.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        requests = _requests(scenario, items, rng)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await _exchange(reader, writer, next(requests))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+        writer.close()
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return latencies, errors
+
+
+def _client_process(args):
+    host, port, scenario, connections, duration = args
+    items = asyncio.run(_tokens(host, port, 500)) if scenario in ('grade', 'grade-batch', 'mix') else []
+    return asyncio.run(_client(host, port, scenario, connections, duration, items))
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_scenario(host, port, scenario, connections, duration, procs):
+    """
+    시나리오 하나 측정
+    Returns:
+        dict: {'scenario', 'requests', 'errors', 'rps', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'}
+    """
+    shares = [connections // procs + (1 if index < connections % procs else 0) for index in range(procs)]
+    jobs = [(host, port, scenario, share, duration) for share in shares if share]
+    with multiprocessing.Pool(len(jobs)) as pool:
+        results = pool.map(_client_process, jobs)
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(error for _, error in results)
+    return {
+        'scenario': scenario,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / duration,
+        'p50_ms': _percentile(latencies, 0.5) * 1000,
+        'p90_ms': _percentile(latencies, 0.9) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port):
+    """utils.api 서버를 새 프로세스로 시작하고 연결을 받을 때까지 기다림"""
+    env = dict(os.environ, API_SECRET=os.environ.get('API_SECRET', 'bench-secret'))
+    process = subprocess.Popen([sys.executable, '-m', 'utils.api', '--port', str(port)], env=env,
+                               stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("API 서버가 시작되지 않았습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='이미 떠 있는 서버 (호스트:포트), 없으면 새로 띄움')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=['problem', 'grade', 'grade-batch'])
+    parser.add_argument('--connections', type=int, default=64, help='동시 연결 수')
+    parser.add_argument('--duration', type=float, default=5.0, help='시나리오마다 측정할 시간(초)')
+    parser.add_argument('--client-procs', type=int, default=min(4, os.cpu_count() or 1),
+                        help='요청을 보내는 프로세스 수')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        host, _, port = args.url.rpartition(':')
+        port = int(port)
+    else:
+        host, port = '127.0.0.1', _free_port()
+        process = _start_server(port)
+    try:
+        results = [
+            run_scenario(host, port, scenario, args.connections, args.duration, args.client_procs)
+            for scenario in args.scenarios
+        ]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+    print(f"연결 {args.connections}개, 클라이언트 프로세스 {args.client_procs}개, 시나리오마다 {args.duration:g}초 "
+          f"(grade-batch, problems는 요청당 {BATCH_SIZE}문제)")
+    print(f"{'시나리오':<12}{'요청/초':>10}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'최대(ms)':>10}{'오류':>7}")
+    for row in results:
+        print(f"{row['scenario']:<12}{row['rps']:>10.0f}{row['p50_ms']:>10.2f}{row['p90_ms']:>10.2f}"
+              f"{row['p99_ms']:>10.2f}{row['max_ms']:>10.2f}{row['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+문제 생성 벤치마크
+generate_*_problem() 반복 호출(스칼라)과 generate_*_problems() 배치 생성 비교
+
+실행: python -m benchmarks.bench_generator [-n 100000]
+"""
+
+import argparse
+import time
+from utils.generator import (
+    generate_length_problem,
+    generate_capacity_problem,
+    generate_weight_problem,
+    generate_length_problems,
+    generate_capacity_problems,
+    generate_weight_problems
+)
+
+
+CASES = [
+    ('length', generate_length_problem, generate_length_problems),
+    ('capacity', generate_capacity_problem, generate_capacity_problems),
+    ('weight', generate_weight_problem, generate_weight_problems),
+]
+
+
+def measure(func):
+    """func()의 실행 시간(초) 측정"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', type=int, default=100000, help='생성할 문제 수')
+    args = parser.parse_args()
+    n = args.n
+
+    print(f"{'영역':<10}{'스칼라(s)':>12}{'배치(s)':>12}{'배치+전체 행(s)':>18}{'배속':>10}")
+    for name, scalar, batch in CASES:
+        scalar_time = measure(lambda: [scalar() for _ in range(n)])
+        batch_time = measure(lambda: batch(n, seed=0))
+        materialized_time = measure(lambda: list(batch(n, seed=0)))
+        print(f"{name:<10}{scalar_time:>12.3f}{batch_time:>12.4f}"
+              f"{materialized_time:>18.3f}{scalar_time / batch_time:>10.0f}x")
+
+
+if __name__ == '__main__':
+    main()
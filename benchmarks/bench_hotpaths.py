@@ -0,0 +1,178 @@
+"""
+핫 패스 마이크로벤치마크
+변환(convert_*), 비교(compare_decimal_values), 힌트(get_wrong_units_and_hints),
+문제 생성(generate_*_problem)을 한 번 호출 / 대량(10^5~10^6회) 호출로 측정
+
+실행:
+    python -m benchmarks.bench_hotpaths -o result.json
+    python -m benchmarks.bench_hotpaths -n 1000000 --baseline result.json --threshold 10
+--baseline을 주면 호출당 시간이 threshold(%)보다 더 느려진 항목이 있을 때 종료 코드 1
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+from utils.converter import (
+    convert_length,
+    convert_capacity,
+    convert_weight,
+    compare_decimal_values,
+    get_wrong_units_and_hints
+)
+from utils.generator import (
+    generate_length_problem,
+    generate_capacity_problem,
+    generate_weight_problem
+)
+from utils.units import LENGTH
+
+
+def _length_inputs(n, rng):
+    """길이 문제 n개의 (사용자 답, 정답) 목록 - 약 1/4은 틀린 답"""
+    rows = []
+    for _ in range(n):
+        correct = list(convert_length(Decimal(rng.randint(100, 100000))).values())
+        user = [answer * 10 if rng.random() < 0.07 else answer for answer in correct]
+        rows.append((user, correct))
+    return rows
+
+
+def build_cases(n, seed):
+    """
+    벤치마크 항목 목록 생성
+    Returns:
+        list: (이름, 한 번 호출 함수, 대량 호출 함수) - 대량 함수는 n번 호출
+    """
+    rng = random.Random(seed)
+    values = [Decimal(rng.randint(100, 1000000)) for _ in range(n)]
+    rows = _length_inputs(n, rng)
+    pairs = [(user[3], correct[3]) for user, correct in rows]
+    units = list(LENGTH.symbols)
+    hints = LENGTH.hint_messages
+    sample_value = values[0]
+    sample_user, sample_correct = rows[0]
+
+    def bulk(func):
+        return lambda: [func(value) for value in values]
+
+    cases = [
+        ('convert_length', lambda: convert_length(sample_value), bulk(convert_length)),
+        ('convert_capacity', lambda: convert_capacity(sample_value), bulk(convert_capacity)),
+        ('convert_weight', lambda: convert_weight(sample_value), bulk(convert_weight)),
+        ('compare_decimal_values',
+         lambda: compare_decimal_values(sample_user[3], sample_correct[3]),
+         lambda: [compare_decimal_values(user, correct) for user, correct in pairs]),
+        ('get_wrong_units_and_hints',
+         lambda: get_wrong_units_and_hints(sample_user, sample_correct, units, hints),
+         lambda: [get_wrong_units_and_hints(user, correct, units, hints) for user, correct in rows]),
+    ]
+    for name, func in [('generate_length_problem', generate_length_problem),
+                       ('generate_capacity_problem', generate_capacity_problem),
+                       ('generate_weight_problem', generate_weight_problem)]:
+        cases.append((name, func, lambda func=func: [func() for _ in range(n)]))
+    return cases
+
+
+def measure_single(func, repeat):
+    """한 번 호출의 시간(ns) - 자동으로 정한 반복 횟수로 repeat번 재서 최솟값"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def measure_bulk(func, n, repeat):
+    """n번 호출의 호출당 시간(ns) - repeat번 재서 최솟값"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e9
+
+
+def run(n, repeat, seed, only=None):
+    """
+    모든 항목 측정
+    Returns:
+        dict: {'meta': {...}, 'results': {이름: {'single_ns', 'bulk_ns', 'bulk_n'}}}
+    """
+    random.seed(seed)
+    results = {}
+    for name, single, bulk in build_cases(n, seed):
+        if only and name not in only:
+            continue
+        results[name] = {
+            'single_ns': round(measure_single(single, repeat), 1),
+            'bulk_ns': round(measure_bulk(bulk, n, repeat), 1),
+            'bulk_n': n
+        }
+        print(f"{name:<28}{results[name]['single_ns']:>12.1f}{results[name]['bulk_ns']:>12.1f}",
+              file=sys.stderr)
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    기준 결과보다 threshold(%) 넘게 느려진 항목 찾기
+    Returns:
+        list: (이름, 측정값 키, 기준 ns, 현재 ns, 변화율 %) 목록
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        for key in ('single_ns', 'bulk_ns'):
+            change = (result[key] - base[key]) / base[key] * 100
+            print(f"{name:<28}{key:<10}{base[key]:>12.1f}{result[key]:>12.1f}{change:>+9.1f}%",
+                  file=sys.stderr)
+            if change > threshold:
+                regressions.append((name, key, base[key], result[key], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=100000, help='대량 호출 횟수 (기본 10^5)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수 (최솟값 사용)')
+    parser.add_argument('--seed', type=int, default=0, help='입력 데이터 난수 시드')
+    parser.add_argument('--only', nargs='*', help='측정할 항목 이름')
+    parser.add_argument('-o', '--output', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=10.0, help='허용하는 최대 감속률 (%%)')
+    args = parser.parse_args(argv)
+
+    print(f"{'항목':<28}{'1회(ns)':>12}{'대량(ns/회)':>12}", file=sys.stderr)
+    current = run(args.n, args.repeat, args.seed, args.only)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            for name, key, base, now, change in regressions:
+                print(f"느려짐: {name} {key} {base:.1f} → {now:.1f} ns ({change:+.1f}%)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
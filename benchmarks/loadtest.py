@@ -0,0 +1,249 @@
+"""
+동시 세션 부하 테스트
+streamlit.testing.v1.AppTest로 streamlit_app.py를 화면 없이 실행하며
+학생 N명이 동시에 영역을 고르고, 답을 입력하고, 정답/오답을 제출하는 상황을 흉내 냄
+
+학생 수마다 새 프로세스에서 측정하여 다음을 보고:
+- 재실행(제출 1회) 지연 시간 백분위 (p50/p90/p99/최대)
+- 제출 1회당 스크립트 스레드 CPU 시간
+- 최대 RSS (프로세스 전체, 학생 수별)
+- 제출 1회에 브라우저로 보내는 델타 메시지 크기 (바이트)
+- 제출을 마친 세션 하나의 세션 상태 크기 (utils.session.session_size)
+
+AppTest는 항상 전체 스크립트를 다시 실행하므로, 제출 버튼이 조각(st.fragment) 안에 있으면
+브라우저처럼 그 조각만 다시 실행하도록 요청함 (--full-reruns로 끄면 전체 재실행과 비교 가능)
+
+실행:
+    python -m benchmarks.loadtest --students 1 10 30 --submits 20 --rate 0.5 --wrong-rate 0.3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from utils.session import session_size
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app.py')
+
+# 마지막 실행(제출 1회, st.rerun 포함)의 측정값 - 학생 스레드별
+#   cpu: 스크립트 스레드 CPU 시간, delta_bytes: 델타 메시지 크기 합,
+#   fragments: {위젯 id: 조각 id}, fragment_id: 다음 실행에서 다시 실행할 조각
+_last_run = threading.local()
+
+
+def _share_mock_runtime():
+    """
+    AppTest를 여러 스레드에서 동시에 돌릴 수 있도록 실제 서버처럼 공유 상태를 맞춤
+    - AppTest는 실행이 끝날 때마다 전역 Runtime을 None으로 되돌리므로
+      마지막으로 설정된 모의 Runtime을 계속 돌려줌
+    - 실행마다 새 ScriptCache로 스크립트를 다시 컴파일하지 않고 하나를 공유함
+    """
+    shared_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: shared_cache
+    last = [None]
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[0] = cls._instance
+        if last[0] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or last[0] is not None)
+
+
+def _install_script_timer():
+    """
+    LocalScriptRunner가 스크립트 스레드의 CPU 시간과 보낸 델타 크기를 기록하고,
+    _last_run.fragment_id가 있으면 그 조각만 다시 실행하도록 감쌈
+    """
+    run_script_thread = LocalScriptRunner._run_script_thread
+    run = LocalScriptRunner.run
+    rerun_data = local_script_runner.RerunData
+
+    def fragment_rerun_data(**kwargs):
+        fragment_id = getattr(_last_run, 'fragment_id', None)
+        if fragment_id:
+            kwargs['fragment_id_queue'] = [fragment_id]
+        return rerun_data(**kwargs)
+
+    def timed_run_script_thread(self):
+        start = time.thread_time()
+        try:
+            run_script_thread(self)
+        finally:
+            self._loadtest_cpu = time.thread_time() - start
+
+    def timed_run(self, *args, **kwargs):
+        queue = self.forward_msg_queue
+        enqueue = queue.enqueue
+        delta_bytes = 0
+        fragments = {}
+
+        def counting_enqueue(msg):
+            nonlocal delta_bytes
+            if msg.WhichOneof('type') == 'delta':
+                delta_bytes += msg.ByteSize()
+                element = msg.delta.new_element
+                widget = element.WhichOneof('type') and getattr(element, element.WhichOneof('type'))
+                if msg.delta.fragment_id and getattr(widget, 'id', None):
+                    fragments[widget.id] = msg.delta.fragment_id
+            return enqueue(msg)
+
+        queue.enqueue = counting_enqueue
+        try:
+            return run(self, *args, **kwargs)
+        finally:
+            _last_run.cpu = getattr(self, '_loadtest_cpu', 0.0)
+            _last_run.delta_bytes = delta_bytes
+            _last_run.fragments = fragments
+
+    LocalScriptRunner._run_script_thread = timed_run_script_thread
+    LocalScriptRunner.run = timed_run
+    local_script_runner.RerunData = fragment_rerun_data
+
+
+def percentile(values, pct):
+    """정렬된 값 목록의 백분위 (최근접 순위)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _widget_fragment(key):
+    """마지막 실행에서 key 위젯이 속한 조각 id (조각 밖이면 None)"""
+    for widget_id, fragment_id in _last_run.fragments.items():
+        if widget_id.endswith(f'-{key}'):
+            return fragment_id
+    return None
+
+
+def simulate_student(student, args, latencies, cpu_times, delta_sizes, errors, session_bytes, start_barrier):
+    """
+    학생 한 명의 세션: 영역 선택 후 submits번 제출
+    Args:
+        student (int): 학생 번호 (난수 시드)
+        args: 명령행 인자
+        latencies, cpu_times, delta_sizes, errors, session_bytes (list): 결과를 모을 공유 리스트
+        start_barrier (threading.Barrier): 모든 학생이 동시에 시작하도록 맞춤
+    """
+    rng = random.Random(student)
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    at.run()
+    start_barrier.wait()
+    quantity = args.quantity or rng.choice(['length', 'capacity', 'weight'])
+    at.button(key=f'btn_{quantity}').click().run()
+
+    for _ in range(args.submits):
+        if args.rate > 0:
+            time.sleep(rng.expovariate(args.rate))
+        problem = at.session_state.current_problem
+        correct_answers = problem.correct_answers
+        answers = [str(answer) for answer in correct_answers]
+        if rng.random() < args.wrong_rate:
+            wrong = rng.randrange(len(answers))
+            answers[wrong] = str(correct_answers[wrong] * 10)
+        for text_input, answer in zip(at.text_input, answers):
+            text_input.input(answer)
+        submit_key = f'submit_{quantity}'
+        at.button(key=submit_key).click()
+
+        _last_run.fragment_id = None if args.full_reruns else _widget_fragment(submit_key)
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        _last_run.fragment_id = None
+        cpu_times.append(_last_run.cpu)
+        delta_sizes.append(_last_run.delta_bytes)
+        if at.exception:
+            errors.append(str(at.exception[0].value))
+    session_bytes.append(session_size(at.session_state.to_dict())['total'])
+
+
+def run_level(students, args):
+    """학생 수 하나에 대해 측정 (새 프로세스에서 호출)"""
+    # 풀이 기록은 임시 파일에 남김 (실제 기록 파일을 더럽히지 않음)
+    os.environ.setdefault('ATTEMPT_LOG_PATH', os.path.join(tempfile.mkdtemp(), 'attempts.db'))
+    _share_mock_runtime()
+    _install_script_timer()
+    latencies, cpu_times, delta_sizes, errors, session_bytes = [], [], [], [], []
+    barrier = threading.Barrier(students)
+    threads = [
+        threading.Thread(target=simulate_student,
+                         args=(student, args, latencies, cpu_times, delta_sizes, errors, session_bytes, barrier))
+        for student in range(students)
+    ]
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        'students': students,
+        'submits': len(latencies),
+        'errors': len(errors),
+        'wall_s': round(wall, 3),
+        'throughput_per_s': round(len(latencies) / wall, 2) if wall else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p90': round(percentile(latencies, 90) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(latencies[-1] * 1000 if latencies else 0.0, 2)
+        },
+        'delta_bytes_per_submit': round(sum(delta_sizes) / len(delta_sizes)) if delta_sizes else 0,
+        'session_bytes': round(sum(session_bytes) / len(session_bytes)) if session_bytes else 0,
+        'script_cpu_ms_per_submit': round(sum(cpu_times) / len(cpu_times) * 1000, 3) if cpu_times else 0.0,
+        # Linux는 KB, macOS는 바이트 단위
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, nargs='+', default=[1, 10, 30], help='동시 학생 수 (여러 개 가능)')
+    parser.add_argument('--submits', type=int, default=20, help='학생당 제출 횟수')
+    parser.add_argument('--rate', type=float, default=0.0, help='학생당 초당 제출 횟수 (0이면 쉬지 않고 제출)')
+    parser.add_argument('--wrong-rate', type=float, default=0.3, help='오답 제출 비율')
+    parser.add_argument('--quantity', choices=['length', 'capacity', 'weight'], help='영역 고정 (생략 시 무작위)')
+    parser.add_argument('--timeout', type=float, default=30, help='재실행 1회 제한 시간(초)')
+    parser.add_argument('--full-reruns', action='store_true', help='조각만 다시 실행하지 않고 항상 전체 재실행 (비교용)')
+    parser.add_argument('-o', '--output', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    reports = []
+    print(f"{'학생':>6}{'제출':>7}{'오류':>6}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}"
+          f"{'최대(ms)':>10}{'CPU/제출(ms)':>14}{'처리량(/s)':>12}{'RSS(MB)':>10}{'델타(B)':>10}{'세션(B)':>10}")
+    for students in args.students:
+        with context.Pool(1) as pool:
+            report = pool.apply(run_level, (students, args))
+        reports.append(report)
+        latency = report['latency_ms']
+        print(f"{students:>6}{report['submits']:>7}{report['errors']:>6}{latency['p50']:>10}{latency['p90']:>10}"
+              f"{latency['p99']:>10}{latency['max']:>10}{report['script_cpu_ms_per_submit']:>14}"
+              f"{report['throughput_per_s']:>12}{report['peak_rss_mb']:>10}{report['delta_bytes_per_submit']:>10}{report['session_bytes']:>10}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'levels': reports}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
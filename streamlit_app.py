@@ -5,17 +5,27 @@ Decimal 기반 정확한 계산 및 개별 단위 비교 로직
 """
 
 import streamlit as st
-from decimal import Decimal, InvalidOperation
+import hmac
+import io
+import os
+import sqlite3
 import time
-from utils.generator import (
-    generate_length_problem,
-    generate_capacity_problem,
-    generate_weight_problem
-)
-from utils.converter import (
-    compare_decimal_values,
-    get_wrong_units_and_hints
-)
+import uuid
+from contextlib import closing
+from decimal import Decimal, InvalidOperation
+from utils.generator import ProblemStream
+from utils.adaptive import AdaptiveStream
+from utils.session import ProblemRecord, AttemptHistory, dump_session, load_session
+from utils.state_store import StoreError, open_store, valid_key
+from utils.converter import grade_answers
+from utils.diagnosis import diagnose, PATTERN_LABELS
+from utils.units import QUANTITIES
+from utils.export import FORMATS, write_export
+from utils.item_bank import load_bank
+from utils.assets import stylesheet_html
+from utils.attempt_log import AttemptLog, DEFAULT_DB_PATH
+from utils.classroom import ClassroomHub, MAX_NAME_LENGTH
+from utils import analytics, metrics, profiling
 
 
 # 페이지 설정
@@ -26,72 +36,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# 커스텀 CSS 스타일링
-st.markdown("""
-    <style>
-    .main { padding: 2rem; }
-    .title {
-        text-align: center;
-        font-size: 2.5rem;
-        margin-bottom: 2rem;
-        color: #FF6B6B;
-    }
-    .problem-display {
-        background-color: #F0F4FF;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 1.5rem 0;
-        border: 3px solid #4C6EF5;
-    }
-    .problem-value {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #2C3E50;
-        margin: 1rem 0;
-    }
-    .problem-question {
-        font-size: 1.2rem;
-        color: #555;
-        margin: 1rem 0;
-    }
-    .input-section {
-        background-color: #F9F9F9;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 1.5rem 0;
-    }
-    .success-message {
-        background-color: #D4EDDA;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 5px;
-        text-align: center;
-        font-size: 1.2rem;
-        font-weight: bold;
-        margin: 1rem 0;
-        border: 2px solid #28a745;
-    }
-    .error-message {
-        background-color: #F8D7DA;
-        color: #721C24;
-        padding: 1rem;
-        border-radius: 5px;
-        text-align: center;
-        font-size: 1.2rem;
-        font-weight: bold;
-        margin: 1rem 0;
-        border: 2px solid #dc3545;
-    }
-    .hint-box {
-        background-color: #E7F3FF;
-        border-left: 4px solid #2196F3;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 4px;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# 커스텀 CSS 스타일링 (static/app.css를 한 번만 내려받고, 재실행 때는 짧은 <link>만 전송)
+st.markdown(stylesheet_html(st.get_option('server.enableStaticServing')), unsafe_allow_html=True)
 
 
 # 개념 설명 콘텐츠
@@ -161,30 +107,104 @@ WEIGHT_CONCEPT = """
 - 작은 차 한 대: 약 1 t
 """
 
-# 길이 힌트 메시지
-LENGTH_HINT_MESSAGES = {
-    'mm': "❌ mm 단위가 틀렸습니다.\n💡 1cm = 10mm 관계를 다시 확인해보세요.",
-    'cm': "❌ cm 단위가 틀렸습니다.\n💡 1m = 100cm 관계를 다시 확인해보세요.",
-    'm': "❌ m 단위가 틀렸습니다.\n💡 1km = 1000m 관계를 다시 확인해보세요.",
-    'km': "❌ km 단위가 틀렸습니다.\n💡 1km = 1,000,000mm 관계를 다시 확인해보세요."
+# 학급 퀴즈(?seed=...)에서 모든 학생이 공유하는 앞부분 문제 수
+SHARED_PREFETCH = 50
+
+# 세션마다 보관하는 최근 풀이 기록 수 (세션 메모리와 직결되므로 작게 유지)
+ATTEMPT_HISTORY_CAP = 20
+
+# 수업 순위표 조각을 다시 실행하는 간격(초)과 표시 줄 수 (학생 화면 / 선생님 화면)
+LEADERBOARD_REFRESH = 3
+LEADERBOARD_ROWS = 10
+TEACHER_LEADERBOARD_ROWS = 100
+
+# 실행 지표 (METRICS_PORT 또는 METRICS_FILE 환경 변수가 없으면 기록하지 않음)
+SCRIPT_RUN_SECONDS = metrics.histogram('app_script_run_seconds', '전체 스크립트 실행 시간', ('page',))
+FRAGMENT_RUN_SECONDS = metrics.histogram('app_fragment_run_seconds', '답 입력 조각 실행 시간', ('quantity',))
+PROBLEM_SECONDS = metrics.histogram('app_problem_generate_seconds', '문제 생성 시간', ('quantity', 'mode'))
+GRADE_SECONDS = metrics.histogram('app_grade_seconds', '채점과 오답 진단 시간', ('quantity',))
+SUBMISSIONS = metrics.counter('app_submissions_total', '제출 수', ('quantity', 'outcome'))
+WRONG_ANSWERS = metrics.counter('app_wrong_answers_total', '틀린 단위 답 수', ('quantity', 'unit', 'pattern'))
+STORE_SECONDS = metrics.histogram('app_session_store_seconds', '세션 저장소 읽기/쓰기 시간', ('op',))
+STORE_ERRORS = metrics.counter('app_session_store_errors_total', '세션 저장소 오류 수', ('op',))
+
+# 영역별 개념 설명 (레지스트리의 영역 키 기준)
+CONCEPTS = {
+    'length': LENGTH_CONCEPT,
+    'capacity': CAPACITY_CONCEPT,
+    'weight': WEIGHT_CONCEPT
 }
 
-# 들이 힌트 메시지
-CAPACITY_HINT_MESSAGES = {
-    'mL': "❌ mL 단위가 틀렸습니다.\n💡 1L = 1,000mL 관계를 다시 확인해보세요.",
-    'L': "❌ L 단위가 틀렸습니다.\n💡 1L = 1,000mL 관계를 다시 확인해보세요."
-}
 
-# 무게 힌트 메시지
-WEIGHT_HINT_MESSAGES = {
-    'g': "❌ g 단위가 틀렸습니다.\n💡 1kg = 1,000g 관계를 다시 확인해보세요.",
-    'kg': "❌ kg 단위가 틀렸습니다.\n💡 1kg = 1,000g, 1t = 1,000kg 관계를 다시 확인해보세요.",
-    't': "❌ t 단위가 틀렸습니다.\n💡 1t = 1,000kg = 1,000,000g 관계를 다시 확인해보세요."
-}
+@st.cache_resource
+def get_session_store():
+    """
+    여러 프로세스가 함께 쓰는 세션 저장소 (SESSION_STORE 환경 변수, 없으면 None)
+    Raises:
+        StoreError: 저장소에 연결하지 못했을 때 (캐시되지 않으므로 다음 호출에서 다시 연결)
+        ValueError: 지원하지 않는 주소일 때
+    """
+    url = os.environ.get('SESSION_STORE')
+    return open_store(url) if url else None
+
+
+def restore_session():
+    """
+    외부 저장소가 있으면 주소의 학습자 id(?learner=...)로 진행 상태를 불러옴 (세션당 한 번 읽기)
+    id가 없으면 새로 만들어 주소에 붙이므로, 새로 고침하거나 다른 서버 프로세스로 연결되어도 이어서 풂
+    """
+    st.session_state.learner_id = None
+    st.session_state.stored_session = None
+    try:
+        store = get_session_store()
+    except (StoreError, ValueError):
+        # 저장소가 꺼져 있거나 주소가 틀리면 이 세션은 프로세스 안에만 보관 (실패는 캐시되지 않아 다음 세션이 다시 연결)
+        STORE_ERRORS.inc(op='open')
+        return
+    if store is None:
+        return
+    learner_id = st.query_params.get('learner', '')
+    if not valid_key(learner_id):
+        learner_id = uuid.uuid4().hex
+        st.query_params['learner'] = learner_id
+    st.session_state.learner_id = learner_id
+    try:
+        with STORE_SECONDS.time(op='load'):
+            data = store.load(learner_id)
+    except StoreError:
+        STORE_ERRORS.inc(op='load')
+        return
+    values = load_session(data, ATTEMPT_HISTORY_CAP) if data else None
+    if values:
+        for key, value in values.items():
+            st.session_state[key] = value
+        # 풀이 시간은 프로세스마다 기준이 다른 monotonic 시각이므로 불러온 시점부터 다시 잼
+        st.session_state.problem_shown_at = time.monotonic()
+        st.session_state.stored_session = data
+
+
+def persist_session():
+    """진행 상태가 마지막 저장 이후 바뀌었을 때만 외부 저장소에 한 번 씀"""
+    learner_id = st.session_state.get('learner_id')
+    if not learner_id:
+        return
+    data = dump_session(st.session_state)
+    if data == st.session_state.stored_session:
+        return
+    try:
+        store = get_session_store()
+        with STORE_SECONDS.time(op='save'):
+            store.save(learner_id, data)
+    except (StoreError, ValueError):
+        STORE_ERRORS.inc(op='save')
+        return
+    st.session_state.stored_session = data
 
 
 def initialize_session_state():
-    """세션 상태 초기화"""
+    """세션 상태 초기화 (외부 저장소가 있으면 저장된 진행 상태를 먼저 불러옴)"""
+    if 'learner_id' not in st.session_state:
+        restore_session()
     if 'current_page' not in st.session_state:
         st.session_state.current_page = 'home'
     if 'current_problem' not in st.session_state:
@@ -195,210 +215,456 @@ def initialize_session_state():
         st.session_state.is_correct = None
     if 'current_hints' not in st.session_state:
         st.session_state.current_hints = []
-    if 'user_last_answers' not in st.session_state:
-        st.session_state.user_last_answers = []
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if 'attempt_history' not in st.session_state:
+        st.session_state.attempt_history = AttemptHistory(ATTEMPT_HISTORY_CAP)
+    if 'problem_seed' not in st.session_state:
+        # 주소에 ?seed=숫자(ASCII)가 있으면 학급 공통 문제 열, 없으면 세션마다 독립 문제 열
+        seed = st.query_params.get('seed', '')
+        st.session_state.problem_seed = int(seed) if seed.isascii() and seed.isdigit() else None
+    if 'problem_stream' not in st.session_state:
+        st.session_state.problem_stream = None
+    if 'adaptive_mode' not in st.session_state:
+        st.session_state.adaptive_mode = False
+    if 'room_code' not in st.session_state:
+        st.session_state.room_code = None
+    if 'class_id' not in st.session_state:
+        # 주소에 ?class=3-2처럼 학급을 붙이면 선생님 화면에서 학급별로 볼 수 있음
+        st.session_state.class_id = st.query_params.get('class', '').strip()[:32]
+    if st.session_state.learner_id and st.session_state.stored_session is None:
+        # 새 학습자의 초기 상태는 저장할 필요가 없으므로 저장된 것으로 간주 (첫 실행은 읽기 한 번만)
+        st.session_state.stored_session = dump_session(st.session_state)
 
 
 initialize_session_state()
 
 
+@st.cache_resource
+def get_attempt_log():
+    """프로세스 전체가 공유하는 풀이 기록 저장소 (경로는 ATTEMPT_LOG_PATH 환경 변수)"""
+    log = AttemptLog(os.environ.get('ATTEMPT_LOG_PATH', DEFAULT_DB_PATH))
+    metrics.register_collector('app_attempt_log_queue_depth', '저장 대기 중인 풀이 기록 수',
+                               lambda: log.stats()['queue_depth'])
+    metrics.register_collector('app_attempt_log_dropped_total', '버린 풀이 기록 수 (누적)',
+                               lambda: log.stats()['dropped'], kind='counter')
+    return log
+
+
+@st.cache_resource
+def get_classroom_hub():
+    """프로세스 전체가 공유하는 실시간 수업 허브 (수업 목록과 순위표)"""
+    return ClassroomHub()
+
+
+@st.cache_resource
+def start_metrics_exporters():
+    """실행 지표 내보내기 시작 (프로세스당 한 번)"""
+    return metrics.start_exporters()
+
+
+start_metrics_exporters()
+
+
+def next_problem_record():
+    """세션 문제 열의 다음 문제를 압축 표현으로 반환 (제시 시각도 기록)"""
+    stream = st.session_state.problem_stream
+    st.session_state.problem_shown_at = time.monotonic()
+    mode = 'adaptive' if type(stream) is AdaptiveStream else 'random'
+    with PROBLEM_SECONDS.time(quantity=stream.quantity, mode=mode):
+        problem = stream.next_problem()
+    return ProblemRecord.from_problem(stream.quantity, problem)
+
+
+def start_problems(quantity, seed, adaptive=False):
+    """영역의 문제 풀이 시작 (새 문제 열의 첫 문제를 냄)"""
+    st.session_state.current_page = quantity.key
+    if adaptive:
+        st.session_state.problem_stream = AdaptiveStream(quantity, seed)
+    else:
+        st.session_state.problem_stream = ProblemStream(
+            quantity, seed, prefetch=SHARED_PREFETCH if seed is not None else 0
+        )
+    st.session_state.current_problem = next_problem_record()
+    st.session_state.problem_count = 1
+    st.session_state.is_correct = None
+    st.session_state.current_hints = []
+
+
+def join_room(room, name):
+    """수업에 들어가 수업의 영역과 시드로 문제 풀이 시작 (모든 학생이 같은 문제 열)"""
+    room.join(st.session_state.session_id, name)
+    st.session_state.room_code = room.code
+    start_problems(QUANTITIES[room.quantity], room.seed)
+
+
+def leave_room():
+    """수업에서 나감 (수업이 이미 닫혔어도 됨)"""
+    room = get_classroom_hub().get(st.session_state.room_code)
+    if room is not None:
+        room.leave(st.session_state.session_id)
+    st.session_state.room_code = None
+
+
 def show_home_page():
     """초기 화면 표시"""
     st.markdown("<div class='title'>📐 단위 변환 학습</div>", unsafe_allow_html=True)
     
-    st.markdown("""
-    <div style='text-align: center; font-size: 1.1rem; color: #555; margin: 2rem 0;'>
-    <p><strong>다음 중 학습하고 싶은 단위를 선택하세요!</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("📏 길이", key="btn_length", use_container_width=True):
-            st.session_state.current_page = 'length'
-            st.session_state.current_problem = generate_length_problem()
-            st.session_state.problem_count = 1
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
+    st.markdown(
+        "<div class='home-intro'><p><strong>다음 중 학습하고 싶은 단위를 선택하세요!</strong></p></div>",
+        unsafe_allow_html=True
+    )
+    
+    # 화면을 떠나도 선택이 유지되도록 위젯 키 대신 세션 상태에 보관
+    st.session_state.adaptive_mode = st.toggle(
+        "🎯 맞춤 문제 (자주 틀리는 단위를 더 많이 출제)", value=st.session_state.adaptive_mode
+    )
+    
+    columns = st.columns(len(QUANTITIES))
+    
+    for column, quantity in zip(columns, QUANTITIES.values()):
+        with column:
+            if st.button(f"{quantity.icon} {quantity.name}", key=f"btn_{quantity.key}", use_container_width=True):
+                start_problems(quantity, st.session_state.problem_seed, st.session_state.adaptive_mode)
+                st.rerun()
+    
+    # 선생님이 연 수업: 주소의 ?room=코드가 있으면 코드를 미리 채워 펼쳐 둠
+    room_code = st.query_params.get('room', '')
+    with st.expander("🏫 수업 참여", expanded=bool(room_code)):
+        col1, col2 = st.columns(2)
+        with col1:
+            code = st.text_input("수업 코드", value=room_code, key="join_code")
+        with col2:
+            name = st.text_input("이름", max_chars=MAX_NAME_LENGTH, key="join_name")
+        if st.button("참여", key="btn_join", use_container_width=True, disabled=not code.strip()):
+            room = get_classroom_hub().get(code)
+            if room is None:
+                st.error("수업을 찾을 수 없습니다. 코드를 확인해주세요.")
+            else:
+                join_room(room, name)
+                st.rerun()
     
-    with col2:
-        if st.button("🥤 들이", key="btn_capacity", use_container_width=True):
-            st.session_state.current_page = 'capacity'
-            st.session_state.current_problem = generate_capacity_problem()
-            st.session_state.problem_count = 1
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
+    if st.button("🖨️ 학습지 만들기", key="btn_export", use_container_width=True):
+        st.session_state.current_page = 'export'
+        st.rerun()
     
-    with col3:
-        if st.button("⚖️ 무게", key="btn_weight", use_container_width=True):
-            st.session_state.current_page = 'weight'
-            st.session_state.current_problem = generate_weight_problem()
-            st.session_state.problem_count = 1
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
+    # 선생님 비밀번호를 지정한 서버에서만 보임 (학생 화면에는 선생님 메뉴가 없음)
+    if teacher_password() and st.button("📊 선생님 화면", key="btn_teacher", use_container_width=True):
+        st.session_state.current_page = 'teacher'
+        st.rerun()
 
 
-def show_length_problem():
-    """길이 변환 문제 화면"""
-    st.markdown("<div class='title'>📏 길이 변환</div>", unsafe_allow_html=True)
-    
-    with st.expander("📘 개념 설명 보기"):
-        st.markdown(LENGTH_CONCEPT)
-    
-    problem = st.session_state.current_problem
-    
-    st.markdown(f"""
-    <div class='problem-display'>
-        <div class='problem-value'>{problem['display_value']} {problem['unit']}</div>
-        <div class='problem-question'>
-        다음 값을 mm, cm, m, km 단위로 변환하여<br/>
-        순서대로 정답을 입력하시오.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # 정답/오답 상태 표시
-    if st.session_state.is_correct is not None:
-        if st.session_state.is_correct:
-            st.markdown(
-                "<div class='success-message'>🎉 정답입니다!</div>",
-                unsafe_allow_html=True
-            )
-            time.sleep(1)
-            st.session_state.current_problem = generate_length_problem()
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
-        else:
-            st.markdown(
-                "<div class='error-message'>❌ 정답이 옳지 않습니다. 다시 풀어보세요.</div>",
-                unsafe_allow_html=True
-            )
-            if st.session_state.current_hints:
-                with st.expander("🔍 힌트 보기"):
-                    for hint in st.session_state.current_hints:
-                        st.markdown(f"<div class='hint-box'>{hint}</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='input-section'><p><strong>정답을 입력하세요:</strong></p>", unsafe_allow_html=True)
+# 내보내기 형식별 MIME 타입
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/jsonl',
+    'html': 'text/html'
+}
+
+
+def build_export_file(quantity_keys, count, seed, fmt, answer_key, decimals=None):
+    """학습지/정답지를 다운로드 버퍼에 흘려 쓰고 바이트로 반환"""
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    write_export(text, quantity_keys, count, seed, fmt, answer_key, decimals)
+    text.flush()
+    text.detach()
+    return buffer.getvalue()
+
+
+def show_export_page():
+    """학습지/정답지 내보내기 화면"""
+    st.markdown("<div class='title'>🖨️ 학습지 만들기</div>", unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    quantity_keys = st.multiselect(
+        "영역",
+        list(QUANTITIES),
+        default=list(QUANTITIES),
+        format_func=lambda key: f"{QUANTITIES[key].icon} {QUANTITIES[key].name}",
+        key="export_quantities"
+    )
+    col1, col2, col3 = st.columns(3)
     with col1:
-        mm_input = st.text_input("mm", placeholder="예: 1000", key="length_mm")
-        cm_input = st.text_input("cm", placeholder="예: 100", key="length_cm")
+        count = st.number_input("영역별 문제 수", min_value=1, max_value=100000, value=30, key="export_count")
     with col2:
-        m_input = st.text_input("m", placeholder="예: 1", key="length_m")
-        km_input = st.text_input("km", placeholder="예: 0.001", key="length_km")
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    if st.button("정답 제출", key="submit_length", use_container_width=True):
-        # 입력값 검증
-        inputs = [mm_input, cm_input, m_input, km_input]
-        units = ['mm', 'cm', 'm', 'km']
-        user_answers = []
-        valid = True
-        
-        for inp, unit in zip(inputs, units):
-            if not inp.strip():
-                st.error(f"{unit}: 값을 입력해주세요.")
-                valid = False
-                break
-            try:
-                user_answers.append(Decimal(inp))
-            except InvalidOperation:
-                st.error(f"{unit}: 숫자를 정확히 입력해주세요.")
-                valid = False
-                break
-        
-        if valid:
-            correct_answers = problem['correct_answers']
-            # 각 단위별 개별 비교
-            all_correct = all(
-                compare_decimal_values(user, correct)
-                for user, correct in zip(user_answers, correct_answers)
+        seed = st.number_input("시드 (같은 시드 = 같은 문제)", min_value=0, value=0, key="export_seed")
+    with col3:
+        fmt = st.selectbox("형식", FORMATS, key="export_format")
+    
+    # 문제 은행을 만들어 두었을 때만 난이도(제시값 소수 자릿수)로 거를 수 있음
+    decimals = None
+    bank = load_bank()
+    if bank is not None and quantity_keys:
+        options = sorted({
+            decimals for key in quantity_keys if key in bank
+            for decimals in bank[key].index['decimals'].tolist()
+        })
+        decimals = st.multiselect("제시값 소수 자릿수 (비우면 전체)", options, key="export_decimals") or None
+    
+    if st.button("만들기", key="export_build", use_container_width=True, disabled=not quantity_keys):
+        try:
+            st.session_state.export_files = {
+                answer_key: build_export_file(quantity_keys, int(count), int(seed), fmt, answer_key, decimals)
+                for answer_key in (False, True)
+            }
+            st.session_state.export_files_format = fmt
+        except ValueError as error:
+            st.session_state.export_files = None
+            st.error(str(error))
+    
+    export_files = st.session_state.get('export_files')
+    if export_files:
+        fmt = st.session_state.export_files_format
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📄 학습지 받기", export_files[False], file_name=f"worksheet.{fmt}",
+                               mime=EXPORT_MIME_TYPES[fmt], use_container_width=True)
+        with col2:
+            st.download_button("🔑 정답지 받기", export_files[True], file_name=f"answer_key.{fmt}",
+                               mime=EXPORT_MIME_TYPES[fmt], use_container_width=True)
+    
+    if st.button("🔄 재시작", key="restart_export", use_container_width=True):
+        st.session_state.current_page = 'home'
+        st.session_state.export_files = None
+        st.rerun()
+
+
+def unit_label(row):
+    """분석 행의 '영역 단위' 표시 이름"""
+    return f"{QUANTITIES[row['quantity']].name} {row['unit']}"
+
+
+@st.fragment(run_every=LEADERBOARD_REFRESH)
+def leaderboard_panel(room_code, rows):
+    """
+    수업 순위표 (이 조각만 주기적으로 다시 실행, 전체 화면은 다시 실행하지 않음)
+    허브가 순위표를 주기마다 한 번만 만들어 공유하므로 여기서는 상위 줄과 자기 순위만 읽음
+    """
+    room = get_classroom_hub().get(room_code)
+    if room is None:
+        st.info("수업이 끝났습니다.")
+        return
+    board = room.leaderboard()
+    st.markdown(f"**🏆 수업 {room.code} 순위표** (학생 {len(board.rows)}명, 함께 맞힌 문제 {board.total_solved}개)")
+    if board.rows:
+        st.dataframe(
+            [{'순위': rank, '이름': name, '맞힌 문제': solved, '틀린 답': mistakes}
+             for rank, name, solved, mistakes in board.top(rows)],
+            hide_index=True
+        )
+    own = board.row_of(st.session_state.session_id)
+    if own is not None and own[0] > rows:
+        st.caption(f"내 순위: {own[0]}위 (맞힌 문제 {own[2]}개)")
+    if board.unit_mistakes:
+        st.caption("단위별 틀린 답: " + ", ".join(f"{unit} {count}" for unit, count in board.unit_mistakes))
+
+
+def show_classroom_admin():
+    """선생님 화면의 실시간 수업 열기/닫기와 순위표"""
+    st.subheader("🏫 실시간 수업")
+    hub = get_classroom_hub()
+    room = hub.get(st.session_state.get('teacher_room'))
+    if room is None:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            quantity = st.selectbox(
+                "수업 영역", list(QUANTITIES), key="room_quantity",
+                format_func=lambda key: f"{QUANTITIES[key].icon} {QUANTITIES[key].name}"
             )
-            
-            if all_correct:
-                st.session_state.is_correct = True
-                st.session_state.problem_count += 1
-            else:
-                st.session_state.is_correct = False
-                st.session_state.current_hints = get_wrong_units_and_hints(
-                    user_answers, correct_answers, units, LENGTH_HINT_MESSAGES
-                )
+        with col2:
+            if st.button("수업 열기", key="room_open", use_container_width=True):
+                st.session_state.teacher_room = hub.open_room(quantity).code
+                st.rerun()
+        return
+    st.markdown(f"수업 코드 **{room.code}** ({QUANTITIES[room.quantity].name}) - "
+                f"학생은 첫 화면의 '수업 참여'에 코드를 입력하거나 주소에 `?room={room.code}`를 붙여 들어옴")
+    leaderboard_panel(room.code, TEACHER_LEADERBOARD_ROWS)
+    if st.button("수업 닫기", key="room_close"):
+        hub.close(room.code)
+        st.session_state.teacher_room = None
+        st.rerun()
+
+
+def teacher_password():
+    """선생님 화면 비밀번호 (TEACHER_PASSWORD 환경 변수, 없으면 빈 문자열 = 선생님 화면 꺼짐)"""
+    return os.environ.get('TEACHER_PASSWORD', '')
+
+
+def teacher_signed_in():
+    """
+    이 세션이 선생님 비밀번호를 확인했는지 (아니면 비밀번호 입력칸을 보여줌)
+    Returns:
+        bool: 선생님 화면을 보여도 되면 True
+    """
+    password = teacher_password()
+    if not password:
+        st.info("선생님 화면이 꺼져 있습니다. 서버에 TEACHER_PASSWORD 환경 변수를 지정해 주세요.")
+        return False
+    if st.session_state.get('teacher_signed_in'):
+        return True
+    entered = st.text_input("선생님 비밀번호", type="password")
+    if st.button("확인", key="teacher_sign_in", use_container_width=True):
+        # 비교 시간으로 비밀번호를 추측하지 못하도록 상수 시간 비교
+        if hmac.compare_digest(entered.encode('utf-8'), password.encode('utf-8')):
+            st.session_state.teacher_signed_in = True
             st.rerun()
+        st.error("비밀번호가 맞지 않습니다.")
+    return False
+
+
+def show_teacher_page():
+    """선생님 화면: 실시간 수업과 단위별 오답률 (요약 표만 읽음, 비밀번호를 확인한 세션만)"""
+    st.markdown("<div class='title'>📊 선생님 화면</div>", unsafe_allow_html=True)
     
-    st.markdown(f"<p style='text-align: center; color: #666; margin-top: 2rem;'>"
-                f"<strong>풀이한 문제: {st.session_state.problem_count - 1}개</strong></p>",
-                unsafe_allow_html=True)
+    if teacher_signed_in():
+        show_classroom_admin()
+        show_teacher_dashboard()
     
-    if st.button("🔄 재시작", key="restart_length", use_container_width=True):
+    if st.button("🔄 재시작", key="restart_teacher", use_container_width=True):
         st.session_state.current_page = 'home'
         st.rerun()
 
 
-def show_capacity_problem():
-    """들이 변환 문제 화면"""
-    st.markdown("<div class='title'>🥤 들이 변환</div>", unsafe_allow_html=True)
-    
-    with st.expander("📘 개념 설명 보기"):
-        st.markdown(CAPACITY_CONCEPT)
-    
-    problem = st.session_state.current_problem
-    
-    st.markdown(f"""
-    <div class='problem-display'>
-        <div class='problem-value'>{problem['display_value']} {problem['unit']}</div>
-        <div class='problem-question'>
-        다음 값을 mL, L 단위로 변환하여<br/>
-        순서대로 정답을 입력하시오.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # 정답/오답 상태 표시
-    if st.session_state.is_correct is not None:
-        if st.session_state.is_correct:
-            st.markdown(
-                "<div class='success-message'>🎉 정답입니다!</div>",
-                unsafe_allow_html=True
+def show_teacher_dashboard():
+    """선생님 화면의 단위별 오답률과 기록 저장 상태"""
+    log = get_attempt_log()
+    with closing(sqlite3.connect(log.path)) as conn:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            quantity = st.selectbox(
+                "영역", [''] + list(QUANTITIES), key="teacher_quantity",
+                format_func=lambda key: f"{QUANTITIES[key].icon} {QUANTITIES[key].name}" if key else "전체"
             )
-            time.sleep(1)
-            st.session_state.current_problem = generate_capacity_problem()
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
+        with col2:
+            class_id = st.selectbox(
+                "학급", [''] + [key for key in analytics.class_ids(conn) if key], key="teacher_class",
+                format_func=lambda key: key or "전체"
+            )
+        with col3:
+            days = st.number_input("최근 며칠", min_value=1, max_value=365, value=7, key="teacher_days")
+        since = analytics.day_of(time.time() - (int(days) - 1) * 86400)
+        filters = {'quantity': quantity or None, 'class_id': class_id or None, 'since': since}
+        
+        summary = analytics.attempt_summary(conn, **filters)
+        if not summary:
+            st.info("아직 기록된 풀이가 없습니다.")
         else:
-            st.markdown(
-                "<div class='error-message'>❌ 정답이 옳지 않습니다. 다시 풀어보세요.</div>",
-                unsafe_allow_html=True
+            total = summary[0]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("제출 수", f"{total['attempts']:,}")
+            col2.metric("정답률", f"{total['accuracy']:.1%}")
+            col3.metric("평균 풀이 시간", f"{total['latency_ms_mean'] / 1000:.1f}초")
+            
+            st.subheader("단위별 오답률")
+            rates = analytics.unit_error_rates(conn, **filters)
+            st.bar_chart({'오답률': {unit_label(row): row['error_rate'] for row in rates}})
+            st.dataframe(
+                [{'단위': unit_label(row), '제출': row['attempts'], '오답': row['wrong'],
+                  '오답률': f"{row['error_rate']:.1%}"} for row in rates],
+                hide_index=True
+            )
+            
+            st.subheader("날짜별 오답률")
+            by_day = {}
+            for row in analytics.unit_error_rates(conn, by=('day',), **filters):
+                by_day.setdefault(unit_label(row), {})[row['day']] = row['error_rate']
+            st.line_chart(by_day)
+            
+            if not class_id:
+                st.subheader("학급별 오답률")
+                st.dataframe(
+                    [{'학급': row['class_id'] or '(없음)', '단위': unit_label(row), '제출': row['attempts'],
+                      '오답': row['wrong'], '오답률': f"{row['error_rate']:.1%}"}
+                     for row in analytics.unit_error_rates(conn, by=('class_id',), **filters)],
+                    hide_index=True
+                )
+            
+            st.subheader("오답 유형")
+            st.dataframe(
+                [{'단위': unit_label(row), '유형': PATTERN_LABELS.get(row['pattern'], row['pattern']),
+                  '오답': row['count'], '비율': f"{row['share']:.1%}"}
+                 for row in analytics.misconception_counts(conn, **filters)],
+                hide_index=True
             )
-            if st.session_state.current_hints:
-                with st.expander("🔍 힌트 보기"):
-                    for hint in st.session_state.current_hints:
-                        st.markdown(f"<div class='hint-box'>{hint}</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='input-section'><p><strong>정답을 입력하세요:</strong></p>", unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    with col1:
-        ml_input = st.text_input("mL", placeholder="예: 1300", key="capacity_ml")
-    with col2:
-        l_input = st.text_input("L", placeholder="예: 1.3", key="capacity_l")
+    with st.expander("⚙️ 기록 저장 상태"):
+        stats = log.stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("대기 중", stats['queue_depth'])
+        col2.metric("버림", stats['dropped'])
+        col3.metric("저장 시간(평균/최대)", f"{stats['flush_ms_mean']:.1f}/{stats['flush_ms_max']:.1f}ms")
+
+
+def show_feedback():
+    """정답/오답 상태 표시"""
+    if st.session_state.is_correct is None:
+        return
+    if st.session_state.is_correct:
+        st.markdown(
+            "<div class='success-message auto-dismiss'>🎉 정답입니다!</div>",
+            unsafe_allow_html=True
+        )
+        # 정답 메시지는 한 번만 표시
+        st.session_state.is_correct = None
+    else:
+        st.markdown(
+            "<div class='error-message'>❌ 정답이 옳지 않습니다. 다시 풀어보세요.</div>",
+            unsafe_allow_html=True
+        )
+        if st.session_state.current_hints:
+            with st.expander("🔍 힌트 보기"):
+                for hint in st.session_state.current_hints:
+                    st.markdown(f"<div class='hint-box'>{hint}</div>", unsafe_allow_html=True)
+
+
+@st.fragment
+def answer_panel(quantity_key):
+    """
+    답 입력과 채점 영역 (조각 단위로 다시 실행)
+    오답이면 이 조각만 다시 그리고, 정답으로 문제가 바뀔 때만 전체 화면을 다시 실행함
+    """
+    with FRAGMENT_RUN_SECONDS.time(quantity=quantity_key), \
+            profiling.profile_run(f"{quantity_key}-fragment", st.session_state.session_id):
+        try:
+            render_answer_panel(quantity_key)
+        finally:
+            # 조각만 다시 실행되는 경우에도 바뀐 진행 상태를 저장
+            persist_session()
+
+
+def render_answer_panel(quantity_key):
+    """answer_panel() 조각의 내용"""
+    quantity = QUANTITIES[quantity_key]
+    problem = st.session_state.current_problem
+    # 채점 결과를 입력칸 위에 보여주기 위한 자리 (채점 후에 채움)
+    feedback = st.container()
     
-    st.markdown("</div>", unsafe_allow_html=True)
+    # 입력칸은 폼으로 묶어 칸을 채울 때마다 재실행하지 않고, 제출할 때 한 번만 전송
+    with st.form(key=f"answers_{quantity.key}", border=False):
+        st.markdown("<div class='input-section'><p><strong>정답을 입력하세요:</strong></p>", unsafe_allow_html=True)
+        
+        # 단위 입력칸을 두 열에 나누어 배치 (왼쪽 열에 앞쪽 절반)
+        inputs = []
+        left_count = (len(quantity.units) + 1) // 2
+        col1, col2 = st.columns(2)
+        for index, unit in enumerate(quantity.units):
+            with (col1 if index < left_count else col2):
+                inputs.append(st.text_input(
+                    unit.symbol,
+                    placeholder=unit.placeholder,
+                    key=f"{quantity.key}_{unit.symbol.lower()}"
+                ))
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        submitted = st.form_submit_button("정답 제출", key=f"submit_{quantity.key}", use_container_width=True)
     
-    if st.button("정답 제출", key="submit_capacity", use_container_width=True):
-        inputs = [ml_input, l_input]
-        units = ['mL', 'L']
+    if submitted:
+        # 입력값 검증
         user_answers = []
         valid = True
         
-        for inp, unit in zip(inputs, units):
+        for inp, unit in zip(inputs, quantity.symbols):
             if not inp.strip():
                 st.error(f"{unit}: 값을 입력해주세요.")
                 valid = False
@@ -410,134 +676,97 @@ def show_capacity_problem():
                 valid = False
                 break
         
-        if valid:
-            correct_answers = problem['correct_answers']
-            all_correct = all(
-                compare_decimal_values(user, correct)
-                for user, correct in zip(user_answers, correct_answers)
+        if not valid:
+            SUBMISSIONS.inc(quantity=quantity.key, outcome='invalid')
+        else:
+            # 각 단위별 개별 비교 후 틀린 답은 오답 유형으로 분류 (후보 오답 표 조회)
+            with GRADE_SECONDS.time(quantity=quantity.key):
+                wrong_units, _ = grade_answers(quantity, user_answers, problem.correct_answers)
+                diagnoses = diagnose(problem, user_answers, wrong_units)
+            SUBMISSIONS.inc(quantity=quantity.key, outcome='wrong' if wrong_units else 'correct')
+            for diagnosis in diagnoses:
+                WRONG_ANSWERS.inc(quantity=quantity.key, unit=diagnosis.unit, pattern=diagnosis.pattern)
+            st.session_state.attempt_history.record(problem, wrong_units)
+            st.session_state.problem_stream.observe(problem, wrong_units)
+            # 큐에 넣기만 하고 디스크 기록은 백그라운드 스레드가 처리
+            get_attempt_log().record(
+                st.session_state.session_id, problem, inputs, wrong_units,
+                (time.monotonic() - st.session_state.problem_shown_at) * 1000,
+                st.session_state.class_id,
+                diagnoses
             )
+            if st.session_state.room_code:
+                # 수업 순위표에 발행 (맞힌 문제 수 = 이번 제출까지 맞힌 수)
+                room = get_classroom_hub().get(st.session_state.room_code)
+                if room is not None:
+                    room.publish(st.session_state.session_id,
+                                 st.session_state.problem_count - (1 if wrong_units else 0), wrong_units)
             
-            if all_correct:
+            if not wrong_units:
                 st.session_state.is_correct = True
                 st.session_state.problem_count += 1
-            else:
-                st.session_state.is_correct = False
-                st.session_state.current_hints = get_wrong_units_and_hints(
-                    user_answers, correct_answers, units, CAPACITY_HINT_MESSAGES
-                )
-            st.rerun()
-    
-    st.markdown(f"<p style='text-align: center; color: #666; margin-top: 2rem;'>"
-                f"<strong>풀이한 문제: {st.session_state.problem_count - 1}개</strong></p>",
-                unsafe_allow_html=True)
+                st.session_state.current_problem = next_problem_record()
+                st.session_state.current_hints = []
+                # 문제가 바뀌었으므로 문제 카드까지 전체 화면을 다시 실행
+                st.rerun()
+            st.session_state.is_correct = False
+            st.session_state.current_hints = [diagnosis.hint for diagnosis in diagnoses]
     
-    if st.button("🔄 재시작", key="restart_capacity", use_container_width=True):
-        st.session_state.current_page = 'home'
-        st.rerun()
+    with feedback:
+        show_feedback()
 
 
-def show_weight_problem():
-    """무게 변환 문제 화면"""
-    st.markdown("<div class='title'>⚖️ 무게 변환</div>", unsafe_allow_html=True)
+def show_problem(quantity_key):
+    """영역별 변환 문제 화면 (레지스트리 기반 공통 화면)"""
+    quantity = QUANTITIES[quantity_key]
+    st.markdown(f"<div class='title'>{quantity.icon} {quantity.name} 변환</div>", unsafe_allow_html=True)
     
-    with st.expander("📘 개념 설명 보기"):
-        st.markdown(WEIGHT_CONCEPT)
+    # 개념 설명은 켰을 때만 전송 (접힌 expander도 내용 전체를 매 재실행마다 보냄)
+    if st.toggle("📘 개념 설명 보기", key=f"concept_{quantity.key}"):
+        with st.container(border=True):
+            st.markdown(CONCEPTS[quantity.key])
     
     problem = st.session_state.current_problem
-    
-    st.markdown(f"""
-    <div class='problem-display'>
-        <div class='problem-value'>{problem['display_value']} {problem['unit']}</div>
-        <div class='problem-question'>
-        다음 값을 g, kg, t 단위로 변환하여<br/>
-        순서대로 정답을 입력하시오.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # 정답/오답 상태 표시
-    if st.session_state.is_correct is not None:
-        if st.session_state.is_correct:
-            st.markdown(
-                "<div class='success-message'>🎉 정답입니다!</div>",
-                unsafe_allow_html=True
-            )
-            time.sleep(1)
-            st.session_state.current_problem = generate_weight_problem()
-            st.session_state.is_correct = None
-            st.session_state.current_hints = []
-            st.rerun()
-        else:
-            st.markdown(
-                "<div class='error-message'>❌ 정답이 옳지 않습니다. 다시 풀어보세요.</div>",
-                unsafe_allow_html=True
-            )
-            if st.session_state.current_hints:
-                with st.expander("🔍 힌트 보기"):
-                    for hint in st.session_state.current_hints:
-                        st.markdown(f"<div class='hint-box'>{hint}</div>", unsafe_allow_html=True)
-    
-    st.markdown("<div class='input-section'><p><strong>정답을 입력하세요:</strong></p>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        g_input = st.text_input("g", placeholder="예: 1500", key="weight_g")
-        kg_input = st.text_input("kg", placeholder="예: 1.5", key="weight_kg")
-    with col2:
-        t_input = st.text_input("t", placeholder="예: 0.0015", key="weight_t")
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    if st.button("정답 제출", key="submit_weight", use_container_width=True):
-        inputs = [g_input, kg_input, t_input]
-        units = ['g', 'kg', 't']
-        user_answers = []
-        valid = True
-        
-        for inp, unit in zip(inputs, units):
-            if not inp.strip():
-                st.error(f"{unit}: 값을 입력해주세요.")
-                valid = False
-                break
-            try:
-                user_answers.append(Decimal(inp))
-            except InvalidOperation:
-                st.error(f"{unit}: 숫자를 정확히 입력해주세요.")
-                valid = False
-                break
-        
-        if valid:
-            correct_answers = problem['correct_answers']
-            all_correct = all(
-                compare_decimal_values(user, correct)
-                for user, correct in zip(user_answers, correct_answers)
-            )
-            
-            if all_correct:
-                st.session_state.is_correct = True
-                st.session_state.problem_count += 1
-            else:
-                st.session_state.is_correct = False
-                st.session_state.current_hints = get_wrong_units_and_hints(
-                    user_answers, correct_answers, units, WEIGHT_HINT_MESSAGES
-                )
-            st.rerun()
-    
-    st.markdown(f"<p style='text-align: center; color: #666; margin-top: 2rem;'>"
+    # 방금 정답을 맞힌 경우: 다음 문제는 이미 생성되어 있으므로
+    # 서버에서 기다리지 않고 브라우저에서 1초 뒤에 문제 카드를 보여줌
+    just_solved = st.session_state.is_correct is True
+    card_class = 'problem-display delayed-reveal' if just_solved else 'problem-display'
+    
+    st.markdown(
+        f"<div class='{card_class}'>"
+        f"<div class='problem-value'>{problem.display_value} {problem.unit}</div>"
+        f"<div class='problem-question'>다음 값을 {', '.join(quantity.symbols)} 단위로 변환하여<br/>"
+        f"순서대로 정답을 입력하시오.</div></div>",
+        unsafe_allow_html=True
+    )
+    
+    # 입력과 채점은 조각(fragment)으로 분리: 제출해도 이 부분만 다시 실행됨
+    answer_panel(quantity.key)
+    
+    st.markdown(f"<p class='problem-counter'>"
                 f"<strong>풀이한 문제: {st.session_state.problem_count - 1}개</strong></p>",
                 unsafe_allow_html=True)
     
-    if st.button("🔄 재시작", key="restart_weight", use_container_width=True):
+    if st.session_state.room_code:
+        leaderboard_panel(st.session_state.room_code, LEADERBOARD_ROWS)
+    
+    if st.button("🔄 재시작", key=f"restart_{quantity.key}", use_container_width=True):
+        leave_room()
         st.session_state.current_page = 'home'
         st.rerun()
 
 
-# 메인 앱 로직
-if st.session_state.current_page == 'home':
-    show_home_page()
-elif st.session_state.current_page == 'length':
-    show_length_problem()
-elif st.session_state.current_page == 'capacity':
-    show_capacity_problem()
-elif st.session_state.current_page == 'weight':
-    show_weight_problem()
+# 메인 앱 로직 (st.rerun()으로 중단되어도 실행 시간과 프로파일, 진행 상태는 기록됨)
+with SCRIPT_RUN_SECONDS.time(page=st.session_state.current_page), \
+        profiling.profile_run(st.session_state.current_page, st.session_state.session_id):
+    try:
+        if st.session_state.current_page == 'home':
+            show_home_page()
+        elif st.session_state.current_page in QUANTITIES:
+            show_problem(st.session_state.current_page)
+        elif st.session_state.current_page == 'export':
+            show_export_page()
+        elif st.session_state.current_page == 'teacher':
+            show_teacher_page()
+    finally:
+        persist_session()
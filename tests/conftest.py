@@ -0,0 +1,18 @@
+"""테스트 공통 설정 (저장소 최상위를 import 경로에 추가, 앱 실행 시 기록 파일은 임시 폴더에)"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP_PATH = os.path.join(ROOT, 'streamlit_app.py')
+
+
+@pytest.fixture
+def app_env(tmp_path, monkeypatch):
+    """AppTest로 앱을 돌릴 때 풀이 기록을 임시 파일에 남김"""
+    monkeypatch.setenv('ATTEMPT_LOG_PATH', str(tmp_path / 'attempts.db'))
+    return tmp_path
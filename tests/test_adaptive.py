@@ -0,0 +1,36 @@
+"""맞춤 문제 출제 테스트 (가장 약한 유형을 고르고, 저장했다 불러와도 숙달도가 이어짐)"""
+from collections import Counter
+from utils.adaptive import AdaptiveStream
+from utils.session import ProblemRecord
+from utils.units import LENGTH
+
+KM = LENGTH.unit_index['km']
+
+
+def _practice(stream, rounds):
+    """km로 제시된 문제만 모두 틀리는 학습자"""
+    presented = Counter()
+    for _ in range(rounds):
+        problem = ProblemRecord.from_problem(LENGTH, stream.next_problem())
+        presented[problem.unit_code] += 1
+        stream.observe(problem, list(LENGTH.symbols) if problem.unit_code == KM else [])
+    return presented
+
+
+def test_targets_weakest_type():
+    stream = AdaptiveStream('length', 3)
+    _practice(stream, 100)
+    # 처음 100문제로 약점을 찾은 뒤에는 km 제시 문제를 가장 많이 냄
+    presented = _practice(stream, 200)
+    assert presented.most_common(1)[0][0] == KM
+    weakest = next(iter(stream.mastery()))
+    assert weakest[0] == 'km'
+
+
+def test_state_round_trip_keeps_skills():
+    stream = AdaptiveStream('length', 5)
+    _practice(stream, 30)
+    restored = AdaptiveStream.from_state(stream.to_state())
+    assert restored.skills == stream.skills
+    assert restored.index == stream.index == 30
+    assert restored.mastery() == stream.mastery()
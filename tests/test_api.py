@@ -0,0 +1,69 @@
+"""JSON API(utils.api) 토큰과 요청 검증 테스트"""
+import json
+from decimal import Decimal
+import pytest
+from utils.api import ApiError, ProblemSigner, create_api
+from utils.session import ProblemRecord
+from utils.units import QUANTITIES
+
+
+@pytest.fixture
+def api():
+    return create_api(secret='test-secret', ttl=0)
+
+
+def _call(api, method, target, payload=None):
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    return api.handle(method, target, body)
+
+
+@pytest.mark.parametrize('quantity', list(QUANTITIES))
+def test_token_round_trip_without_base_value(quantity):
+    signer = ProblemSigner('test-secret', ttl=0)
+    for unit_code in range(len(QUANTITIES[quantity].units)):
+        record = ProblemRecord(quantity, 83420, unit_code)
+        token = signer.sign(record)
+        fields = token.split('.')
+        # 'v2.영역.제시단위코드.제시값.만료시각.서명': 제시값은 그대로, 기준값 칸은 없음
+        assert fields[:3] == ['v2', quantity, str(unit_code)]
+        assert '.'.join(fields[3:-2]) == format(record.display_value, 'f')
+        assert signer.verify(token) == record
+
+
+def test_old_format_and_tampered_tokens_rejected():
+    signer = ProblemSigner('test-secret', ttl=0)
+    old_message = 'length.83421.3.0'
+    old_token = f'{old_message}.{signer._signature(old_message)}'
+    with pytest.raises(ApiError) as error:
+        signer.verify(old_token)
+    assert error.value.status == 400
+    token = signer.sign(ProblemRecord('length', 83421, 3))
+    with pytest.raises(ApiError):
+        signer.verify(token.replace('.0.083421.', '.0.083422.'))
+
+
+def test_grade_with_token(api):
+    status, _, problem = _call(api, 'GET', '/v1/problem?quantity=weight&seed=3')
+    assert status == 200
+    # 클라이언트가 아는 제시값과 단위만으로 푼 답이 정답
+    quantity = QUANTITIES['weight']
+    unit_code = quantity.unit_index[problem['unit']]
+    value = Decimal(problem['display_value']).scaleb(quantity.units[unit_code].exponent)
+    answers = [format(answer, 'f') for answer in ProblemRecord(quantity, int(value), unit_code).correct_answers]
+    status, _, result = _call(api, 'POST', '/v1/grade', {'token': problem['token'], 'answers': answers})
+    assert status == 200 and result['correct'] is True
+
+
+@pytest.mark.parametrize('seed', [1.5, True, -1, '1.5', '-1', '²', [1]])
+def test_non_integer_seed_rejected(api, seed):
+    status, _, payload = _call(api, 'POST', '/v1/problems', {'quantity': 'length', 'count': 2, 'seed': seed})
+    assert status == 400 and payload['code'] == 'invalid_seed'
+
+
+def test_integer_seed_accepted(api):
+    results = [_call(api, 'POST', '/v1/problems', {'quantity': 'length', 'count': 3, 'seed': seed})
+               for seed in (42, '42')]
+    assert all(status == 200 for status, _, _ in results)
+    assert results[0][2] == results[1][2]
+    status, _, _ = _call(api, 'GET', '/v1/problem?quantity=length&seed=1.5')
+    assert status == 400
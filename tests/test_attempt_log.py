@@ -0,0 +1,37 @@
+"""풀이 기록 저장소(AttemptLog) 테스트"""
+import threading
+from utils.attempt_log import AttemptLog
+from utils.session import ProblemRecord
+
+
+def _flush(log, timeout=5):
+    """flush()가 timeout초 안에 끝나면 True (기록 스레드가 죽으면 영원히 기다리므로 별도 스레드에서)"""
+    thread = threading.Thread(target=log.flush, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_writer_survives_non_sqlite_errors(tmp_path, monkeypatch):
+    log = AttemptLog(str(tmp_path / 'attempts.db'), flush_interval=0.01)
+    problem = ProblemRecord('length', 1234, 0)
+    write = log._write
+    calls = []
+
+    def failing_write(conn, items):
+        calls.append(len(items))
+        if len(calls) == 1:
+            raise TypeError('직렬화할 수 없는 값')
+        return write(conn, items)
+
+    monkeypatch.setattr(log, '_write', failing_write)
+    log.record('s1', problem, ['1234', '123.4', '1.234', '0.001234'], [])
+    assert _flush(log)
+    stats = log.stats()
+    assert stats['errors'] == 1 and stats['dropped'] == 1 and stats['written'] == 0
+
+    # 실패한 뒤에도 같은 스레드가 다음 기록을 저장함
+    log.record('s1', problem, ['1234', '123.4', '1.234', '0.001234'], [])
+    assert _flush(log)
+    assert log.stats()['written'] == 1
+    log.close()
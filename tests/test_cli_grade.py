@@ -0,0 +1,42 @@
+"""python -m utils grade 테스트 (형식이 틀리거나 범위를 넘는 행이 있어도 끝까지 채점)"""
+import csv
+import json
+from utils.cli import main
+
+HEADER = ['quantity', 'value', 'display_value', 'unit', 'mm', 'cm', 'm', 'km']
+ROWS = [
+    ['length', '1234', '', '', '1234', '123.4', '1.234', '0.001234'],   # 정답
+    ['length', '', '1e999999999', 'km', '1', '1', '1', '1'],            # 제시값이 Decimal 범위를 넘음
+    ['length', '1e999999999', '', '', '1', '1', '1', '1'],              # 기준값이 Decimal 범위를 넘음
+    ['length', 'abc', '', '', '1', '1', '1', '1'],                      # 숫자가 아님
+    ['length', 'NaN', '', '', '1', '1', '1', '1'],                      # 유한하지 않음
+    ['area', '1', '', '', '1', '1', '1', '1'],                          # 없는 영역
+    ['length', '', '1.5', 'yd', '1', '1', '1', '1'],                    # 없는 단위
+    ['length', '1234', '', '', '1e999999999', '123.4', '1.234', 'x'],   # 답이 범위를 넘거나 숫자가 아님
+    ['length', '', '0.5', 'km', '500000', '50000', '500', '0.5'],       # 정답 (제시값으로 문제 복원)
+]
+
+
+def _grade(tmp_path, fmt, lines):
+    source = tmp_path / f'answers.{fmt}'
+    output = tmp_path / f'graded.{fmt}'
+    source.write_text(lines, encoding='utf-8')
+    assert main(['grade', str(source), '-o', str(output), '--workers', '1']) == 0
+    return output.read_text(encoding='utf-8')
+
+
+def test_grade_csv_survives_bad_rows(tmp_path):
+    lines = '\n'.join(','.join(row) for row in [HEADER] + ROWS) + '\n'
+    graded = list(csv.DictReader(_grade(tmp_path, 'csv', lines).splitlines()))
+    assert len(graded) == len(ROWS)
+    assert [row['correct'] for row in graded] == ['1', '0', '0', '0', '0', '0', '0', '0', '1']
+    assert all(row['error'] for row in graded[1:7])
+    assert graded[7]['error'] == '' and graded[7]['wrong_units'] == 'mm;km'
+
+
+def test_grade_jsonl_survives_bad_rows(tmp_path):
+    lines = ''.join(json.dumps(dict(zip(HEADER, row))) + '\n' for row in ROWS)
+    graded = [json.loads(line) for line in _grade(tmp_path, 'jsonl', lines).splitlines()]
+    assert len(graded) == len(ROWS)
+    assert [bool(row['error']) for row in graded] == [False] + [True] * 6 + [False, False]
+    assert graded[0]['correct'] and graded[-1]['correct']
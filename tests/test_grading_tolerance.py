@@ -0,0 +1,74 @@
+"""
+채점 허용범위 경계 테스트
+모든 채점 경로(compare_decimal_values, compare_fixed_values, get_wrong_units_and_hints, grade_batch)가
+실제 허용범위 min(0.0001, |정답| / 2)로 같은 판정을 하는지 확인 (정답이 0이면 0.0001만)
+"""
+from decimal import Decimal
+import numpy as np
+import pytest
+from utils import fixedpoint
+from utils.converter import compare_decimal_values, compare_fixed_values, get_wrong_units_and_hints
+from utils.generator import ProblemBatch
+from utils.grading import grade_batch
+from utils.units import LENGTH
+
+KM = LENGTH.unit_index['km']
+
+
+def _decimal(user, correct):
+    return compare_decimal_values(user, Decimal(correct))
+
+
+def _fixed(user, correct):
+    return compare_fixed_values(fixedpoint.parse(user), fixedpoint.parse(correct))
+
+
+def _hints(user, correct):
+    return not get_wrong_units_and_hints([user], [Decimal(correct)], ['km'], {'km': '힌트'})
+
+
+def _batch(user, correct):
+    # km 정답이 correct인 길이 문제 (기준값 mm = correct × 10^6), 다른 단위는 정답을 냄
+    value = int(Decimal(correct).scaleb(6))
+    key = ProblemBatch(LENGTH, np.array([value], dtype=np.int64), np.array([KM], dtype=np.int8))
+    answers = [str(answer) for answer in key[0]['correct_answers']]
+    answers[KM] = user
+    return bool(grade_batch([('학생', 0, answers)], key).correct[0, KM])
+
+
+PATHS = [_decimal, _fixed, _hints, _batch]
+
+
+# (학생 답, 정답, 정답 판정)
+OLD_BOUNDARIES = [
+    # 보통 크기의 정답: 예전과 같이 허용범위 0.0001
+    ('1.5001', '1.5', True),
+    ('1.4999', '1.5', True),
+    ('1.50011', '1.5', False),
+    ('1.49989', '1.5', False),
+    # 정답이 0: 크기 조건 없이 예전처럼 허용범위만 봄
+    ('0.0001', '0', True),
+    ('-0.0001', '0', True),
+    ('0.00011', '0', False),
+]
+
+NEW_BOUNDARIES = [
+    # 정답 0.0001 (100mm → km): 실제 허용범위는 절반인 0.00005
+    ('0.00001', '0.0001', False),   # 한 자리 아래 - 예전에는 허용범위 안이라 정답이었음
+    ('0', '0.0001', False),
+    ('0.0002', '0.0001', False),    # 차이 0.0001 = 허용범위지만 정답의 절반을 넘음
+    ('0.00015', '0.0001', True),    # 차이가 정확히 절반
+    ('0.00005', '0.0001', True),
+    ('0.000151', '0.0001', False),
+    ('0.000049', '0.0001', False),
+    # 정답 0.0002: 절반(0.0001)이 허용범위와 같아 예전 판정과 같음
+    ('0.0003', '0.0002', True),
+    ('0.0001', '0.0002', True),
+    ('0.00031', '0.0002', False),
+]
+
+
+@pytest.mark.parametrize('path', PATHS, ids=lambda path: path.__name__.strip('_'))
+@pytest.mark.parametrize('user, correct, expected', OLD_BOUNDARIES + NEW_BOUNDARIES)
+def test_tolerance_boundaries(path, user, correct, expected):
+    assert path(user, correct) is expected
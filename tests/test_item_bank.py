@@ -0,0 +1,51 @@
+"""문제 은행(utils.item_bank)과 이를 쓰는 생성/채점/내보내기 테스트"""
+import io
+import pytest
+from utils import item_bank
+from utils.export import write_export
+from utils.generator import generate_problems
+from utils.grading import grade_batch
+
+
+@pytest.fixture(scope='module')
+def bank_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('bank'))
+    item_bank.build_bank(directory, ['length', 'capacity'])
+    return directory
+
+
+@pytest.fixture
+def default_bank(bank_dir, monkeypatch):
+    """기본 폴더 대신 테스트 은행을 쓰게 함"""
+    monkeypatch.setitem(item_bank._opened, item_bank.DEFAULT_BANK_DIR, item_bank.load_bank(bank_dir))
+
+
+def test_load_bank_does_not_remember_missing_bank(tmp_path):
+    directory = str(tmp_path)
+    assert item_bank.load_bank(directory) is None
+    item_bank.build_bank(directory, ['capacity'])
+    assert item_bank.load_bank(directory) is not None
+
+
+def test_filtered_batch_uses_bank_answers(default_bank):
+    batch = generate_problems('capacity', 200, 3, decimals=2)
+    assert all(-problem['display_value'].as_tuple().exponent == 2 for problem in batch)
+    # 정답 행렬은 은행의 행이며 계산한 값과 같고, 그 정답지로 채점하면 모두 정답
+    assert (batch.answers == item_bank.get_quantity_bank('capacity').answer_rows(batch.values)).all()
+    assert (batch.answers == batch.values[:, None] * [1000, 1]).all()
+    submissions = [('학생', index, [str(answer) for answer in problem['correct_answers']])
+                   for index, problem in enumerate(batch)]
+    assert grade_batch(submissions, batch).summary['correct_rows'] == len(batch)
+
+
+def test_generate_problems_filters_need_bank(monkeypatch):
+    monkeypatch.setattr(item_bank, 'load_bank', lambda directory=item_bank.DEFAULT_BANK_DIR: None)
+    with pytest.raises(ValueError, match='문제 은행'):
+        generate_problems('length', 5, 1, decimals=3)
+
+
+def test_export_checks_decimals_per_quantity_before_writing(default_bank):
+    output = io.StringIO()
+    with pytest.raises(ValueError, match='들이'):
+        write_export(output, ['length', 'capacity'], 5, seed=1, fmt='html', decimals=6)
+    assert output.getvalue() == ''
@@ -0,0 +1,31 @@
+"""실행 지표(utils.metrics) 테스트"""
+import pytest
+from utils import metrics
+
+
+@pytest.fixture
+def collectors(monkeypatch):
+    """등록한 수집 지표를 테스트마다 비움"""
+    monkeypatch.setattr(metrics, '_collectors', [])
+    monkeypatch.setattr(metrics, '_registry', {})
+
+
+def test_collector_kinds(collectors):
+    metrics.register_collector('test_queue_depth', '대기 수', lambda: 3)
+    metrics.register_collector('test_dropped_total', '버린 수 (누적)', lambda: 7, kind='counter')
+    lines = metrics.render().splitlines()
+    assert '# TYPE test_queue_depth gauge' in lines and 'test_queue_depth 3' in lines
+    assert '# TYPE test_dropped_total counter' in lines and 'test_dropped_total 7' in lines
+
+
+def test_reregister_replaces_collector(collectors):
+    metrics.register_collector('test_dropped_total', '버린 수', lambda: 1)
+    metrics.register_collector('test_dropped_total', '버린 수', lambda: 2, kind='counter')
+    text = metrics.render()
+    assert text.count('# TYPE test_dropped_total') == 1
+    assert '# TYPE test_dropped_total counter\ntest_dropped_total 2\n' in text
+
+
+def test_unknown_kind_rejected(collectors):
+    with pytest.raises(ValueError):
+        metrics.register_collector('test_value', '값', lambda: 1, kind='summary')
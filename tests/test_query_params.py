@@ -0,0 +1,19 @@
+"""주소 매개변수(?seed=) 처리 테스트"""
+import pytest
+from streamlit.testing.v1 import AppTest
+from conftest import APP_PATH
+
+
+@pytest.mark.parametrize('seed, expected', [
+    ('42', 42),
+    ('²', None),       # str.isdigit()은 참이지만 int()는 실패하는 위 첨자
+    ('٣', None),       # ASCII가 아닌 숫자
+    ('-1', None),
+    ('', None),
+])
+def test_seed_query_param(app_env, seed, expected):
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    at.query_params['seed'] = seed
+    at.run()
+    assert not at.exception
+    assert at.session_state.problem_seed == expected
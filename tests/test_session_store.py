@@ -0,0 +1,47 @@
+"""세션 저장소 장애 테스트 (저장소가 꺼져 있거나 응답이 깨져도 앱은 계속 동작)"""
+import socket
+import threading
+import pytest
+from streamlit.testing.v1 import AppTest
+from conftest import APP_PATH
+from utils.state_store import RESPClient, StoreError
+
+
+@pytest.mark.parametrize('url', [
+    'redis://127.0.0.1:1',     # 연결 거부
+    'ftp://example.com/x',     # 지원하지 않는 주소
+])
+def test_app_runs_without_store(app_env, monkeypatch, url):
+    monkeypatch.setenv('SESSION_STORE', url)
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    at.run()
+    assert not at.exception
+    assert at.session_state.learner_id is None
+    at.button(key='btn_length').click().run()
+    assert not at.exception
+    assert at.session_state.current_problem is not None
+
+
+def _serve_once(reply):
+    """명령 하나를 받으면 reply를 보내는 서버 (포트 반환)"""
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def handle():
+        conn, _ = server.accept()
+        with conn:
+            conn.recv(1024)
+            conn.sendall(reply)
+            conn.recv(1024)
+        server.close()
+
+    threading.Thread(target=handle, daemon=True).start()
+    return server.getsockname()[1]
+
+
+@pytest.mark.parametrize('reply', [b':abc\r\n', b'$x\r\n', b'*1.5\r\n', b'?\r\n'])
+def test_malformed_reply_closes_connection(reply):
+    client = RESPClient(port=_serve_once(reply))
+    with pytest.raises(StoreError):
+        client.execute('PING')
+    # 반쯤 읽은 연결은 다시 쓰지 않음
+    assert client._sock is None
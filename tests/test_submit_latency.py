@@ -0,0 +1,49 @@
+"""
+제출 1회의 스크립트 스레드 점유 시간 (user-001: time.sleep(1) 제거)
+정답 제출은 st.rerun()까지 포함해 수 ms 수준이어야 하고, 실행 중 잠자는 호출이 없어야 함
+"""
+
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from conftest import APP_PATH
+
+SUBMITS = 5
+# 예전에는 정답 제출마다 1초를 잠들었음 - AppTest 부하를 감안해도 그보다 훨씬 짧아야 함
+MAX_MEDIAN_SECONDS = 0.3
+MAX_SLEEP_SECONDS = 0.05
+
+
+def test_correct_submit_does_not_block_script_thread(app_env, monkeypatch):
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    at.run()
+    at.button(key='btn_length').click().run()
+    assert not at.exception
+
+    sleeps = []
+    real_sleep = time.sleep
+
+    def recording_sleep(seconds):
+        sleeps.append(seconds)
+        real_sleep(seconds)
+
+    monkeypatch.setattr(time, 'sleep', recording_sleep)
+
+    durations = []
+    for submit in range(SUBMITS):
+        problem = at.session_state.current_problem
+        for text_input, answer in zip(at.text_input, problem.correct_answers):
+            text_input.input(str(answer))
+        at.button(key='submit_length').click()
+        start = time.perf_counter()
+        at.run()
+        durations.append(time.perf_counter() - start)
+        assert not at.exception
+        # 정답이면 다음 문제로 넘어감 (is_correct는 정답 메시지를 보여준 뒤 비워짐)
+        assert at.session_state.problem_count == submit + 2
+        assert at.session_state.current_problem != problem
+
+    assert statistics.median(durations) < MAX_MEDIAN_SECONDS, durations
+    assert not [seconds for seconds in sleeps if seconds >= MAX_SLEEP_SECONDS], sleeps
@@ -0,0 +1,40 @@
+"""선생님 화면 접근 제한 테스트 (TEACHER_PASSWORD)"""
+from streamlit.testing.v1 import AppTest
+from conftest import APP_PATH
+
+
+def _keys(at):
+    return {button.key for button in at.button}
+
+
+def _teacher_page(at):
+    """세션을 선생님 화면으로 옮김 (저장된 세션을 복원한 경우처럼 버튼을 거치지 않음)"""
+    at.session_state.current_page = 'teacher'
+    return at.run()
+
+
+def test_teacher_page_off_without_password(app_env, monkeypatch):
+    monkeypatch.delenv('TEACHER_PASSWORD', raising=False)
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    assert 'btn_teacher' not in _keys(at)
+    _teacher_page(at)
+    assert not at.exception
+    assert 'room_open' not in _keys(at)
+    assert 'restart_teacher' in _keys(at)
+
+
+def test_teacher_page_needs_password(app_env, monkeypatch):
+    monkeypatch.setenv('TEACHER_PASSWORD', 'correct horse')
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    assert 'btn_teacher' in _keys(at)
+    at.button(key='btn_teacher').click().run()
+    assert 'room_open' not in _keys(at)
+
+    at.text_input[0].input('wrong').run()
+    at.button(key='teacher_sign_in').click().run()
+    assert at.error and 'room_open' not in _keys(at)
+
+    at.text_input[0].input('correct horse').run()
+    at.button(key='teacher_sign_in').click().run()
+    assert not at.exception
+    assert 'room_open' in _keys(at)
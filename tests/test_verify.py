@@ -0,0 +1,29 @@
+"""python -m utils.verify 표본 검사 테스트 (CI에서는 표본, 전수 검사는 --full로 따로)"""
+import pytest
+from utils.units import QUANTITIES
+from utils.verify import main, sample_values, verify
+
+
+def test_sample_keeps_edge_values():
+    length = QUANTITIES['length']
+    values = sample_values(length, sample=50).tolist()
+    # 값 범위 양 끝, km 정답이 허용범위에 들 수 있는 100~111mm, 10의 거듭제곱 ±1
+    assert values[0] == 100 and values[-1] == 100000
+    assert set(range(100, 112)) <= set(values)
+    assert {999, 1000, 1001, 99999} <= set(values)
+    assert sample_values(length, sample=50, seed=1).tolist() != values
+    assert sample_values(length, sample=50).tolist() == values
+
+
+def test_sampled_verify_passes():
+    summary = verify(sample=300)
+    for key, total in summary.items():
+        assert total['failures'] == {}, total['examples']
+        assert total['values'] < total['domain']
+        assert set(total['checks']) == {'exact', 'accept', 'power'}
+
+
+def test_cli_rejects_negative_sample():
+    with pytest.raises(SystemExit) as error:
+        main(['--sample', '-1'])
+    assert error.value.code == 2
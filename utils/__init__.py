@@ -1,24 +1,83 @@
 """Utils 패키지 (v4.0)"""
+from utils.units import QUANTITIES, Quantity, Unit, get_quantity
 from utils.converter import (
+    convert,
     convert_length,
     convert_capacity,
     convert_weight,
+    convert_fixed,
     compare_decimal_values,
-    get_wrong_units_and_hints
+    compare_fixed_values,
+    get_wrong_units_and_hints,
+    grade_answers
 )
 from utils.generator import (
+    generate_problem,
+    build_problem,
     generate_length_problem,
     generate_capacity_problem,
-    generate_weight_problem
+    generate_weight_problem,
+    generate_problems,
+    generate_length_problems,
+    generate_capacity_problems,
+    generate_weight_problems,
+    ProblemBatch,
+    ProblemStream,
+    problem_rng,
+    precompute_problems
 )
+from utils.grading import grade_batch, BatchGradeResult
+from utils.export import iter_problem_rows, iter_export, write_export, unit_columns, check_decimals
+from utils.session import ProblemRecord, AttemptHistory, session_size, dump_session, load_session
+from utils.state_store import open_store, SessionStore, StoreError
+from utils.attempt_log import AttemptLog
+from utils.adaptive import AdaptiveStream
+from utils.diagnosis import diagnose, Diagnosis
 
 __all__ = [
+    'QUANTITIES',
+    'Quantity',
+    'Unit',
+    'get_quantity',
+    'convert',
     'convert_length',
     'convert_capacity',
     'convert_weight',
+    'convert_fixed',
     'compare_decimal_values',
+    'compare_fixed_values',
     'get_wrong_units_and_hints',
+    'grade_answers',
+    'grade_batch',
+    'BatchGradeResult',
+    'generate_problem',
+    'build_problem',
     'generate_length_problem',
     'generate_capacity_problem',
-    'generate_weight_problem'
+    'generate_weight_problem',
+    'generate_problems',
+    'generate_length_problems',
+    'generate_capacity_problems',
+    'generate_weight_problems',
+    'ProblemBatch',
+    'ProblemStream',
+    'problem_rng',
+    'precompute_problems',
+    'iter_problem_rows',
+    'iter_export',
+    'write_export',
+    'unit_columns',
+    'check_decimals',
+    'ProblemRecord',
+    'AttemptHistory',
+    'session_size',
+    'dump_session',
+    'load_session',
+    'open_store',
+    'SessionStore',
+    'StoreError',
+    'AttemptLog',
+    'AdaptiveStream',
+    'diagnose',
+    'Diagnosis'
 ]
@@ -0,0 +1,6 @@
+"""python -m utils 진입점 (utils.cli 참고)"""
+
+import sys
+from utils.cli import main
+
+sys.exit(main())
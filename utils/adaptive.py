@@ -0,0 +1,181 @@
+"""
+맞춤 문제 출제 유틸리티 모듈
+학습자별로 (제시 단위 → 답 단위) 쌍, 자릿수 이동 크기, 값 자릿수 구간의 숙달도를 추정하고
+가장 약한 부분을 겨냥하는 문제를 출제함
+
+후보 문제 유형은 (제시 단위, 값 자릿수 구간) 조합이며 (단위 수 × 구간 수, 많아야 20개 정도)
+문제를 낼 때마다 모든 유형의 약점 점수를 계산하여 가장 큰 것을 고름
+(제출 하나가 제시 단위의 모든 자릿수 이동 크기를 갱신하므로 거의 모든 유형의 점수가 바뀜 -
+우선순위 큐를 써도 매번 전부 다시 넣어야 해서 단순 선형 탐색보다 빠르지 않음)
+"""
+
+import random
+from utils.generator import build_problem
+from utils.units import get_quantity
+
+# 숙달도 초깃값과 갱신 비율 (지수 이동 평균)
+INITIAL_SKILL = 0.5
+LEARNING_RATE = 0.3
+
+# 유형의 약점 점수가 이보다 낮으면 숙달한 것으로 봄 (모두 숙달하면 골고루 출제)
+MASTERED_WEAKNESS = 0.15
+
+# 같은 점수의 유형이 번갈아 나오도록 더하는 작은 흔들림
+JITTER = 0.05
+
+# 값 자릿수 구간의 최소 크기
+MIN_BAND_SIZE = 10
+
+
+def value_bands(quantity):
+    """
+    영역 값 범위를 자릿수별 구간으로 나눔
+    값이 MIN_BAND_SIZE개보다 적은 구간(예: 100000 하나)은 앞 구간에 합침
+    Args:
+        quantity (Quantity): 영역
+    Returns:
+        tuple: ((자릿수, 최솟값, 최댓값), ...) - 양 끝 포함, 자릿수는 구간 최솟값 기준
+    """
+    low, high = quantity.value_range
+    bands = []
+    digits = len(str(low))
+    while 10 ** (digits - 1) <= high:
+        band_low = max(low, 10 ** (digits - 1))
+        band_high = min(high, 10 ** digits - 1)
+        if bands and band_high - band_low + 1 < MIN_BAND_SIZE:
+            bands[-1] = (bands[-1][0], bands[-1][1], band_high)
+        else:
+            bands.append((digits, band_low, band_high))
+        digits += 1
+    return tuple(bands)
+
+
+class AdaptiveStream:
+    """
+    한 학습자(세션)의 영역별 맞춤 문제 열 (ProblemStream과 같은 사용법)
+    next_problem()으로 문제를 받고, 채점 후 observe()로 결과를 알려줌
+    Attributes:
+        quantity (str): 영역 키
+        seed (int): 난수 시드
+        index (int): 지금까지 낸 문제 수
+        skills (dict): {숙달도 키: 0~1 추정값}
+            - ('pair', 제시 단위 코드, 답 단위 코드)
+            - ('shift', 자릿수 이동 크기)
+            - ('band', 값 자릿수)
+    """
+
+    __slots__ = ('quantity', 'seed', 'index', 'skills', '_rng', '_bands', '_keys')
+
+    def __init__(self, quantity, seed=None):
+        quantity = get_quantity(quantity)
+        self.quantity = quantity.key
+        self.seed = random.SystemRandom().getrandbits(63) if seed is None else seed
+        self.index = 0
+        self.skills = {}
+        self._rng = random.Random(f"{self.seed}:{self.quantity}:adaptive")
+        self._bands = value_bands(quantity)
+        # 유형별 숙달도 키 목록은 바뀌지 않으므로 한 번만 만듦 (키 순서 = 유형 순서)
+        self._keys = {
+            (unit_code, band): self._skill_keys(quantity, unit_code, band)
+            for unit_code in range(len(quantity.units))
+            for band in range(len(self._bands))
+        }
+
+    def _skill_keys(self, quantity, unit_code, band):
+        """유형 하나가 겨냥하는 숙달도 키 목록"""
+        units = quantity.units
+        keys = [('band', self._bands[band][0])]
+        for target in range(len(units)):
+            if target != unit_code:
+                keys.append(('pair', unit_code, target))
+                keys.append(('shift', abs(units[unit_code].exponent - units[target].exponent)))
+        return tuple(keys)
+
+    def weakness(self, item):
+        """
+        유형의 약점 점수 (겨냥하는 숙달도의 1 - 추정값 평균)
+        Args:
+            item (tuple): (제시 단위 코드, 값 자릿수 구간 인덱스)
+        Returns:
+            float: 0(숙달)~1(모름)
+        """
+        skills = self.skills
+        keys = self._keys[item]
+        return sum(1.0 - skills.get(key, INITIAL_SKILL) for key in keys) / len(keys)
+
+    def next_item(self):
+        """
+        다음에 낼 유형 선택 (모든 유형의 약점 점수 + 흔들림 중 가장 큰 것)
+        Returns:
+            tuple: (제시 단위 코드, 값 자릿수 구간 인덱스)
+        """
+        rng = self._rng
+        score, item = max((self.weakness(item) + rng.random() * JITTER, item) for item in self._keys)
+        if score < MASTERED_WEAKNESS:
+            # 가장 약한 유형도 숙달: 복습으로 아무 유형이나 고름
+            return rng.choice(list(self._keys))
+        return item
+
+    def next_problem(self):
+        """다음 문제 딕셔너리 반환 (generate_problem()과 같은 형식)"""
+        quantity = get_quantity(self.quantity)
+        unit_code, band = self.next_item()
+        _, low, high = self._bands[band]
+        self.index += 1
+        return build_problem(quantity, self._rng.randint(low, high), quantity.symbols[unit_code])
+
+    def observe(self, problem, wrong_units):
+        """
+        채점 결과로 숙달도를 갱신 (유형 점수는 다음 next_item()에서 계산)
+        Args:
+            problem (ProblemRecord): 채점한 문제
+            wrong_units (list): 틀린 단위 기호 목록
+        """
+        quantity = get_quantity(self.quantity)
+        unit_code = problem.unit_code
+        digits = next(digits for digits, low, high in self._bands if low <= problem.value <= high)
+        wrong = set(wrong_units)
+        updates = [(('band', digits), not wrong)]
+        for target, unit in enumerate(quantity.units):
+            if target != unit_code:
+                correct = unit.symbol not in wrong
+                shift = abs(quantity.units[unit_code].exponent - unit.exponent)
+                updates.append((('pair', unit_code, target), correct))
+                updates.append((('shift', shift), correct))
+        for key, correct in updates:
+            skill = self.skills.get(key, INITIAL_SKILL)
+            self.skills[key] = skill + LEARNING_RATE * (float(correct) - skill)
+
+    def to_state(self):
+        """외부 저장용 압축 상태 (숙달도 추정값과 낸 문제 수)"""
+        return {'kind': 'adaptive', 'quantity': self.quantity, 'seed': self.seed, 'index': self.index,
+                'skills': [[list(key), skill] for key, skill in self.skills.items()]}
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        to_state()의 결과로 문제 열 복원
+        흔들림 난수는 (시드, 낸 문제 수)로 다시 정함
+        Args:
+            state (dict): to_state()의 결과
+        Returns:
+            AdaptiveStream: 복원한 문제 열
+        """
+        stream = cls(state['quantity'], state['seed'])
+        stream.index = state['index']
+        stream.skills = {tuple(key): skill for key, skill in state['skills']}
+        stream._rng = random.Random(f"{stream.seed}:{stream.quantity}:adaptive:{stream.index}")
+        return stream
+
+    def mastery(self):
+        """
+        유형별 약점 점수 (화면 표시용)
+        Returns:
+            dict: {(제시 단위, 값 자릿수): 약점 점수} - 약한 순서
+        """
+        symbols = get_quantity(self.quantity).symbols
+        scores = {
+            (symbols[unit_code], self._bands[band][0]): round(self.weakness((unit_code, band)), 3)
+            for unit_code, band in self._keys
+        }
+        return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,239 @@
+"""
+학습 분석 유틸리티 모듈
+풀이 기록(attempts)을 날짜, 학급, 영역, 단위별 요약 표로 누적하여 선생님 화면에 제공
+(오답 유형은 utils.diagnosis의 분류를 단위별로 셈)
+
+요약 표는 기록을 저장하는 같은 트랜잭션에서 UPSERT로 더해 가므로
+화면을 열 때 전체 기록을 다시 훑지 않음 (요약 표 크기는 날짜 × 학급 × 단위 수)
+"""
+
+import json
+import time
+from collections import Counter
+from utils.units import get_quantity
+
+SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS unit_stats (
+    day TEXT NOT NULL,
+    class_id TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    PRIMARY KEY (day, class_id, quantity, unit)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS attempt_stats (
+    day TEXT NOT NULL,
+    class_id TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_ms_total REAL NOT NULL,
+    PRIMARY KEY (day, class_id, quantity)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS misconception_stats (
+    day TEXT NOT NULL,
+    class_id TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, class_id, quantity, unit, pattern)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_UNIT = """
+INSERT INTO unit_stats (day, class_id, quantity, unit, attempts, wrong) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, class_id, quantity, unit)
+DO UPDATE SET attempts = attempts + excluded.attempts, wrong = wrong + excluded.wrong
+"""
+
+_UPSERT_ATTEMPT = """
+INSERT INTO attempt_stats (day, class_id, quantity, attempts, correct, latency_ms_total) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, class_id, quantity)
+DO UPDATE SET attempts = attempts + excluded.attempts, correct = correct + excluded.correct,
+              latency_ms_total = latency_ms_total + excluded.latency_ms_total
+"""
+
+_UPSERT_PATTERN = """
+INSERT INTO misconception_stats (day, class_id, quantity, unit, pattern, count) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, class_id, quantity, unit, pattern) DO UPDATE SET count = count + excluded.count
+"""
+
+
+def day_of(timestamp):
+    """유닉스 시각의 (서버 지역 시간 기준) 날짜 문자열 'YYYY-MM-DD'"""
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp))
+
+
+def summarize(rows):
+    """
+    풀이 기록을 요약 표에 더할 증분으로 집계
+    Args:
+        rows (iterable): (created_at, class_id, quantity, wrong_units, latency_ms, diagnoses) 목록
+            - diagnoses: {틀린 단위: 오답 유형}
+    Returns:
+        tuple: (unit_stats, attempt_stats, misconception_stats 증분 목록) - UPSERT 인자 형식
+    """
+    unit_attempts = Counter()
+    unit_wrong = Counter()
+    attempts = Counter()
+    correct = Counter()
+    latency = Counter()
+    patterns = Counter()
+    for created_at, class_id, quantity, wrong_units, latency_ms, diagnoses in rows:
+        key = (day_of(created_at), class_id, quantity)
+        attempts[key] += 1
+        correct[key] += not wrong_units
+        latency[key] += latency_ms or 0.0
+        for unit in get_quantity(quantity).symbols:
+            unit_attempts[key + (unit,)] += 1
+        for unit in wrong_units:
+            unit_wrong[key + (unit,)] += 1
+        for unit, pattern in diagnoses.items():
+            patterns[key + (unit, pattern)] += 1
+    unit_rows = [key + (count, unit_wrong[key]) for key, count in unit_attempts.items()]
+    attempt_rows = [key + (count, correct[key], latency[key]) for key, count in attempts.items()]
+    pattern_rows = [key + (count,) for key, count in patterns.items()]
+    return unit_rows, attempt_rows, pattern_rows
+
+
+def apply_summaries(conn, rows):
+    """
+    풀이 기록 증분을 요약 표에 더함 (호출한 쪽의 트랜잭션 안에서 실행)
+    Args:
+        conn (sqlite3.Connection): 연결
+        rows (iterable): summarize()와 같은 형식
+    """
+    unit_rows, attempt_rows, pattern_rows = summarize(rows)
+    conn.executemany(_UPSERT_UNIT, unit_rows)
+    conn.executemany(_UPSERT_ATTEMPT, attempt_rows)
+    conn.executemany(_UPSERT_PATTERN, pattern_rows)
+
+
+def rebuild_summaries(conn):
+    """
+    요약 표를 풀이 기록 전체로 다시 만듦 (요약 표가 생기기 전의 기록을 옮길 때 한 번만 사용)
+    Args:
+        conn (sqlite3.Connection): 연결
+    Returns:
+        int: 다시 집계한 기록 수
+    """
+    cursor = conn.execute('SELECT created_at, class_id, quantity, wrong_units, latency_ms, diagnoses FROM attempts')
+    count = 0
+    with conn:
+        conn.execute('DELETE FROM unit_stats')
+        conn.execute('DELETE FROM attempt_stats')
+        conn.execute('DELETE FROM misconception_stats')
+        while True:
+            chunk = cursor.fetchmany(10000)
+            if not chunk:
+                break
+            apply_summaries(conn, [
+                (created_at, class_id, quantity, json.loads(wrong_units), latency_ms, json.loads(diagnoses))
+                for created_at, class_id, quantity, wrong_units, latency_ms, diagnoses in chunk
+            ])
+            count += len(chunk)
+    return count
+
+
+def _filters(quantity=None, class_id=None, since=None):
+    """WHERE 절과 인자"""
+    clauses = []
+    params = []
+    if quantity:
+        clauses.append('quantity = ?')
+        params.append(quantity)
+    if class_id:
+        clauses.append('class_id = ?')
+        params.append(class_id)
+    if since:
+        clauses.append('day >= ?')
+        params.append(since)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _rate(wrong, attempts):
+    return round(wrong / attempts, 4) if attempts else 0.0
+
+
+def unit_error_rates(conn, quantity=None, class_id=None, since=None, by=()):
+    """
+    단위별 오답률 (요약 표만 읽음)
+    Args:
+        conn (sqlite3.Connection): 연결
+        quantity (str 또는 None): 영역 키로 거르기
+        class_id (str 또는 None): 학급으로 거르기
+        since (str 또는 None): 이 날짜('YYYY-MM-DD')부터
+        by (tuple): 추가로 나눌 열 ('day', 'class_id' 중에서)
+    Returns:
+        list: {'quantity', 'unit', (by 열), 'attempts', 'wrong', 'error_rate'} 목록
+    """
+    columns = [column for column in by if column in ('day', 'class_id')] + ['quantity', 'unit']
+    where, params = _filters(quantity, class_id, since)
+    query = (f"SELECT {', '.join(columns)}, SUM(attempts), SUM(wrong) FROM unit_stats{where} "
+             f"GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}")
+    result = []
+    for row in conn.execute(query, params):
+        record = dict(zip(columns, row))
+        record['attempts'], record['wrong'] = row[-2], row[-1]
+        record['error_rate'] = _rate(row[-1], row[-2])
+        result.append(record)
+    return result
+
+
+def attempt_summary(conn, quantity=None, class_id=None, since=None, by=()):
+    """
+    제출 단위 요약 (제출 수, 정답 수, 정답률, 평균 풀이 시간)
+    Args:
+        (unit_error_rates()와 같음, by는 'day', 'class_id', 'quantity' 중에서)
+    Returns:
+        list: {(by 열), 'attempts', 'correct', 'accuracy', 'latency_ms_mean'} 목록
+    """
+    columns = [column for column in by if column in ('day', 'class_id', 'quantity')]
+    where, params = _filters(quantity, class_id, since)
+    select = ', '.join(columns + ['SUM(attempts)', 'SUM(correct)', 'SUM(latency_ms_total)'])
+    group = f" GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}" if columns else ''
+    result = []
+    for row in conn.execute(f"SELECT {select} FROM attempt_stats{where}{group}", params):
+        attempts, correct, latency_total = row[-3:]
+        if not attempts:
+            continue
+        record = dict(zip(columns, row))
+        record.update({
+            'attempts': attempts,
+            'correct': correct,
+            'accuracy': _rate(correct, attempts),
+            'latency_ms_mean': round(latency_total / attempts, 1)
+        })
+        result.append(record)
+    return result
+
+
+def misconception_counts(conn, quantity=None, class_id=None, since=None):
+    """
+    단위별 오답 유형 수 (요약 표만 읽음)
+    Args:
+        (unit_error_rates()와 같음)
+    Returns:
+        list: {'quantity', 'unit', 'pattern', 'count', 'share'} 목록
+            - share: 그 단위의 오답 중 이 유형의 비율
+    """
+    where, params = _filters(quantity, class_id, since)
+    query = (f"SELECT quantity, unit, pattern, SUM(count) FROM misconception_stats{where} "
+             f"GROUP BY quantity, unit, pattern ORDER BY quantity, unit, SUM(count) DESC")
+    result = [
+        {'quantity': quantity, 'unit': unit, 'pattern': pattern, 'count': count}
+        for quantity, unit, pattern, count in conn.execute(query, params)
+    ]
+    totals = Counter()
+    for record in result:
+        totals[record['quantity'], record['unit']] += record['count']
+    for record in result:
+        record['share'] = _rate(record['count'], totals[record['quantity'], record['unit']])
+    return result
+
+
+def class_ids(conn):
+    """요약 표에 있는 학급 목록"""
+    return [row[0] for row in conn.execute('SELECT DISTINCT class_id FROM attempt_stats ORDER BY class_id')]
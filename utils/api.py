@@ -0,0 +1,492 @@
+"""
+문제 생성/채점 JSON API 모듈
+모바일·키오스크 클라이언트가 Streamlit 웹소켓 세션 없이 "문제 주기"와 "채점하기"만 쓸 수 있도록
+asyncio 스트림 위에 HTTP/1.1(keep-alive)을 직접 처리하는 가벼운 서버 (외부 패키지 없음)
+
+서버는 상태를 보관하지 않음: 문제마다 HMAC 서명 토큰을 주고, 채점 요청의 토큰에서 문제를 복원함
+    토큰 = 'v2.영역.제시단위코드.제시값.만료시각.서명' (서명 = HMAC-SHA256 앞 16바이트, base64url)
+    토큰에는 응답에 이미 보이는 영역, 제시 단위, 제시값만 담음 (기준값 등 정답은 채점할 때 서버가 계산)
+
+끝점:
+    GET  /v1/health                      {"status": "ok"}
+    GET  /v1/quantities                  영역별 단위 목록
+    GET  /v1/problem?quantity=length     문제 하나 (&seed=정수면 그 시드의 첫 문제)
+    POST /v1/problems                    {"quantity", "count", "seed"?} → {"problems": [...]}
+    POST /v1/grade                       {"token", "answers": [단위 순서] 또는 {단위: 답}}
+    POST /v1/grade/batch                 {"items": [{"token", "answers"}, ...]} → {"results", "summary"}
+
+환경 변수:
+    API_SECRET=...      토큰 서명 키 (여러 프로세스나 재시작 후에도 토큰을 쓰려면 반드시 지정)
+    API_TOKEN_TTL=86400 토큰 유효 시간(초, 0이면 만료 없음)
+
+실행:
+    API_SECRET=... python -m utils.api --host 0.0.0.0 --port 8080
+"""
+
+import argparse
+import asyncio
+import base64
+import hmac
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from urllib.parse import parse_qsl
+import numpy as np
+from utils import metrics
+from utils.converter import grade_answers
+from utils.diagnosis import diagnose
+from utils.generator import ProblemBatch, generate_problem, generate_problems, problem_rng
+from utils.grading import grade_batch
+from utils.session import ProblemRecord
+from utils.units import QUANTITIES, get_quantity
+
+DEFAULT_TOKEN_TTL = 24 * 3600
+
+# 토큰 형식 표시 (형식이 바뀌면 올려서 예전 토큰은 서명이 맞아도 받지 않음)
+TOKEN_VERSION = 'v2'
+
+# 요청 크기 제한
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+# 한 번에 만들거나 채점할 수 있는 최대 문제 수
+MAX_BATCH = 1000
+# 같은 영역의 채점 항목이 이만큼 이상이면 grade_batch()로 한 번에 비교
+VECTOR_GRADE_MIN = 64
+# 쓰기 버퍼가 이보다 크면 클라이언트가 읽을 때까지 기다림
+WRITE_HIGH_WATER = 64 * 1024
+
+REQUEST_SECONDS = metrics.histogram('api_request_seconds', 'API 요청 처리 시간', ('route',))
+REQUESTS = metrics.counter('api_requests_total', 'API 요청 수', ('route', 'status'))
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    410: 'Gone', 413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class ApiError(Exception):
+    """
+    요청 오류 (HTTP 상태와 오류 코드를 가짐)
+    Attributes:
+        status (int): HTTP 상태 코드
+        code (str): 오류 코드 (예: 'invalid_token')
+    """
+
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+class ProblemSigner:
+    """
+    문제 토큰 서명과 검증
+    Attributes:
+        ttl (int): 토큰 유효 시간(초, 0이면 만료 없음)
+    """
+
+    def __init__(self, secret, ttl=DEFAULT_TOKEN_TTL):
+        self._secret = secret.encode('utf-8') if isinstance(secret, str) else bytes(secret)
+        self.ttl = ttl
+
+    def _signature(self, message):
+        return _b64(hmac.digest(self._secret, message.encode('ascii'), 'sha256')[:16])
+
+    def sign(self, record, now=None):
+        """
+        문제의 토큰 생성 (제시값과 제시 단위만 담아 정답이 드러나지 않음)
+        Args:
+            record (ProblemRecord): 문제
+            now (float 또는 None): 기준 시각 (None이면 현재)
+        Returns:
+            str: 토큰
+        """
+        expires = int((time.time() if now is None else now) + self.ttl) if self.ttl else 0
+        message = (f"{TOKEN_VERSION}.{record.quantity_key}.{record.unit_code}."
+                   f"{format(record.display_value, 'f')}.{expires}")
+        return f"{message}.{self._signature(message)}"
+
+    def verify(self, token, now=None):
+        """
+        토큰을 검증하고 문제를 복원 (제시값 × 10^제시 단위 지수 = 기준값)
+        Args:
+            token (str): sign()의 결과
+            now (float 또는 None): 기준 시각 (None이면 현재)
+        Returns:
+            ProblemRecord: 토큰의 문제
+        Raises:
+            ApiError: 형식이 틀렸거나 서명이 맞지 않거나(400) 만료되었을 때(410)
+        """
+        if not isinstance(token, str) or not token.isascii():
+            raise ApiError(400, 'invalid_token', "문제 토큰이 없거나 형식이 틀렸습니다.")
+        message, _, signature = token.rpartition('.')
+        if not hmac.compare_digest(signature, self._signature(message)):
+            raise ApiError(400, 'invalid_token', "문제 토큰의 서명이 맞지 않습니다.")
+        # 서명이 맞으면 이 서버가 만든 값이므로 형식은 믿을 수 있음 (예전 형식만 거름)
+        version, key, unit_code, rest = message.split('.', 3)
+        if version != TOKEN_VERSION:
+            raise ApiError(400, 'invalid_token', "예전 형식의 문제 토큰입니다. 새 문제를 받아주세요.")
+        display_value, _, expires = rest.rpartition('.')
+        if int(expires) and int(expires) < (time.time() if now is None else now):
+            raise ApiError(410, 'expired_token', "문제 토큰이 만료되었습니다. 새 문제를 받아주세요.")
+        quantity = QUANTITIES[key]
+        unit_code = int(unit_code)
+        value = Decimal(display_value).scaleb(quantity.units[unit_code].exponent)
+        return ProblemRecord(quantity, int(value), unit_code)
+
+
+def _quantity(key):
+    try:
+        return get_quantity(key or 'length')
+    except (KeyError, TypeError):
+        raise ApiError(400, 'unknown_quantity',
+                       f"영역은 {', '.join(QUANTITIES)} 중 하나여야 합니다.") from None
+
+
+def _seed(value):
+    """
+    요청의 시드 (0 이상의 정수 또는 그런 정수 문자열)
+    JSON 실수(1.5)나 true처럼 정수가 아닌 값은 잘라내지 않고 거부함
+    """
+    if value is None:
+        return None
+    if type(value) is str and value.isascii() and value.isdigit():
+        value = int(value)
+    if type(value) is not int or value < 0:
+        raise ApiError(400, 'invalid_seed', "seed는 0 이상의 정수여야 합니다.")
+    return value
+
+
+def _answers(quantity, answers):
+    """요청의 답(단위 순서 목록 또는 {단위: 답})을 단위 순서 목록으로"""
+    if isinstance(answers, dict):
+        answers = [answers.get(unit) for unit in quantity.symbols]
+    if not isinstance(answers, list) or len(answers) != len(quantity.units):
+        raise ApiError(400, 'invalid_answers',
+                       f"{quantity.name} 답은 {', '.join(quantity.symbols)} 순서의 {len(quantity.units)}개여야 합니다.")
+    # JSON 실수는 Decimal로 읽으므로 나머지(정수, 문자열, null 등)만 문자열로 바꿈
+    return [answer if type(answer) is Decimal else '' if answer is None else str(answer) for answer in answers]
+
+
+class ProblemApi:
+    """
+    끝점 처리 (HTTP와 분리된 순수 함수들, JSON으로 보낼 딕셔너리를 반환)
+    Attributes:
+        signer (ProblemSigner): 토큰 서명기
+    """
+
+    def __init__(self, signer):
+        self.signer = signer
+        self._quantities = {
+            'quantities': [
+                {'key': quantity.key, 'name': quantity.name, 'units': list(quantity.symbols)}
+                for quantity in QUANTITIES.values()
+            ]
+        }
+        self.routes = {
+            ('GET', '/v1/health'): lambda query, body: {'status': 'ok'},
+            ('GET', '/v1/quantities'): lambda query, body: self._quantities,
+            ('GET', '/v1/problem'): lambda query, body: self.problem(query.get('quantity'), query.get('seed')),
+            ('POST', '/v1/problems'): lambda query, body: self.problems(
+                body.get('quantity'), body.get('count', 1), body.get('seed')),
+            ('POST', '/v1/grade'): lambda query, body: self.grade(body.get('token'), body.get('answers')),
+            ('POST', '/v1/grade/batch'): lambda query, body: self.grade_many(body.get('items')),
+        }
+
+    def _problem_json(self, record, now):
+        return {
+            'quantity': record.quantity_key,
+            'unit': record.unit,
+            'display_value': format(record.display_value, 'f'),
+            'units': list(record.quantity.symbols),
+            'token': self.signer.sign(record, now)
+        }
+
+    def problem(self, quantity, seed=None):
+        """
+        문제 하나
+        Args:
+            quantity (str 또는 None): 영역 키 (None이면 길이)
+            seed (int, str 또는 None): 시드 (주면 ProblemStream(quantity, seed)의 첫 문제)
+        Returns:
+            dict: {'quantity', 'unit', 'display_value', 'units', 'token'}
+        """
+        quantity = _quantity(quantity)
+        seed = _seed(seed)
+        problem = generate_problem(quantity, None if seed is None else problem_rng(seed, quantity))
+        return self._problem_json(ProblemRecord.from_problem(quantity, problem), time.time())
+
+    def problems(self, quantity, count, seed=None):
+        """
+        문제 여러 개 (generate_problems()로 한 번에 생성)
+        Returns:
+            dict: {'problems': [problem()과 같은 형식, ...]}
+        """
+        quantity = _quantity(quantity)
+        if type(count) is not int or not 1 <= count <= MAX_BATCH:
+            raise ApiError(400, 'invalid_count', f"count는 1~{MAX_BATCH} 사이의 정수여야 합니다.")
+        batch = generate_problems(quantity, count, _seed(seed))
+        now = time.time()
+        return {'problems': [
+            self._problem_json(ProblemRecord(quantity, value, unit_code), now)
+            for value, unit_code in zip(batch.values.tolist(), batch.unit_codes.tolist())
+        ]}
+
+    @staticmethod
+    def _result(record, answers, wrong_units):
+        """채점 결과 (틀린 단위가 있으면 오답 진단 힌트 포함)"""
+        if not wrong_units:
+            return {'correct': True, 'wrong_units': [], 'hints': [], 'patterns': {}}
+        diagnoses = diagnose(record, answers, wrong_units)
+        return {
+            'correct': False,
+            'wrong_units': wrong_units,
+            'hints': [diagnosis.hint for diagnosis in diagnoses],
+            'patterns': {diagnosis.unit: diagnosis.pattern for diagnosis in diagnoses}
+        }
+
+    def grade(self, token, answers):
+        """
+        답 하나 채점
+        Args:
+            token (str): 문제 토큰
+            answers (list 또는 dict): 단위 순서의 답 목록 또는 {단위: 답}
+        Returns:
+            dict: {'correct', 'wrong_units', 'hints', 'patterns': {단위: 오답 유형}}
+        """
+        record = self.signer.verify(token)
+        answers = _answers(record.quantity, answers)
+        wrong_units, _ = grade_answers(record.quantity, answers, record.correct_answers)
+        return self._result(record, answers, wrong_units)
+
+    def grade_many(self, items):
+        """
+        답 여러 개 채점 (같은 영역이 많으면 grade_batch()로 한 번에 비교)
+        잘못된 항목은 전체를 실패시키지 않고 그 자리에 {'error', 'code'}를 돌려줌
+        Args:
+            items (list): [{'token', 'answers'}, ...]
+        Returns:
+            dict: {'results': [grade()의 결과 또는 오류, ...], 'summary': {'rows', 'correct_rows', 'errors'}}
+        """
+        if not isinstance(items, list) or not 1 <= len(items) <= MAX_BATCH:
+            raise ApiError(400, 'invalid_items', f"items는 1~{MAX_BATCH}개의 목록이어야 합니다.")
+        results = [None] * len(items)
+        groups = {}
+        now = time.time()
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ApiError(400, 'invalid_items', "items의 항목은 {token, answers} 객체여야 합니다.")
+                record = self.signer.verify(item.get('token'), now)
+                answers = _answers(record.quantity, item.get('answers'))
+            except ApiError as error:
+                results[index] = {'error': str(error), 'code': error.code}
+                continue
+            groups.setdefault(record.quantity_key, []).append((index, record, answers))
+
+        for key, rows in groups.items():
+            quantity = QUANTITIES[key]
+            if len(rows) < VECTOR_GRADE_MIN:
+                for index, record, answers in rows:
+                    wrong_units, _ = grade_answers(quantity, answers, record.correct_answers)
+                    results[index] = self._result(record, answers, wrong_units)
+                continue
+            answer_key = ProblemBatch(
+                quantity,
+                np.array([record.value for _, record, _ in rows], dtype=np.int64),
+                np.array([record.unit_code for _, record, _ in rows], dtype=np.int8)
+            )
+            graded = grade_batch(((index, row, answers) for row, (index, _, answers) in enumerate(rows)), answer_key)
+            for (index, record, answers), correct in zip(rows, graded.correct.tolist()):
+                wrong_units = [unit for unit, ok in zip(quantity.symbols, correct) if not ok]
+                results[index] = self._result(record, answers, wrong_units)
+
+        errors = sum(1 for result in results if 'error' in result)
+        return {
+            'results': results,
+            'summary': {
+                'rows': len(results),
+                'correct_rows': sum(1 for result in results if result.get('correct')),
+                'errors': errors
+            }
+        }
+
+    def handle(self, method, target, body):
+        """
+        요청 하나 처리
+        Args:
+            method (str): HTTP 메서드
+            target (str): 경로와 쿼리 (예: '/v1/problem?quantity=length')
+            body (bytes): 본문
+        Returns:
+            tuple: (HTTP 상태, 경로 이름(지표용), 응답 딕셔너리)
+        """
+        path, _, query_text = target.partition('?')
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                return 405, path, {'error': f"{method} 메서드는 지원하지 않습니다.", 'code': 'method_not_allowed'}
+            return 404, 'unknown', {'error': "없는 주소입니다.", 'code': 'not_found'}
+        try:
+            query = dict(parse_qsl(query_text)) if query_text else {}
+            if method == 'POST':
+                try:
+                    data = json.loads(body, parse_float=Decimal) if body else {}
+                except (UnicodeDecodeError, ValueError):
+                    raise ApiError(400, 'invalid_json', "본문이 JSON 형식이 아닙니다.") from None
+                if not isinstance(data, dict):
+                    raise ApiError(400, 'invalid_json', "본문은 JSON 객체여야 합니다.")
+            else:
+                data = None
+            return 200, path, handler(query, data)
+        except ApiError as error:
+            return error.status, path, {'error': str(error), 'code': error.code}
+
+
+def _default(value):
+    """json.dumps가 모르는 값 (Decimal 문자열, NumPy 정수)"""
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    if isinstance(value, np.integer):
+        return int(value)
+    raise TypeError(type(value).__name__)
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+    return b''.join((
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('ascii'),
+        body
+    ))
+
+
+class ApiServer:
+    """
+    asyncio HTTP/1.1 서버 (연결마다 요청을 차례로 처리, keep-alive와 파이프라이닝 지원)
+    처리는 모두 CPU 작업이므로 이벤트 루프 스레드 하나에서 바로 실행함
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self._server = None
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        writer.write(_response(status, payload, keep_alive))
+        if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+            await writer.drain()
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, {'error': "헤더가 너무 큽니다.", 'code': 'header_too_large'}, False)
+                    break
+                lines = head[:-4].decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                    headers = {}
+                    for line in lines[1:]:
+                        name, _, value = line.partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "HTTP 요청 형식이 틀렸습니다.", 'code': 'bad_request'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': "본문이 너무 큽니다.", 'code': 'body_too_large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                start = time.perf_counter()
+                try:
+                    status, route, payload = self.api.handle(method, target, body)
+                except Exception:
+                    status, route, payload = 500, target.partition('?')[0], {'error': "서버 오류입니다.", 'code': 'internal'}
+                if metrics.ENABLED:
+                    REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
+                    REQUESTS.inc(route=route, status=status)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8080, reuse_port=False):
+        """
+        서버 시작
+        Returns:
+            tuple: 실제로 연결을 받는 (host, port)
+        """
+        self._server = await asyncio.start_server(
+            self._connection, host, port, limit=MAX_HEADER_BYTES, reuse_port=reuse_port or None
+        )
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def create_api(secret=None, ttl=None):
+    """
+    환경 변수(API_SECRET, API_TOKEN_TTL)로 끝점 처리기 생성
+    Args:
+        secret (str 또는 None): 서명 키 (None이면 API_SECRET, 그것도 없으면 프로세스마다 임의 생성)
+        ttl (int 또는 None): 토큰 유효 시간 (None이면 API_TOKEN_TTL, 기본 1일)
+    Returns:
+        ProblemApi: 처리기
+    """
+    secret = secret or os.environ.get('API_SECRET')
+    if not secret:
+        print("API_SECRET이 없어 임의 키를 씁니다 (이 프로세스가 만든 토큰만 채점 가능).", file=sys.stderr)
+        secret = os.urandom(32)
+    if ttl is None:
+        ttl = int(os.environ.get('API_TOKEN_TTL', DEFAULT_TOKEN_TTL))
+    return ProblemApi(ProblemSigner(secret, ttl))
+
+
+async def _serve(host, port, reuse_port):
+    server = ApiServer(create_api())
+    address = await server.start(host, port, reuse_port)
+    print(f"API 서버: http://{address[0]}:{address[1]}", flush=True)
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--reuse-port', action='store_true',
+                        help='같은 포트로 여러 프로세스를 띄울 때 (SO_REUSEPORT, 같은 API_SECRET 필요)')
+    args = parser.parse_args(argv)
+    metrics.start_exporters()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.reuse_port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
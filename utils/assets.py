@@ -0,0 +1,45 @@
+"""
+정적 자원 유틸리티 모듈
+static/ 폴더의 스타일시트를 프로세스당 한 번만 읽고 내용 해시로 버전을 붙임
+재실행마다 큰 <style> 블록 대신 짧은 <link> 태그만 보내도록 함
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+# Streamlit 정적 파일 제공(server.enableStaticServing) 주소
+STATIC_URL = 'app/static'
+
+
+@lru_cache(maxsize=None)
+def read_static(name):
+    """
+    static/ 폴더의 텍스트 파일 내용과 버전 (프로세스당 한 번만 읽음)
+    Args:
+        name (str): 파일 이름 (예: 'app.css')
+    Returns:
+        tuple: (내용 str, 내용 SHA-256 해시 앞 12자리)
+    """
+    with open(os.path.join(STATIC_DIR, name), encoding='utf-8') as f:
+        text = f.read()
+    return text, hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+@lru_cache(maxsize=None)
+def stylesheet_html(static_serving, name='app.css'):
+    """
+    스타일시트를 페이지에 넣는 HTML
+    Args:
+        static_serving (bool): 정적 파일 제공이 켜져 있는지
+            (True면 버전이 붙은 <link>, False면 <style> 블록으로 대체)
+        name (str): static/ 폴더의 CSS 파일 이름
+    Returns:
+        str: st.markdown(..., unsafe_allow_html=True)로 넣을 HTML
+    """
+    css, version = read_static(name)
+    if static_serving:
+        return f'<link rel="stylesheet" href="{STATIC_URL}/{name}?v={version}">'
+    return f'<style>\n{css}</style>'
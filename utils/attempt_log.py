@@ -0,0 +1,237 @@
+"""
+풀이 기록 저장 유틸리티 모듈
+제출마다 (세션, 학급, 영역, 제시값/단위, 단위별 답, 정답 여부, 오답 유형, 풀이 시간)을 SQLite에 남김
+같은 트랜잭션에서 utils.analytics의 요약 표도 함께 갱신함
+
+제출 처리 중에는 메모리 큐에 넣기만 하고(디스크 입출력 없음),
+백그라운드 스레드가 모아서 한 트랜잭션으로 기록함 (WAL 모드)
+큐가 가득 차면 기다리지 않고 버린 뒤 그 수를 셈
+"""
+
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from utils.analytics import SUMMARY_SCHEMA, apply_summaries, rebuild_summaries
+
+# 기본 데이터베이스 파일
+DEFAULT_DB_PATH = 'attempts.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    session_id TEXT NOT NULL,
+    class_id TEXT NOT NULL DEFAULT '',
+    quantity TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    unit TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    wrong_units TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_ms REAL,
+    diagnoses TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS attempts_session ON attempts (session_id);
+"""
+
+_INSERT = """
+INSERT INTO attempts (created_at, session_id, class_id, quantity, value, unit, answers, wrong_units, correct, latency_ms, diagnoses)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def connect(path):
+    """
+    풀이 기록 데이터베이스 연결 (WAL 모드, 테이블이 없으면 생성)
+    예전 파일에 학급, 오답 유형 열이나 요약 표가 없으면 추가하고 기존 기록으로 요약 표를 채움
+    Args:
+        path (str): SQLite 파일 경로
+    Returns:
+        sqlite3.Connection: 연결 (만든 스레드에서만 사용)
+    """
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # WAL에서는 NORMAL로도 충돌 시 데이터베이스가 깨지지 않음 (마지막 트랜잭션만 잃을 수 있음)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(_SCHEMA)
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(attempts)')}
+    if 'class_id' not in columns:
+        with conn:
+            conn.execute("ALTER TABLE attempts ADD COLUMN class_id TEXT NOT NULL DEFAULT ''")
+    if 'diagnoses' not in columns:
+        with conn:
+            conn.execute("ALTER TABLE attempts ADD COLUMN diagnoses TEXT NOT NULL DEFAULT '{}'")
+    has_summaries = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'unit_stats'"
+    ).fetchone()
+    conn.executescript(SUMMARY_SCHEMA)
+    if not has_summaries:
+        rebuild_summaries(conn)
+    return conn
+
+
+class AttemptLog:
+    """
+    풀이 기록 쓰기 지연(write-behind) 저장소
+    record()는 큐에 넣기만 하고, 백그라운드 스레드가 batch_size개 또는
+    flush_interval초마다 모아서 기록함
+    Attributes:
+        path (str): SQLite 파일 경로
+        batch_size (int): 한 트랜잭션에 기록하는 최대 개수
+        flush_interval (float): 기록을 모으는 최대 시간(초)
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500, flush_interval=0.5, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._flush_total = 0.0
+        self._flush_max = 0.0
+        self._flush_last = 0.0
+        self._errors = 0
+        self._closed = False
+        # 스레드 시작 전에 한 번 연결하여 경로나 권한 문제를 바로 알림
+        connect(path).close()
+        self._thread = threading.Thread(target=self._run, name='AttemptLogWriter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, session_id, problem, answers, wrong_units, latency_ms=None, class_id='', diagnoses=()):
+        """
+        제출 한 번을 기록 큐에 넣음 (디스크 입출력 없이 바로 반환)
+        Args:
+            session_id (str): 세션 식별자
+            problem (ProblemRecord): 제출한 문제
+            answers (list): 단위 순서대로의 학생 답 (str 또는 Decimal)
+            wrong_units (list): 틀린 단위 기호 목록 (비어 있으면 정답)
+            latency_ms (float 또는 None): 문제를 보여준 뒤 제출까지 걸린 시간(ms)
+            class_id (str): 학급 (없으면 빈 문자열)
+            diagnoses (list): 틀린 단위의 Diagnosis 목록 (utils.diagnosis.diagnose()의 결과)
+        Returns:
+            bool: 큐에 넣었으면 True, 큐가 가득 차서 버렸으면 False
+        """
+        item = (time.time(), session_id, class_id, problem.quantity_key, problem.value, problem.unit,
+                tuple(str(answer) for answer in answers), tuple(wrong_units), latency_ms,
+                {diagnosis.unit: diagnosis.pattern for diagnosis in diagnoses})
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        return True
+
+    def _collect(self):
+        """큐에서 기록을 최대 batch_size개, flush_interval초 동안 모음 (종료 신호는 None)"""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get_nowait() if remaining <= 0 else self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, conn, items):
+        """모은 기록과 요약 표 증분을 한 트랜잭션으로 저장"""
+        rows = [
+            (created_at, session_id, class_id, quantity, value, unit, json.dumps(answers),
+             json.dumps(wrong_units, ensure_ascii=False), int(not wrong_units), latency_ms,
+             json.dumps(diagnoses, ensure_ascii=False))
+            for created_at, session_id, class_id, quantity, value, unit, answers, wrong_units, latency_ms, diagnoses in items
+        ]
+        with conn:
+            conn.executemany(_INSERT, rows)
+            apply_summaries(conn, [
+                (created_at, class_id, quantity, wrong_units, latency_ms, diagnoses)
+                for created_at, _, class_id, quantity, _, _, _, wrong_units, latency_ms, diagnoses in items
+            ])
+
+    def _run(self):
+        """
+        백그라운드 기록 스레드
+        어떤 예외가 나도 그 묶음만 버린 것으로 세고 계속 돌며, 꺼낸 기록마다 task_done()을 호출함
+        (스레드가 죽거나 task_done()을 빠뜨리면 flush()가 영원히 기다림)
+        """
+        conn = None
+        try:
+            while True:
+                batch = self._collect()
+                stop = bool(batch) and batch[-1] is None
+                items = batch[:-1] if stop else batch
+                try:
+                    if items:
+                        # 연결에 실패하면 다음 묶음에서 다시 연결함
+                        if conn is None:
+                            conn = connect(self.path)
+                        start = time.perf_counter()
+                        self._write(conn, items)
+                        elapsed = time.perf_counter() - start
+                        with self._lock:
+                            self._written += len(items)
+                            self._flushes += 1
+                            self._flush_total += elapsed
+                            self._flush_last = elapsed
+                            self._flush_max = max(self._flush_max, elapsed)
+                except Exception:
+                    with self._lock:
+                        self._errors += 1
+                        self._dropped += len(items)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def flush(self):
+        """지금까지 넣은 기록이 모두 저장될 때까지 기다림"""
+        self._queue.join()
+
+    def close(self):
+        """남은 기록을 저장하고 기록 스레드를 끝냄 (여러 번 호출해도 됨)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """
+        기록 상태
+        Returns:
+            dict: {
+                'queue_depth': 아직 저장하지 않은 기록 수,
+                'written': 저장한 기록 수,
+                'dropped': 큐가 가득 차거나 저장에 실패하여 버린 기록 수,
+                'errors': 저장 실패 횟수 (SQLite 오류뿐 아니라 모든 예외),
+                'flushes': 저장 트랜잭션 수,
+                'flush_ms_last', 'flush_ms_mean', 'flush_ms_max': 트랜잭션 시간(ms)
+            }
+        """
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'written': self._written,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'flushes': self._flushes,
+                'flush_ms_last': round(self._flush_last * 1000, 3),
+                'flush_ms_mean': round(self._flush_total / self._flushes * 1000, 3) if self._flushes else 0.0,
+                'flush_ms_max': round(self._flush_max * 1000, 3)
+            }
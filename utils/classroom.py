@@ -0,0 +1,242 @@
+"""
+실시간 수업 유틸리티 모듈
+선생님이 연 수업(방)에 들어온 학생 세션이 모두 같은 문제 열을 풀고, 순위표로 진행 상황을 함께 봄
+
+한 프로세스 안의 발행/구독 허브 (앱은 st.cache_resource로 모든 세션이 하나를 공유):
+    - 발행: 학생이 제출할 때마다 publish() - 점수 한 줄만 바꾸고 버전을 올림 (O(1))
+    - 구독: 순위표를 보는 세션은 leaderboard()로 최신 스냅숏을 받음
+      스냅숏은 버전이 바뀌었고 마지막으로 만든 지 throttle초가 지났을 때만 다시 만들므로
+      그 사이의 제출은 한 번으로 합쳐지고, 보는 사람이 몇 명이든 정렬은 주기마다 한 번뿐임
+      (보는 쪽 비용은 상위 몇 줄과 자기 순위 조회뿐이라 학생 수와 관계없이 일정함)
+"""
+
+import random
+import threading
+import time
+from utils.units import get_quantity
+
+# 수업 코드 (헷갈리는 0/O, 1/I 제외)
+ROOM_CODE_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+ROOM_CODE_LENGTH = 5
+
+# 순위표를 다시 만드는 최소 간격(초)
+DEFAULT_THROTTLE = 2.0
+
+# 이 시간(초) 동안 제출이 없는 수업은 정리
+ROOM_IDLE_TTL = 4 * 3600
+
+# 학생 이름 최대 길이
+MAX_NAME_LENGTH = 20
+
+
+class Member:
+    """
+    수업에 들어온 학생 하나의 점수
+    Attributes:
+        name (str): 표시 이름
+        solved (int): 맞힌 문제 수
+        mistakes (int): 틀린 단위 답 수 (누적)
+        joined_at (float): 들어온 시각
+    """
+
+    __slots__ = ('name', 'solved', 'mistakes', 'joined_at')
+
+    def __init__(self, name, joined_at):
+        self.name = name
+        self.solved = 0
+        self.mistakes = 0
+        self.joined_at = joined_at
+
+
+class Leaderboard:
+    """
+    순위표 스냅숏 (읽기 전용, 여러 세션이 같은 객체를 공유)
+    Attributes:
+        version (int): 만들 때의 수업 버전
+        built_at (float): 만든 시각
+        rows (tuple): 순위 순서의 (순위, 이름, 맞힌 문제 수, 틀린 답 수)
+        ranks (dict): {학생 id: 순위}
+        unit_mistakes (tuple): 틀린 답이 많은 순서의 (단위, 틀린 답 수) - 수업 전체
+        total_solved (int): 수업 전체 맞힌 문제 수
+    """
+
+    __slots__ = ('version', 'built_at', 'rows', 'ranks', 'unit_mistakes', 'total_solved')
+
+    def __init__(self, version, built_at, rows, ranks, unit_mistakes, total_solved):
+        self.version = version
+        self.built_at = built_at
+        self.rows = rows
+        self.ranks = ranks
+        self.unit_mistakes = unit_mistakes
+        self.total_solved = total_solved
+
+    def top(self, count):
+        """상위 count줄"""
+        return self.rows[:count]
+
+    def row_of(self, student_id):
+        """학생의 순위표 줄 (없으면 None)"""
+        rank = self.ranks.get(student_id)
+        return None if rank is None else self.rows[rank - 1]
+
+
+class Room:
+    """
+    수업 하나 (같은 영역, 같은 시드의 문제 열을 모든 학생이 공유)
+    Attributes:
+        code (str): 수업 코드
+        quantity (str): 영역 키
+        seed (int): 문제 열 시드
+        throttle (float): 순위표를 다시 만드는 최소 간격(초)
+        created_at (float): 연 시각
+        version (int): 점수가 바뀔 때마다 1씩 증가
+    """
+
+    def __init__(self, code, quantity, seed, throttle=DEFAULT_THROTTLE, now=None):
+        self.code = code
+        self.quantity = get_quantity(quantity).key
+        self.seed = seed
+        self.throttle = throttle
+        self.created_at = time.time() if now is None else now
+        self.updated_at = self.created_at
+        self.version = 0
+        self._members = {}
+        self._unit_mistakes = dict.fromkeys(get_quantity(quantity).symbols, 0)
+        self._lock = threading.Lock()
+        self._leaderboard = self._build(self.created_at)
+
+    def __len__(self):
+        return len(self._members)
+
+    def join(self, student_id, name, now=None):
+        """
+        학생 입장 (이미 있으면 이름만 바꿈)
+        Args:
+            student_id (str): 세션 id
+            name (str): 표시 이름 (MAX_NAME_LENGTH자까지)
+        """
+        now = time.time() if now is None else now
+        name = name.strip()[:MAX_NAME_LENGTH] or '학생'
+        with self._lock:
+            member = self._members.get(student_id)
+            if member is None:
+                self._members[student_id] = Member(name, now)
+            else:
+                member.name = name
+            self.version += 1
+            self.updated_at = now
+
+    def leave(self, student_id):
+        """학생 퇴장 (없어도 오류 아님)"""
+        with self._lock:
+            if self._members.pop(student_id, None) is not None:
+                self.version += 1
+
+    def publish(self, student_id, solved, wrong_units=(), now=None):
+        """
+        제출 결과 발행 (점수 한 줄과 단위별 오답 수만 바꿈, 순위표는 다시 만들지 않음)
+        Args:
+            student_id (str): 세션 id (입장하지 않았으면 무시)
+            solved (int): 지금까지 맞힌 문제 수
+            wrong_units (list): 이번 제출에서 틀린 단위 기호
+        """
+        with self._lock:
+            member = self._members.get(student_id)
+            if member is None:
+                return
+            member.solved = solved
+            member.mistakes += len(wrong_units)
+            for unit in wrong_units:
+                self._unit_mistakes[unit] += 1
+            self.version += 1
+            self.updated_at = time.time() if now is None else now
+
+    def _build(self, now):
+        """순위표 스냅숏 만들기 (맞힌 문제 많은 순 → 틀린 답 적은 순 → 먼저 들어온 순)"""
+        ordered = sorted(
+            self._members.items(),
+            key=lambda item: (-item[1].solved, item[1].mistakes, item[1].joined_at)
+        )
+        rows = tuple(
+            (rank, member.name, member.solved, member.mistakes)
+            for rank, (_, member) in enumerate(ordered, start=1)
+        )
+        ranks = {student_id: rank for rank, (student_id, _) in enumerate(ordered, start=1)}
+        unit_mistakes = tuple(sorted(
+            ((unit, count) for unit, count in self._unit_mistakes.items() if count),
+            key=lambda item: -item[1]
+        ))
+        total_solved = sum(member.solved for member in self._members.values())
+        return Leaderboard(self.version, now, rows, ranks, unit_mistakes, total_solved)
+
+    def leaderboard(self, now=None):
+        """
+        최신 순위표 (바뀐 것이 있고 마지막으로 만든 지 throttle초가 지났을 때만 다시 만듦)
+        Returns:
+            Leaderboard: 스냅숏 (최대 throttle초 늦을 수 있음)
+        """
+        now = time.time() if now is None else now
+        board = self._leaderboard
+        if board.version == self.version or now - board.built_at < self.throttle:
+            return board
+        with self._lock:
+            board = self._leaderboard
+            # 다른 세션이 방금 만들었으면 그대로 사용
+            if board.version != self.version and now - board.built_at >= self.throttle:
+                board = self._leaderboard = self._build(now)
+        return board
+
+
+class ClassroomHub:
+    """
+    프로세스 안의 수업 목록 (발행/구독 허브)
+    여러 서버 프로세스를 띄우면 수업은 연 프로세스에만 있으므로 같은 프로세스로 연결해야 함
+    """
+
+    def __init__(self, throttle=DEFAULT_THROTTLE, idle_ttl=ROOM_IDLE_TTL):
+        self.throttle = throttle
+        self.idle_ttl = idle_ttl
+        self._rooms = {}
+        self._lock = threading.Lock()
+        self._rng = random.SystemRandom()
+
+    def _prune(self, now):
+        """오래 쓰지 않은 수업 정리 (잠금 안에서 호출)"""
+        for code in [code for code, room in self._rooms.items() if now - room.updated_at > self.idle_ttl]:
+            del self._rooms[code]
+
+    def open_room(self, quantity, seed=None, now=None):
+        """
+        새 수업 열기
+        Args:
+            quantity (str): 영역 키
+            seed (int 또는 None): 문제 열 시드 (None이면 새로 뽑음)
+        Returns:
+            Room: 새 수업
+        """
+        now = time.time() if now is None else now
+        seed = self._rng.getrandbits(31) if seed is None else seed
+        with self._lock:
+            self._prune(now)
+            while True:
+                code = ''.join(self._rng.choice(ROOM_CODE_ALPHABET) for _ in range(ROOM_CODE_LENGTH))
+                if code not in self._rooms:
+                    break
+            room = self._rooms[code] = Room(code, quantity, seed, self.throttle, now)
+        return room
+
+    def get(self, code):
+        """
+        수업 코드로 찾기 (대소문자 구분 없음)
+        Returns:
+            Room 또는 None: 없거나 닫힌 수업이면 None
+        """
+        return self._rooms.get((code or '').strip().upper())
+
+    def close(self, code):
+        """수업 닫기 (들어와 있던 학생 화면에는 수업 종료가 표시됨)"""
+        with self._lock:
+            self._rooms.pop(code, None)
+
+    def __len__(self):
+        return len(self._rooms)
@@ -0,0 +1,410 @@
+"""
+일괄 처리 명령줄 도구 모듈 (python -m utils)
+웹앱 없이 배치 서버의 모든 코어로 문제를 만들거나 지역 단위 평가 답안 수백만 행을 채점함
+
+    python -m utils generate -n 100000 --quantity length weight --seed 42 -o problems.csv
+    python -m utils grade answers.csv -o graded.csv --workers 8
+
+입력은 한 묶음(--chunk-size 행)씩 읽어 프로세스 풀에 넘기고, 결과는 입력 순서대로 바로 씀
+(처리 중인 묶음은 최대 작업자 수 × 4개이므로 파일 크기와 관계없이 메모리 사용량이 일정함)
+
+generate: 영역마다 n개 문제를 generate_problems()로 묶음마다 만들어 학습지/정답지 형식(utils.export)으로 기록
+    묶음마다 (시드, 영역, 묶음 번호)로 정해지는 난수를 쓰므로 작업자 수와 관계없이 같은 시드면 같은 파일이 나옴
+grade: 학습지 형식의 CSV/JSONL 답안을 채점하여 입력 열 뒤에 correct, wrong_units, hints, error를 붙여 기록
+    문제는 quantity 열과 value 열(기준 단위 정수값) 또는 display_value, unit 열로 알아냄
+    답은 단위 기호 열(CSV) 또는 answers 객체나 단위 기호 키(JSONL)
+    힌트는 get_wrong_units_and_hints()의 결과, 형식이 틀린 행은 error 열에 이유를 적고 계속 진행
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import islice
+import numpy as np
+from utils.converter import convert, get_wrong_units_and_hints, grade_answers
+from utils.export import iter_csv, iter_jsonl, unit_columns
+from utils.generator import generate_problems
+from utils.units import QUANTITIES
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# 작업자 하나당 동시에 처리 중일 수 있는 묶음 수
+WINDOW_PER_WORKER = 4
+
+# grade가 붙이는 열
+RESULT_COLUMNS = ('correct', 'wrong_units', 'hints', 'error')
+
+# CSV에서 틀린 단위와 힌트를 이어 쓸 때의 구분자
+LIST_SEPARATOR = ';'
+HINT_SEPARATOR = ' | '
+
+
+def ordered_map(function, tasks, workers, window=None):
+    """
+    작업을 프로세스 풀에서 처리하고 결과를 입력 순서대로 내보냄
+    진행 중인 작업을 window개로 묶어 두므로 tasks가 끝없이 커도 메모리가 늘지 않음
+    Args:
+        function (callable): 모듈 최상위 함수 (다른 프로세스로 보낼 수 있어야 함)
+        tasks (iterable): 작업 인자 (하나씩 읽음)
+        workers (int): 작업자 프로세스 수 (1 이하이면 현재 프로세스에서 처리)
+        window (int 또는 None): 동시에 진행할 최대 작업 수 (None이면 workers × 4)
+    Yields:
+        function(task)의 결과 (tasks 순서)
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    window = window or workers * WINDOW_PER_WORKER
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(function, task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _chunks(iterable, size):
+    """size개씩 목록으로 묶음"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# generate
+# ---------------------------------------------------------------------------
+
+def generate_tasks(quantities, n, seed, chunk_size, fmt, answer_key):
+    """
+    generate의 묶음 작업 목록
+    Args:
+        quantities (list): 영역 키 목록
+        n (int): 영역별 문제 수
+        seed (int): 난수 시드
+        chunk_size (int): 묶음 크기
+        fmt (str): 'csv' 또는 'jsonl'
+        answer_key (bool): True면 정답 포함
+    Yields:
+        tuple: generate_chunk()의 인자
+    """
+    columns = unit_columns(quantities)
+    for position, key in enumerate(quantities):
+        for chunk, start in enumerate(range(0, n, chunk_size)):
+            size = min(chunk_size, n - start)
+            yield key, start, size, (seed, position, chunk), fmt, answer_key, columns
+
+
+def generate_chunk(task):
+    """
+    문제 묶음 하나를 만들어 출력 텍스트로 (작업자 프로세스에서 실행)
+    Returns:
+        str: CSV(머리글 제외) 또는 JSON Lines 텍스트
+    """
+    key, start, size, (seed, position, chunk), fmt, answer_key, columns = task
+    quantity = QUANTITIES[key]
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(position, chunk)))
+    batch = generate_problems(quantity, size, rng)
+    rows = (
+        {
+            'number': start + offset + 1,
+            'quantity': key,
+            'value': int(problem[quantity.value_key]),
+            'unit': problem['unit'],
+            'display_value': problem['display_value'],
+            'answers': dict(zip(quantity.symbols, problem['correct_answers']))
+        }
+        for offset, problem in enumerate(batch)
+    )
+    if fmt == 'csv':
+        # iter_csv()는 머리글을 첫 행과 함께 내보내므로 첫 줄(머리글)만 떼어 냄
+        return ''.join(iter_csv(rows, columns, answer_key)).partition('\n')[2]
+    return ''.join(iter_jsonl(rows, answer_key))
+
+
+def generate_header(quantities, fmt, answer_key):
+    """generate 출력의 머리글 (JSON Lines는 빈 문자열)"""
+    if fmt != 'csv':
+        return ''
+    return next(iter_csv((), unit_columns(quantities), answer_key))
+
+
+# ---------------------------------------------------------------------------
+# grade
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=65536)
+def problem_answers(quantity_key, value, display_value, unit):
+    """
+    답안 행의 문제 열로 정답 목록 계산 (같은 문제를 여러 학생이 풀므로 캐시)
+    Args:
+        quantity_key (str): 영역 키
+        value (str): 기준 단위 값 (빈 문자열이면 display_value와 unit으로 계산)
+        display_value (str): 제시값
+        unit (str): 제시 단위 기호
+    Returns:
+        tuple: (Quantity, 정답 Decimal tuple)
+    Raises:
+        ValueError: 영역이나 제시값을 알 수 없을 때
+    """
+    quantity = QUANTITIES.get(quantity_key.strip())
+    if quantity is None:
+        raise ValueError(f"영역은 {', '.join(QUANTITIES)} 중 하나여야 합니다.")
+    try:
+        if value.strip():
+            base = Decimal(value)
+        else:
+            code = quantity.unit_index.get(unit.strip())
+            if code is None:
+                raise ValueError(f"단위는 {', '.join(quantity.symbols)} 중 하나여야 합니다.")
+            # 제시값 × 10^지수 = 기준값 (지수만 바꾸므로 정확함)
+            base = Decimal(display_value).scaleb(quantity.units[code].exponent)
+        if not base.is_finite():
+            raise InvalidOperation
+        answers = tuple(convert(quantity, base).values())
+    except ArithmeticError:
+        # InvalidOperation(숫자가 아님)과 Overflow(1e999999999처럼 Decimal 범위를 넘음) 모두
+        raise ValueError("value 또는 display_value가 숫자가 아니거나 범위를 벗어났습니다.") from None
+    return quantity, answers
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def _parse_answer(text):
+    """답을 한 번만 Decimal로 해석 (숫자가 아니면 문자열 그대로 두어 채점 함수가 오답 처리)"""
+    try:
+        return Decimal(text)
+    except (InvalidOperation, TypeError):
+        return text
+
+
+def _grade(quantity, correct_answers, answers):
+    """단위 순서의 답 목록 채점 → (정답 여부, 틀린 단위 목록, 힌트 목록)"""
+    user_answers = [_parse_answer(answer) for answer in answers]
+    wrong_units, _ = grade_answers(quantity, user_answers, correct_answers)
+    if not wrong_units:
+        # 틀린 단위가 없으면 힌트도 없음 (같은 허용범위로 비교)
+        return True, wrong_units, []
+    hints = get_wrong_units_and_hints(user_answers, correct_answers, quantity.symbols, quantity.hint_messages)
+    return False, wrong_units, hints
+
+
+def grade_record(record, answers=None):
+    """
+    답안 행 하나 채점
+    Args:
+        record (dict): 문제 열(quantity, value 또는 display_value/unit)이 있는 행
+        answers (dict 또는 None): {단위: 답} (None이면 record의 단위 기호 키에서 읽음)
+    Returns:
+        tuple: (정답 여부, 틀린 단위 목록, 힌트 목록, 오류 메시지 또는 '')
+    """
+    try:
+        quantity, correct_answers = problem_answers(
+            _text(record.get('quantity')), _text(record.get('value')),
+            _text(record.get('display_value')), _text(record.get('unit'))
+        )
+    except ValueError as error:
+        return False, [], [], str(error)
+    answers = record if answers is None else answers
+    return (*_grade(quantity, correct_answers, [_text(answers.get(unit)) for unit in quantity.symbols]), '')
+
+
+def _csv_positions(header):
+    """CSV 머리글에서 문제 열과 영역별 단위 열의 위치 (없는 열은 None)"""
+    index = {name: position for position, name in enumerate(header)}
+    problem = tuple(index.get(name) for name in ('quantity', 'value', 'display_value', 'unit'))
+    units = {key: tuple(index.get(unit) for unit in quantity.symbols) for key, quantity in QUANTITIES.items()}
+    return problem, units
+
+
+def grade_chunk(task):
+    """
+    답안 묶음 하나 채점 (작업자 프로세스에서 실행)
+    Args:
+        task (tuple): ('csv', 머리글, 행 목록) 또는 ('jsonl', None, 줄 목록)
+    Returns:
+        tuple: (출력 텍스트, {'rows', 'correct_rows', 'errors', 'wrong_by_unit'})
+    """
+    fmt, header, lines = task
+    stats = {'rows': 0, 'correct_rows': 0, 'errors': 0, 'wrong_by_unit': Counter()}
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        width = len(header)
+        problem_positions, unit_positions = _csv_positions(header)
+        for line in lines:
+            row = line[:width] + [''] * (width - len(line))
+            try:
+                quantity, correct_answers = problem_answers(
+                    *('' if position is None else row[position] for position in problem_positions))
+            except ValueError as problem_error:
+                correct, wrong_units, hints, error = False, [], [], str(problem_error)
+            else:
+                answers = ['' if position is None else row[position] for position in unit_positions[quantity.key]]
+                correct, wrong_units, hints = _grade(quantity, correct_answers, answers)
+                error = ''
+            writer.writerow(row + [int(correct), LIST_SEPARATOR.join(wrong_units),
+                                   HINT_SEPARATOR.join(hint.replace('\n', ' ') for hint in hints), error])
+            stats['rows'] += 1
+            stats['correct_rows'] += correct
+            stats['errors'] += bool(error)
+            stats['wrong_by_unit'].update(wrong_units)
+        return buffer.getvalue(), stats
+
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError
+        except ValueError:
+            record = {'line': line.rstrip('\n')}
+            correct, wrong_units, hints, error = False, [], [], "JSON 객체 형식이 아닙니다."
+        else:
+            answers = record.get('answers')
+            correct, wrong_units, hints, error = grade_record(record, answers if isinstance(answers, dict) else None)
+        record.update(correct=correct, wrong_units=wrong_units, hints=hints, error=error)
+        buffer.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stats['rows'] += 1
+        stats['correct_rows'] += correct
+        stats['errors'] += bool(error)
+        stats['wrong_by_unit'].update(wrong_units)
+    return buffer.getvalue(), stats
+
+
+def grade_tasks(fileobj, fmt, chunk_size):
+    """
+    입력 파일을 묶음 작업으로 (한 묶음씩 읽음)
+    Args:
+        fileobj: 텍스트 파일 객체 (CSV는 newline='' 으로 연 것)
+        fmt (str): 'csv' 또는 'jsonl'
+        chunk_size (int): 묶음 크기
+    Returns:
+        tuple: (출력 머리글, 작업 생성기)
+    """
+    if fmt == 'jsonl':
+        lines = (line for line in fileobj if line.strip())
+        return '', (('jsonl', None, chunk) for chunk in _chunks(lines, chunk_size))
+    reader = csv.reader(fileobj)
+    header = [name.strip() for name in next(reader, [])]
+    if 'quantity' not in header:
+        raise ValueError("CSV에 quantity 열이 없습니다.")
+    # 입력에 이미 결과 열이 있으면 (다시 채점) 떼어 내고 새로 붙임
+    header = [name for name in header if name not in RESULT_COLUMNS]
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(header + list(RESULT_COLUMNS))
+    return buffer.getvalue(), (('csv', header, chunk) for chunk in _chunks(reader, chunk_size))
+
+
+# ---------------------------------------------------------------------------
+# 명령줄
+# ---------------------------------------------------------------------------
+
+def _format(path, given):
+    """--format이 없으면 파일 확장자로 형식 결정"""
+    if given:
+        return given
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def _open_output(path):
+    if path == '-':
+        return open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _open_input(path):
+    if path == '-':
+        return open(sys.stdin.fileno(), encoding='utf-8-sig', newline='', closefd=False)
+    return open(path, encoding='utf-8-sig', newline='')
+
+
+def run_generate(args):
+    quantities = args.quantity or list(QUANTITIES)
+    fmt = _format(args.output, args.format)
+    # 시드를 주지 않으면 새로 뽑아 알려 줌 (같은 파일을 다시 만들 수 있도록)
+    seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % 2 ** 63)
+    start = time.perf_counter()
+    tasks = generate_tasks(quantities, args.n, seed, args.chunk_size, fmt, args.answer_key)
+    with _open_output(args.output) as out:
+        out.write(generate_header(quantities, fmt, args.answer_key))
+        for text in ordered_map(generate_chunk, tasks, args.workers):
+            out.write(text)
+    elapsed = time.perf_counter() - start
+    total = args.n * len(quantities)
+    print(f"문제 {total:,}개 생성 (시드 {seed}, {elapsed:.2f}초, 초당 {total / max(elapsed, 1e-9):,.0f}개)", file=sys.stderr)
+    return 0
+
+
+def run_grade(args):
+    fmt = _format(args.input, args.format)
+    start = time.perf_counter()
+    totals = {'rows': 0, 'correct_rows': 0, 'errors': 0, 'wrong_by_unit': Counter()}
+    with _open_input(args.input) as source:
+        try:
+            header, tasks = grade_tasks(source, fmt, args.chunk_size)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        with _open_output(args.output) as out:
+            out.write(header)
+            for text, stats in ordered_map(grade_chunk, tasks, args.workers):
+                out.write(text)
+                for key in ('rows', 'correct_rows', 'errors'):
+                    totals[key] += stats[key]
+                totals['wrong_by_unit'].update(stats['wrong_by_unit'])
+    elapsed = time.perf_counter() - start
+    rows = totals['rows']
+    print(f"{rows:,}행 채점 ({elapsed:.2f}초, 초당 {rows / max(elapsed, 1e-9):,.0f}행): "
+          f"정답 {totals['correct_rows']:,}행, 오류 {totals['errors']:,}행", file=sys.stderr)
+    if totals['wrong_by_unit']:
+        print("단위별 오답: " + ', '.join(f"{unit} {count:,}" for unit, count in totals['wrong_by_unit'].most_common()),
+              file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m utils', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='작업자 프로세스 수 (기본: 코어 수)')
+    common.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='작업자에게 한 번에 넘기는 행 수')
+    common.add_argument('--format', choices=['csv', 'jsonl'], help='파일 형식 (생략 시 확장자로 판단)')
+
+    generate = commands.add_parser('generate', parents=[common], help='영역별 문제 만들기')
+    generate.add_argument('-n', type=int, required=True, help='영역별 문제 수')
+    generate.add_argument('--quantity', nargs='*', choices=list(QUANTITIES), help='영역 (생략 시 모두)')
+    generate.add_argument('--seed', type=int, help='난수 시드 (같은 시드면 작업자 수와 관계없이 같은 결과)')
+    generate.add_argument('--answer-key', action='store_true', help='기준값과 정답 포함')
+    generate.add_argument('-o', '--output', default='-', help='출력 파일 (기본: 표준 출력)')
+
+    grade = commands.add_parser('grade', parents=[common], help='답안 파일 채점')
+    grade.add_argument('input', help='답안 파일 (CSV 또는 JSONL, -이면 표준 입력)')
+    grade.add_argument('-o', '--output', default='-', help='출력 파일 (기본: 표준 출력)')
+
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size는 1 이상이어야 합니다.')
+    try:
+        if args.command == 'generate':
+            return run_generate(args)
+        return run_grade(args)
+    except BrokenPipeError:
+        # head 등으로 출력을 일부만 읽고 닫은 경우: 남은 출력은 버리고 조용히 종료
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
@@ -2,9 +2,70 @@
 단위 변환 유틸리티 모듈
 길이, 들이, 무게 단위 변환 함수 제공
 Decimal을 사용하여 정확한 계산 수행
+(convert_fixed/compare_fixed_values는 utils.fixedpoint의 고정소수점 정수 표현을 직접 사용)
+영역별 단위와 변환 배율은 utils.units 레지스트리에서 가져옴
 """
 
 from decimal import Decimal
+from utils import fixedpoint
+from utils.units import Quantity, get_quantity, LENGTH, CAPACITY, WEIGHT
+
+
+# 기본 오차 허용범위 (Decimal은 미리 해석해 둠)
+DEFAULT_TOLERANCE = '0.0001'
+_DEFAULT_TOLERANCE_DEC = fixedpoint.tolerance(DEFAULT_TOLERANCE)[0]
+
+
+def _as_decimal(value):
+    """Decimal이 아니면 문자열을 거쳐 Decimal로 변환"""
+    return value if type(value) is Decimal else Decimal(str(value))
+
+
+def _accepts(user_dec, correct_dec, tolerance_dec):
+    """
+    채점 판정: 차이가 오차 허용범위 이하이고, 정답이 0이 아니면 차이가 정답 크기의 절반 이하이기도 해야 정답
+    (실제 허용범위 = min(허용범위, |정답| / 2) - 0.0001km처럼 정답이 허용범위만큼 작을 때
+    0.00001 같은 10의 거듭제곱 오답을 걸러냄, 정답이 0이면 예전처럼 허용범위만 봄)
+    """
+    # 정확히 같은 값이면 뺄셈 없이 바로 판정 (정답 제출의 대부분)
+    if user_dec == correct_dec and tolerance_dec >= 0:
+        return True
+    difference = abs(user_dec - correct_dec)
+    if difference > tolerance_dec:
+        return False
+    return not correct_dec or difference + difference <= abs(correct_dec)
+
+
+def convert_fixed(value, unit_exponents):
+    """
+    고정소수점 기준값을 모든 단위로 변환 (지수 이동만 수행)
+    Args:
+        value (tuple): 기준 단위 값 (mantissa, exponent)
+        unit_exponents (tuple): (단위, 지수) 목록
+    Returns:
+        dict: {단위: (mantissa, exponent)}
+    """
+    return {unit: fixedpoint.shift(value, -exp) for unit, exp in unit_exponents}
+
+
+def convert(quantity, value):
+    """
+    기준 단위 값을 영역의 모든 단위로 변환 (Decimal 기반)
+    미리 만들어 둔 10^k Decimal로 나눔 (나누어떨어지므로 결과는 convert_fixed와 같은 값)
+    fixedpoint를 거치면 호출당 약 3배 느려서 채점 경로는 Decimal 나눗셈을 그대로 씀
+    Args:
+        quantity (str 또는 Quantity): 영역 키 (예: 'length')
+        value (Decimal 또는 str): 기준 단위 값
+    Returns:
+        dict: {단위: Decimal} (정답 순서)
+    """
+    if type(quantity) is not Quantity:
+        quantity = get_quantity(quantity)
+    value = _as_decimal(value)
+    conversions = {quantity.base_unit: value}
+    for unit, divisor in quantity.divisors:
+        conversions[unit] = value / divisor
+    return conversions
 
 
 def convert_length(value_mm):
@@ -15,13 +76,7 @@ def convert_length(value_mm):
     Returns:
         dict: {'mm': Decimal, 'cm': Decimal, 'm': Decimal, 'km': Decimal}
     """
-    value = Decimal(str(value_mm)) if not isinstance(value_mm, Decimal) else value_mm
-    return {
-        'mm': value,
-        'cm': value / Decimal('10'),
-        'm': value / Decimal('1000'),
-        'km': value / Decimal('1000000')
-    }
+    return convert(LENGTH, value_mm)
 
 
 def convert_capacity(value_ml):
@@ -32,11 +87,7 @@ def convert_capacity(value_ml):
     Returns:
         dict: {'mL': Decimal, 'L': Decimal}
     """
-    value = Decimal(str(value_ml)) if not isinstance(value_ml, Decimal) else value_ml
-    return {
-        'mL': value,
-        'L': value / Decimal('1000')
-    }
+    return convert(CAPACITY, value_ml)
 
 
 def convert_weight(value_g):
@@ -47,31 +98,42 @@ def convert_weight(value_g):
     Returns:
         dict: {'g': Decimal, 'kg': Decimal, 't': Decimal}
     """
-    value = Decimal(str(value_g)) if not isinstance(value_g, Decimal) else value_g
-    return {
-        'g': value,
-        'kg': value / Decimal('1000'),
-        't': value / Decimal('1000000')
-    }
+    return convert(WEIGHT, value_g)
+
+
+def compare_fixed_values(user_value, correct_value, tolerance=DEFAULT_TOLERANCE):
+    """
+    두 고정소수점 값을 정수 연산으로 비교 (Decimal 정밀도 제한 없음)
+    Args:
+        user_value (tuple): 사용자 입력값 (mantissa, exponent)
+        correct_value (tuple): 정답값 (mantissa, exponent)
+        tolerance (str): 오차 허용범위
+    Returns:
+        bool: 두 값이 일치하면 True
+    """
+    return fixedpoint.matches(user_value, correct_value, fixedpoint.tolerance(tolerance)[1])
 
 
-def compare_decimal_values(user_value, correct_value, tolerance='0.0001'):
+def compare_decimal_values(user_value, correct_value, tolerance=DEFAULT_TOLERANCE):
     """
     두 Decimal 값을 비교하여 일치 여부 확인
+    (차이가 오차 허용범위와 정답 크기의 절반 중 작은 쪽 이하이면 정답, 정답이 0이면 허용범위만 봄)
     Args:
         user_value (Decimal 또는 str): 사용자 입력값
         correct_value (Decimal): 정답값
         tolerance (str): 오차 허용범위
     Returns:
-        bool: 두 값이 일치하면 True
+        bool: 두 값이 일치하면 True (숫자가 아닌 값이면 False)
     """
     try:
-        user_dec = Decimal(str(user_value)) if not isinstance(user_value, Decimal) else user_value
-        correct_dec = Decimal(str(correct_value)) if not isinstance(correct_value, Decimal) else correct_value
-        tolerance_dec = Decimal(tolerance)
-        
-        return abs(user_dec - correct_dec) <= tolerance_dec
-    except:
+        user_dec = user_value if type(user_value) is Decimal else Decimal(str(user_value))
+        correct_dec = correct_value if type(correct_value) is Decimal else Decimal(str(correct_value))
+        if tolerance == DEFAULT_TOLERANCE:
+            tolerance_dec = _DEFAULT_TOLERANCE_DEC
+        else:
+            tolerance_dec = fixedpoint.tolerance(tolerance)[0]
+        return _accepts(user_dec, correct_dec, tolerance_dec)
+    except (ArithmeticError, ValueError, TypeError):
         return False
 
 
@@ -84,20 +146,39 @@ def get_wrong_units_and_hints(user_answers, correct_answers, units, hint_message
         units (list): 단위 이름 리스트
         hint_messages (dict): 단위별 힌트 메시지 딕셔너리
     Returns:
-        list: 틀린 단위별 힌트 메시지 리스트
+        list: 틀린 단위별 힌트 메시지 리스트 (숫자가 아닌 입력은 건너뜀)
     """
     hints = []
-    tolerance = Decimal('0.0001')
+    tolerance = _DEFAULT_TOLERANCE_DEC
     
     for user, correct, unit in zip(user_answers, correct_answers, units):
         try:
-            user_dec = Decimal(str(user)) if not isinstance(user, Decimal) else user
-            correct_dec = Decimal(str(correct)) if not isinstance(correct, Decimal) else correct
-            
-            if abs(user_dec - correct_dec) > tolerance:
+            user_dec = _as_decimal(user)
+            correct_dec = _as_decimal(correct)
+            if not _accepts(user_dec, correct_dec, tolerance):
                 if unit in hint_messages:
                     hints.append(hint_messages[unit])
-        except:
+        except (ArithmeticError, ValueError, TypeError):
             pass
     
     return hints
+
+
+def grade_answers(quantity, user_answers, correct_answers, tolerance=DEFAULT_TOLERANCE):
+    """
+    한 문제의 모든 단위 답을 한 번에 채점 (단위마다 한 번만 비교)
+    Args:
+        quantity (str 또는 Quantity): 영역 키
+        user_answers (list): 사용자 입력값 (Decimal 또는 str, 정답 순서)
+        correct_answers (list): 정답값 (Decimal)
+        tolerance (str): 오차 허용범위
+    Returns:
+        tuple: (틀린 단위 기호 리스트, 틀린 단위별 힌트 메시지 리스트)
+    """
+    quantity = get_quantity(quantity)
+    wrong_units = [
+        unit
+        for user, correct, unit in zip(user_answers, correct_answers, quantity.symbols)
+        if not compare_decimal_values(user, correct, tolerance)
+    ]
+    return wrong_units, [quantity.hint_messages[unit] for unit in wrong_units]
@@ -0,0 +1,158 @@
+"""
+오답 진단 유틸리티 모듈
+틀린 답을 흔한 오개념 유형으로 분류하여 단위별 고정 힌트 대신 구체적인 힌트와 분석 자료를 제공
+
+문제마다 유형별 후보 오답(Decimal)을 미리 만들어 두고, 학생 답을 해시 조회 한 번으로 분류함
+(같은 문제에 다시 제출하면 후보 표를 다시 만들지 않음)
+    - unchanged: 제시값을 그대로 씀 (단위를 바꾸지 않음)
+    - reversed: 곱하기와 나누기를 반대로 함
+    - wrong_factor: 정답의 10배, 100배, 1000배 또는 그 역수 (단위 사이 배율을 잘못 씀)
+    - misplaced_point: 숫자는 맞지만 소수점이 4자리 이상 어긋남
+    - other: 위 유형에 해당하지 않음
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from utils.converter import convert
+from utils.units import get_quantity
+
+# 유형 이름과 화면 표시 이름 (앞쪽 유형이 우선: 후보 값이 겹치면 앞쪽으로 분류)
+PATTERN_LABELS = {
+    'unchanged': '제시값 그대로',
+    'reversed': '곱하기/나누기 반대',
+    'wrong_factor': '10·100·1000배 차이',
+    'misplaced_point': '소수점 위치',
+    'other': '기타'
+}
+
+# 단위 배율을 잘못 쓴 것으로 보는 최대 자릿수 차이 (×1000)
+WRONG_FACTOR_MAX_SHIFT = 3
+
+# 소수점 위치 오류로 보는 최대 자릿수 차이
+MISPLACED_MAX_SHIFT = 9
+
+
+class Diagnosis:
+    """
+    틀린 답 하나의 진단
+    Attributes:
+        unit (str): 틀린 단위 기호
+        pattern (str): 오답 유형 (PATTERN_LABELS의 키)
+        shift (int 또는 None): 학생 답 = 정답 × 10^shift (other이면 None)
+        hint (str): 화면에 보여줄 힌트 메시지
+    """
+
+    __slots__ = ('unit', 'pattern', 'shift', 'hint')
+
+    def __init__(self, unit, pattern, shift, hint):
+        self.unit = unit
+        self.pattern = pattern
+        self.shift = shift
+        self.hint = hint
+
+    def as_dict(self):
+        """분석/저장용 딕셔너리"""
+        return {'unit': self.unit, 'pattern': self.pattern, 'shift': self.shift}
+
+    def __repr__(self):
+        return f"Diagnosis({self.unit!r}, {self.pattern!r}, shift={self.shift!r})"
+
+
+@lru_cache(maxsize=None)
+def shift_patterns(quantity_key, unit_code, target):
+    """
+    (제시 단위, 답 단위) 쌍에서 정답 대비 자릿수 차이별 오답 유형 (프로세스당 한 번 계산)
+    Args:
+        quantity_key (str): 영역 키
+        unit_code (int): 제시 단위 코드
+        target (int): 답 단위 코드
+    Returns:
+        dict: {자릿수 차이 k: 유형} - 학생 답 = 정답 × 10^k
+    """
+    units = get_quantity(quantity_key).units
+    # 정답 = 제시값 × 10^(제시 지수 - 답 지수)
+    move = units[unit_code].exponent - units[target].exponent
+    patterns = {}
+    for k in range(-MISPLACED_MAX_SHIFT, MISPLACED_MAX_SHIFT + 1):
+        if 0 < abs(k) <= WRONG_FACTOR_MAX_SHIFT:
+            patterns[k] = 'wrong_factor'
+        elif abs(k) > WRONG_FACTOR_MAX_SHIFT:
+            patterns[k] = 'misplaced_point'
+    if move:
+        # 반대 방향 = 제시값 × 10^(-move) = 정답 × 10^(-2·move)
+        patterns[-2 * move] = 'reversed'
+        # 제시값 그대로 = 정답 × 10^(-move)
+        patterns[-move] = 'unchanged'
+    return patterns
+
+
+@lru_cache(maxsize=4096)
+def candidate_table(quantity_key, value, unit_code):
+    """
+    문제 하나의 답 단위별 후보 오답 표
+    Args:
+        quantity_key (str): 영역 키
+        value (int): 기준 단위 정수값
+        unit_code (int): 제시 단위 코드
+    Returns:
+        tuple: 답 단위 순서의 {후보 오답 Decimal: (유형, 자릿수 차이)}
+            (Decimal은 값이 같으면 해시가 같으므로 '1.50'과 '1.5'가 같은 키로 조회됨)
+    """
+    quantity = get_quantity(quantity_key)
+    answers = list(convert(quantity, Decimal(value)).values())
+    tables = []
+    for target, correct in enumerate(answers):
+        table = {}
+        for k, pattern in shift_patterns(quantity.key, unit_code, target).items():
+            # scaleb는 지수만 바꾸므로 정확함
+            table[correct.scaleb(k)] = (pattern, k)
+        tables.append(table)
+    return tuple(tables)
+
+
+def _hint(quantity, unit_code, target, pattern, shift):
+    """유형별 힌트 메시지 (기존 단위 관계 힌트를 둘째 줄로 붙임)"""
+    shown = quantity.units[unit_code]
+    unit = quantity.units[target]
+    relation = quantity.hint_messages[unit.symbol].split('\n', 1)[-1]
+    if pattern == 'unchanged':
+        reason = f"❌ {unit.symbol}: 제시된 값을 그대로 적었어요. {shown.symbol}을(를) {unit.symbol}(으)로 바꿔야 합니다."
+    elif pattern == 'reversed':
+        operation = '나누어야' if unit.exponent > shown.exponent else '곱해야'
+        reason = (f"❌ {unit.symbol}: 곱하기와 나누기를 반대로 했어요. "
+                  f"{shown.symbol} → {unit.symbol}은(는) {10 ** abs(unit.exponent - shown.exponent):,}(으)로 {operation} 합니다.")
+    elif pattern == 'wrong_factor':
+        size = '큽니다' if shift > 0 else '작습니다'
+        reason = f"❌ {unit.symbol}: 답이 정답보다 {10 ** abs(shift):,}배 {size}. 단위 사이의 배율을 다시 세어보세요."
+    elif pattern == 'misplaced_point':
+        side = '오른쪽' if shift > 0 else '왼쪽'
+        reason = f"❌ {unit.symbol}: 숫자는 맞지만 소수점이 {abs(shift)}자리 {side}으로 옮겨졌어요."
+    else:
+        return quantity.hint_messages[unit.symbol]
+    return f"{reason}\n{relation}"
+
+
+def diagnose(problem, user_answers, wrong_units):
+    """
+    틀린 단위의 답을 오답 유형으로 분류
+    Args:
+        problem (ProblemRecord): 채점한 문제
+        user_answers (list): 단위 순서대로의 학생 답 (Decimal 또는 str)
+        wrong_units (list): 틀린 단위 기호 목록 (grade_answers()의 결과)
+    Returns:
+        list: 틀린 단위 순서대로의 Diagnosis 목록
+    """
+    quantity = get_quantity(problem.quantity_key)
+    tables = candidate_table(quantity.key, problem.value, problem.unit_code)
+    wrong = set(wrong_units)
+    diagnoses = []
+    for target, (answer, unit) in enumerate(zip(user_answers, quantity.symbols)):
+        if unit not in wrong:
+            continue
+        try:
+            found = tables[target].get(answer if type(answer) is Decimal else Decimal(str(answer)))
+        except (ArithmeticError, ValueError, TypeError):
+            found = None
+        pattern, shift = found or ('other', None)
+        diagnoses.append(Diagnosis(unit, pattern, shift, _hint(quantity, problem.unit_code, target, pattern, shift)))
+    return diagnoses
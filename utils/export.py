@@ -0,0 +1,247 @@
+"""
+학습지 내보내기 유틸리티 모듈
+영역별 N개 문제의 학습지와 정답지를 CSV, JSON Lines, 인쇄용 HTML로 생성
+문제는 일정 크기 묶음으로 만들고, 출력은 제너레이터로 한 줄씩 흘려보냄
+(문제 딕셔너리 전체를 메모리에 모으지 않음)
+소수 자릿수를 지정하면 문제 은행(utils.item_bank)에서 조건에 맞는 문제만 뽑음
+(영역마다 조건을 맞출 수 있는지 출력 전에 확인)
+"""
+
+import csv
+import html
+import io
+import json
+import numpy as np
+from utils.generator import generate_problems
+from utils.units import get_quantity
+
+# 한 번에 생성하는 문제 수 (같은 시드의 결과가 바뀌지 않도록 고정)
+CHUNK_SIZE = 1000
+
+FORMATS = ('csv', 'jsonl', 'html')
+
+
+def check_decimals(quantities, decimals):
+    """
+    소수 자릿수 조건을 영역마다 미리 확인 (출력을 쓰기 시작한 뒤에 실패하지 않도록)
+    Args:
+        quantities (list): 영역 키 또는 Quantity 목록
+        decimals (int, list 또는 None): 제시값의 소수 자릿수 (None이면 확인하지 않음)
+    Raises:
+        ValueError: 문제 은행이 없거나, 어떤 영역에 조건에 맞는 문제가 없을 때 (그 영역 이름과 가능한 자릿수)
+    """
+    if decimals is None:
+        return
+    # python -m utils.item_bank 실행 시 패키지 초기화에서 미리 불러오지 않도록 여기서 가져옴
+    from utils.item_bank import get_quantity_bank
+    for quantity in quantities:
+        quantity = get_quantity(quantity)
+        quantity_bank = get_quantity_bank(quantity)
+        if quantity_bank is None:
+            raise ValueError("소수 자릿수로 거르려면 먼저 문제 은행을 만들어 주세요 (python -m utils.item_bank build).")
+        if not quantity_bank.count(decimals=decimals):
+            available = ', '.join(str(value) for value in np.unique(quantity_bank.index['decimals']).tolist())
+            raise ValueError(f"{quantity.name}: 제시값 소수 자릿수가 {decimals}인 문제가 없습니다 (가능: {available}).")
+
+
+def iter_problem_rows(quantities, n, seed=None, decimals=None):
+    """
+    영역별 n개 문제를 한 행씩 생성
+    같은 seed와 영역 목록이면 항상 같은 문제가 같은 순서로 나옴
+    Args:
+        quantities (list): 영역 키 또는 Quantity 목록
+        n (int): 영역별 문제 수
+        seed (int 또는 None): 난수 시드
+        decimals (int, list 또는 None): 제시값의 소수 자릿수 (None이면 거르지 않음)
+    Yields:
+        dict: {'number', 'quantity', 'value', 'unit', 'display_value', 'answers'}
+            - number: 영역 안에서의 문제 번호 (1부터)
+            - value: 기준 단위 정수값
+            - answers: {단위: Decimal}
+    Raises:
+        ValueError: check_decimals()와 같음 (첫 행을 내기 전에)
+    """
+    quantities = [get_quantity(quantity) for quantity in quantities]
+    check_decimals(quantities, decimals)
+    # 소수 자릿수를 지정하면 generate_problems()가 문제 은행에서 뽑음
+    filters = {} if decimals is None else {'decimals': decimals}
+    seeds = np.random.SeedSequence(seed).spawn(len(quantities))
+    for quantity, quantity_seed in zip(quantities, seeds):
+        rng = np.random.default_rng(quantity_seed)
+        number = 0
+        for start in range(0, n, CHUNK_SIZE):
+            size = min(CHUNK_SIZE, n - start)
+            batch = generate_problems(quantity, size, rng, **filters)
+            for problem in batch:
+                number += 1
+                yield {
+                    'number': number,
+                    'quantity': quantity.key,
+                    'value': int(problem[quantity.value_key]),
+                    'unit': problem['unit'],
+                    'display_value': problem['display_value'],
+                    'answers': dict(zip(quantity.symbols, problem['correct_answers']))
+                }
+
+
+def unit_columns(quantities):
+    """
+    여러 영역을 한 표에 담을 때의 단위 열 (모든 영역의 단위 기호를 중복 없이 순서대로)
+    Args:
+        quantities (list): 영역 키 또는 Quantity 목록
+    Returns:
+        list: 단위 기호 목록 (CSV 머리글의 단위 열 순서)
+    """
+    columns = []
+    for quantity in quantities:
+        for symbol in get_quantity(quantity).symbols:
+            if symbol not in columns:
+                columns.append(symbol)
+    return columns
+
+
+def iter_csv(rows, unit_columns, answer_key=False):
+    """
+    문제 행을 CSV 텍스트 조각으로 변환
+    Args:
+        rows (iterable): iter_problem_rows()의 행
+        unit_columns (list): 단위 열 이름
+        answer_key (bool): True면 정답을, False면 빈 답칸을 채움
+    Yields:
+        str: CSV 한 줄
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    header = ['number', 'quantity', 'display_value', 'unit']
+    if answer_key:
+        header.append('value')
+    writer.writerow(header + unit_columns)
+    for row in rows:
+        record = [row['number'], row['quantity'], row['display_value'], row['unit']]
+        if answer_key:
+            record.append(row['value'])
+            record.extend(row['answers'].get(unit, '') for unit in unit_columns)
+        else:
+            record.extend('' for _ in unit_columns)
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_jsonl(rows, answer_key=False):
+    """
+    문제 행을 JSON Lines 텍스트 조각으로 변환 (Decimal은 문자열로 기록)
+    Args:
+        rows (iterable): iter_problem_rows()의 행
+        answer_key (bool): True면 기준값과 정답 포함
+    Yields:
+        str: JSON 한 줄
+    """
+    for row in rows:
+        record = {
+            'number': row['number'],
+            'quantity': row['quantity'],
+            'display_value': str(row['display_value']),
+            'unit': row['unit']
+        }
+        if answer_key:
+            record['value'] = row['value']
+            record['answers'] = {unit: str(answer) for unit, answer in row['answers'].items()}
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 1.5cm; }}
+h1 {{ text-align: center; }}
+h2 {{ page-break-before: always; }}
+h2:first-of-type {{ page-break-before: avoid; }}
+table {{ width: 100%; border-collapse: collapse; }}
+th, td {{ border: 1px solid #999; padding: 0.4em; text-align: center; }}
+tr {{ page-break-inside: avoid; }}
+td.blank {{ min-width: 5em; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+
+
+def iter_html(rows, answer_key=False):
+    """
+    문제 행을 인쇄용 HTML 조각으로 변환 (영역마다 새 페이지에 표 하나)
+    Args:
+        rows (iterable): iter_problem_rows()의 행
+        answer_key (bool): True면 정답을, False면 빈 답칸을 채움
+    Yields:
+        str: HTML 조각
+    """
+    title = '단위 변환 정답지' if answer_key else '단위 변환 학습지'
+    yield _HTML_HEAD.format(title=title)
+    current = None
+    for row in rows:
+        if row['quantity'] != current:
+            if current is not None:
+                yield '</table>\n'
+            current = row['quantity']
+            quantity = get_quantity(current)
+            cells = ''.join(f'<th>{html.escape(unit)}</th>' for unit in quantity.symbols)
+            yield (f'<h2>{quantity.icon} {html.escape(quantity.name)}</h2>\n'
+                   f'<table>\n<tr><th>번호</th><th>문제</th>{cells}</tr>\n')
+        if answer_key:
+            cells = ''.join(f'<td>{answer}</td>' for answer in row['answers'].values())
+        else:
+            cells = '<td class="blank"></td>' * len(row['answers'])
+        yield (f"<tr><td>{row['number']}</td>"
+               f"<td>{row['display_value']} {html.escape(row['unit'])}</td>{cells}</tr>\n")
+    if current is not None:
+        yield '</table>\n'
+    yield '</body>\n</html>\n'
+
+
+def iter_export(quantities, n, seed=None, fmt='csv', answer_key=False, decimals=None):
+    """
+    학습지 또는 정답지를 지정한 형식의 텍스트 조각으로 생성
+    Args:
+        quantities (list): 영역 키 또는 Quantity 목록
+        n (int): 영역별 문제 수
+        seed (int 또는 None): 난수 시드 (학습지와 정답지에 같은 값을 써야 짝이 맞음)
+        fmt (str): 'csv', 'jsonl', 'html' 중 하나
+        answer_key (bool): True면 정답지
+        decimals (int, list 또는 None): 제시값의 소수 자릿수 (문제 은행 필요)
+    Yields:
+        str: 출력 텍스트 조각
+    Raises:
+        ValueError: 지원하지 않는 형식이거나, 소수 자릿수 조건을 맞출 수 없는 영역이 있을 때
+            (제너레이터를 만들 때 바로 확인하므로 아무것도 쓰기 전에 실패함)
+    """
+    check_decimals(quantities, decimals)
+    rows = iter_problem_rows(quantities, n, seed, decimals)
+    if fmt == 'csv':
+        return iter_csv(rows, unit_columns(quantities), answer_key)
+    if fmt == 'jsonl':
+        return iter_jsonl(rows, answer_key)
+    if fmt == 'html':
+        return iter_html(rows, answer_key)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(FORMATS)} 중 선택)")
+
+
+def write_export(fileobj, quantities, n, seed=None, fmt='csv', answer_key=False, decimals=None):
+    """
+    학습지 또는 정답지를 파일(텍스트 모드)에 흘려 씀
+    Args:
+        fileobj: write(str)를 지원하는 파일 객체
+        (나머지는 iter_export()와 같음)
+    Returns:
+        int: 기록한 문자 수
+    """
+    written = 0
+    for chunk in iter_export(quantities, n, seed, fmt, answer_key, decimals):
+        written += fileobj.write(chunk)
+    return written
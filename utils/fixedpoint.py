@@ -0,0 +1,153 @@
+"""
+고정소수점 정수 연산 모듈
+모든 값을 (정수 가수, 10의 지수) 쌍으로 표현: value = mantissa × 10^exponent
+단위 변환은 지수 이동, 비교는 정수 비교로 수행 (Decimal 연산 없음)
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+
+
+def shift(fixed, places):
+    """
+    10^places 배 (places < 0이면 나눗셈) - 가수는 그대로 두고 지수만 이동
+    Args:
+        fixed (tuple): (mantissa, exponent)
+        places (int): 이동할 자릿수
+    Returns:
+        tuple: (mantissa, exponent + places)
+    """
+    mantissa, exponent = fixed
+    return mantissa, exponent + places
+
+
+def align(a, b):
+    """
+    두 고정소수점 값을 같은 지수로 맞춤
+    Args:
+        a (tuple), b (tuple): (mantissa, exponent)
+    Returns:
+        tuple: (a의 가수, b의 가수, 공통 지수)
+    """
+    (ma, ea), (mb, eb) = a, b
+    if ea > eb:
+        return ma * 10 ** (ea - eb), mb, eb
+    if eb > ea:
+        return ma, mb * 10 ** (eb - ea), ea
+    return ma, mb, ea
+
+
+def equal(a, b):
+    """두 고정소수점 값이 정확히 같으면 True"""
+    ma, mb, _ = align(a, b)
+    return ma == mb
+
+
+def within(a, b, tolerance):
+    """
+    |a - b| <= tolerance 여부를 정수 연산으로 판정
+    Args:
+        a (tuple), b (tuple), tolerance (tuple): (mantissa, exponent)
+    Returns:
+        bool: 오차 범위 이내이면 True
+    """
+    ma, mb, exponent = align(a, b)
+    diff, tol, _ = align((abs(ma - mb), exponent), tolerance)
+    return diff <= tol
+
+
+def matches(user, correct, tolerance):
+    """
+    채점 판정: |user - correct| <= tolerance 이고, 정답이 0이 아니면 차이가 정답 크기의 절반 이하
+    (converter.compare_decimal_values()와 같은 판정 - 실제 허용범위는 min(tolerance, |correct| / 2))
+    Args:
+        user (tuple), correct (tuple), tolerance (tuple): (mantissa, exponent)
+    Returns:
+        bool: 정답으로 인정하면 True
+    """
+    mantissa, exponent = correct
+    if not within(user, correct, tolerance):
+        return False
+    # 정답 크기의 절반 = |mantissa| × 5 × 10^(exponent - 1)
+    return mantissa == 0 or within(user, correct, (abs(mantissa) * 5, exponent - 1))
+
+
+def parse(text):
+    """
+    숫자 문자열을 고정소수점 값으로 변환 (예: '-12.50' → (-1250, -2))
+    Args:
+        text (str): 부호, 정수부, 소수부로 된 숫자 (지수 표기 허용)
+    Returns:
+        tuple: (mantissa, exponent)
+    Raises:
+        ValueError: 숫자 형식이 아닐 때
+    """
+    text = text.strip()
+    exponent = 0
+    if 'e' in text or 'E' in text:
+        text, _, exp_text = text.replace('E', 'e').partition('e')
+        exponent = int(exp_text)
+    negative = text[:1] == '-'
+    if text[:1] in '+-':
+        text = text[1:]
+    whole, dot, frac = text.partition('.')
+    digits = whole + frac
+    if not digits.isdigit() or not digits.isascii() or (dot and '.' in frac):
+        raise ValueError(f"숫자가 아닙니다: {text!r}")
+    mantissa = int(digits)
+    return (-mantissa if negative else mantissa), exponent - len(frac)
+
+
+def from_decimal(value):
+    """
+    Decimal을 고정소수점 값으로 변환 (지수 그대로 유지)
+    Args:
+        value (Decimal): 유한한 Decimal 값
+    Returns:
+        tuple: (mantissa, exponent)
+    Raises:
+        ValueError: NaN 또는 무한대일 때
+    """
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f"유한한 값이 아닙니다: {value!r}")
+    mantissa = 0
+    for digit in digits:
+        mantissa = mantissa * 10 + digit
+    return (-mantissa if sign else mantissa), exponent
+
+
+def to_decimal(fixed, ideal_exponent=0):
+    """
+    고정소수점 값을 Decimal로 변환
+    Decimal 나눗셈과 같은 표현이 되도록, 지수가 ideal_exponent에 이를 때까지
+    가수 끝자리의 0을 제거함 (예: (100000, -6) → Decimal('0.1'))
+    Args:
+        fixed (tuple): (mantissa, exponent)
+        ideal_exponent (int): 결과 지수의 상한 (나눗셈의 이상 지수)
+    Returns:
+        Decimal: 변환된 값
+    """
+    mantissa, exponent = fixed
+    while exponent < ideal_exponent and mantissa % 10 == 0 and mantissa:
+        mantissa //= 10
+        exponent += 1
+    if exponent < ideal_exponent and not mantissa:
+        exponent = ideal_exponent
+    return Decimal(mantissa).scaleb(exponent)
+
+
+@lru_cache(maxsize=32)
+def tolerance(text):
+    """
+    오차 허용범위를 한 번만 해석하여 캐시
+    Args:
+        text (str): 오차 허용범위 (예: '0.0001')
+    Returns:
+        tuple: (Decimal 값, 고정소수점 값)
+    Raises:
+        InvalidOperation: 숫자 형식이 아닐 때
+        ValueError: NaN 또는 무한대일 때
+    """
+    value = Decimal(text)
+    return value, from_decimal(value)
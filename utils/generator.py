@@ -2,55 +2,90 @@
 문제 생성 유틸리티 모듈
 각 단위 변환 영역에 대한 랜덤 문제 생성
 Decimal 기반으로 정확한 값 생성
+영역별 값 범위와 단위는 utils.units 레지스트리에서 가져옴
 """
 
 import random
 from decimal import Decimal
-from utils.converter import convert_length, convert_capacity, convert_weight
+from functools import lru_cache
+import numpy as np
+from utils.converter import convert
+from utils.units import get_quantity, LENGTH, CAPACITY, WEIGHT
 
 
-def generate_length_problem():
+def generate_problem(quantity, rng=None):
     """
-    길이 변환 문제 생성 (100mm ~ 100000mm 범위, Decimal 기반)
+    영역의 변환 문제 생성 (레지스트리의 값 범위, Decimal 기반)
+    Args:
+        quantity (str 또는 Quantity): 영역 키 (예: 'length')
+        rng (random.Random 또는 None): 난수 생성기 (None이면 random 모듈 전역 난수)
     Returns:
         dict: {
-            'value_mm': Decimal,
-            'unit': str (mm, cm, m, km 중 하나),
+            value_key (예: 'value_mm'): Decimal,
+            'unit': str (영역의 단위 중 하나),
             'display_value': Decimal,
-            'correct_answers': [mm, cm, m, km] (모두 Decimal)
+            'correct_answers': [단위 순서대로 Decimal]
         }
     """
-    # 100 ~ 100000 범위의 난수 생성 (Decimal 기반)
-    random_int = random.randint(100, 100000)
-    value_mm = Decimal(str(random_int))
-    
+    quantity = get_quantity(quantity)
+    if rng is None:
+        rng = random
+
+    # 범위 내 정수 난수 생성 (Decimal 기반)
+    low, high = quantity.value_range
+    random_int = rng.randint(low, high)
+
     # 문제 제시 단위 랜덤 선택
-    units = ['mm', 'cm', 'm', 'km']
-    present_unit = random.choice(units)
-    
+    present_unit = rng.choice(quantity.symbols)
+
+    return build_problem(quantity, random_int, present_unit)
+
+
+def build_problem(quantity, value, unit):
+    """
+    기준값과 제시 단위로 문제 딕셔너리 생성 (generate_problem()과 같은 형식)
+    Args:
+        quantity (str 또는 Quantity): 영역 키
+        value (int): 기준 단위 정수값
+        unit (str): 제시 단위 기호
+    Returns:
+        dict: generate_problem()의 반환값과 같은 형식
+    """
+    quantity = get_quantity(quantity)
+    value = Decimal(str(value))
+
     # 선택한 단위로 값 변환
-    conversions = convert_length(value_mm)
-    display_value = conversions[present_unit]
-    
-    # 정답 (mm, cm, m, km 순서)
-    correct_answers = [
-        conversions['mm'],
-        conversions['cm'],
-        conversions['m'],
-        conversions['km']
-    ]
-    
+    conversions = convert(quantity, value)
+
     return {
-        'value_mm': value_mm,
-        'unit': present_unit,
-        'display_value': display_value,
-        'correct_answers': correct_answers
+        quantity.value_key: value,
+        'unit': unit,
+        'display_value': conversions[unit],
+        'correct_answers': list(conversions.values())
     }
 
 
-def generate_capacity_problem():
+def generate_length_problem(rng=None):
+    """
+    길이 변환 문제 생성 (100mm ~ 100000mm 범위, Decimal 기반)
+    Args:
+        rng (random.Random 또는 None): 난수 생성기 (None이면 전역 난수)
+    Returns:
+        dict: {
+            'value_mm': Decimal,
+            'unit': str (mm, cm, m, km 중 하나),
+            'display_value': Decimal,
+            'correct_answers': [mm, cm, m, km] (모두 Decimal)
+        }
+    """
+    return generate_problem(LENGTH, rng)
+
+
+def generate_capacity_problem(rng=None):
     """
     들이 변환 문제 생성 (10mL ~ 100000mL 범위, Decimal 기반)
+    Args:
+        rng (random.Random 또는 None): 난수 생성기 (None이면 전역 난수)
     Returns:
         dict: {
             'value_ml': Decimal,
@@ -59,34 +94,14 @@ def generate_capacity_problem():
             'correct_answers': [mL, L] (모두 Decimal)
         }
     """
-    # 10 ~ 100000 범위의 난수 생성 (Decimal 기반)
-    random_int = random.randint(10, 100000)
-    value_ml = Decimal(str(random_int))
-    
-    # 문제 제시 단위 랜덤 선택
-    present_unit = random.choice(['mL', 'L'])
-    
-    # 선택한 단위로 값 변환
-    conversions = convert_capacity(value_ml)
-    display_value = conversions[present_unit]
-    
-    # 정답 (mL, L 순서)
-    correct_answers = [
-        conversions['mL'],
-        conversions['L']
-    ]
-    
-    return {
-        'value_ml': value_ml,
-        'unit': present_unit,
-        'display_value': display_value,
-        'correct_answers': correct_answers
-    }
+    return generate_problem(CAPACITY, rng)
 
 
-def generate_weight_problem():
+def generate_weight_problem(rng=None):
     """
     무게 변환 문제 생성 (10000g ~ 1000000g 범위, Decimal 기반)
+    Args:
+        rng (random.Random 또는 None): 난수 생성기 (None이면 전역 난수)
     Returns:
         dict: {
             'value_g': Decimal,
@@ -95,28 +110,237 @@ def generate_weight_problem():
             'correct_answers': [g, kg, t] (모두 Decimal)
         }
     """
-    # 10000 ~ 1000000 범위의 난수 생성 (Decimal 기반)
-    random_int = random.randint(10000, 1000000)
-    value_g = Decimal(str(random_int))
-    
-    # 문제 제시 단위 랜덤 선택
-    units = ['g', 'kg', 't']
-    present_unit = random.choice(units)
-    
-    # 선택한 단위로 값 변환
-    conversions = convert_weight(value_g)
-    display_value = conversions[present_unit]
-    
-    # 정답 (g, kg, t 순서)
-    correct_answers = [
-        conversions['g'],
-        conversions['kg'],
-        conversions['t']
-    ]
-    
-    return {
-        'value_g': value_g,
-        'unit': present_unit,
-        'display_value': display_value,
-        'correct_answers': correct_answers
-    }
+    return generate_problem(WEIGHT, rng)
+
+
+# ---------------------------------------------------------------------------
+# 시드별 독립 문제 열 (세션마다 하나씩 보관)
+# ---------------------------------------------------------------------------
+
+def problem_rng(seed, quantity):
+    """
+    시드와 영역으로 정해지는 독립 난수 생성기
+    Args:
+        seed (int): 난수 시드
+        quantity (str 또는 Quantity): 영역 키
+    Returns:
+        random.Random: 같은 (seed, 영역)이면 항상 같은 난수열
+    """
+    return random.Random(f"{seed}:{get_quantity(quantity).key}")
+
+
+@lru_cache(maxsize=64)
+def precompute_problems(quantity_key, seed, count):
+    """
+    시드의 처음 count개 문제를 한 번만 생성하여 프로세스 전체에서 공유
+    (학급 퀴즈처럼 같은 시드를 여러 학생이 쓸 때 사용, 반환값은 수정하지 말 것)
+    Args:
+        quantity_key (str): 영역 키
+        seed (int): 난수 시드
+        count (int): 미리 만들 문제 수
+    Returns:
+        tuple: (문제 딕셔너리 tuple, count개 생성 후의 난수 상태)
+    """
+    rng = problem_rng(seed, quantity_key)
+    problems = tuple(generate_problem(quantity_key, rng) for _ in range(count))
+    return problems, rng.getstate()
+
+
+class ProblemStream:
+    """
+    한 학습자(세션)의 영역별 문제 열
+    같은 seed면 prefetch 여부와 관계없이 같은 순서의 문제가 나옴
+    Attributes:
+        quantity (str): 영역 키
+        seed (int): 난수 시드
+        prefetch (int): precompute_problems()로 공유할 앞부분 문제 수 (0이면 공유 안 함)
+        index (int): 지금까지 낸 문제 수
+    """
+
+    __slots__ = ('quantity', 'seed', 'prefetch', 'index', '_rng')
+
+    def __init__(self, quantity, seed=None, prefetch=0):
+        self.quantity = get_quantity(quantity).key
+        self.seed = random.SystemRandom().getrandbits(63) if seed is None else seed
+        self.prefetch = prefetch
+        self.index = 0
+        self._rng = None if prefetch else problem_rng(self.seed, self.quantity)
+
+    def next_problem(self):
+        """다음 문제 딕셔너리 반환"""
+        index = self.index
+        self.index += 1
+        if self._rng is None:
+            problems, state = precompute_problems(self.quantity, self.seed, self.prefetch)
+            if index < len(problems):
+                return problems[index]
+            self._rng = random.Random()
+            self._rng.setstate(state)
+        return generate_problem(self.quantity, self._rng)
+
+    def observe(self, problem, wrong_units):
+        """채점 결과 알림 (고정 난수열이므로 무시, AdaptiveStream과 같은 사용법을 위해 둠)"""
+
+    def to_state(self):
+        """외부 저장용 압축 상태 (난수 상태 대신 시드와 낸 문제 수만 보관)"""
+        return {'kind': 'random', 'quantity': self.quantity, 'seed': self.seed,
+                'prefetch': self.prefetch, 'index': self.index}
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        to_state()의 결과로 문제 열 복원 (같은 시드의 문제를 index개 다시 생성하여 난수 위치를 맞춤)
+        Args:
+            state (dict): to_state()의 결과
+        Returns:
+            ProblemStream: 다음에 낼 문제가 저장 전과 같은 문제 열
+        """
+        stream = cls(state['quantity'], state['seed'], state['prefetch'])
+        index = state['index']
+        if stream.prefetch and index <= stream.prefetch:
+            # 공유 문제 구간 안: 위치만 옮기면 됨
+            stream.index = index
+            return stream
+        for _ in range(index):
+            stream.next_problem()
+        return stream
+
+
+# ---------------------------------------------------------------------------
+# 배치 문제 생성 (NumPy 기반)
+# ---------------------------------------------------------------------------
+
+class ProblemBatch:
+    """
+    열(column) 단위로 저장된 문제 묶음
+    행에 접근할 때만 Decimal 기반 문제 딕셔너리를 생성함
+    문제 은행에서 뽑은 묶음은 정답 행렬을 계산하지 않고 은행의 정답 행을 가져옴
+    Attributes:
+        quantity (Quantity): 문제 영역
+        units (tuple): 단위 이름 (정답 순서)
+        values (numpy.ndarray): 기준 단위 정수값 (int64, 길이 n)
+        unit_codes (numpy.ndarray): 제시 단위 코드 (units의 인덱스, int8)
+        scale (int): answers의 소수점 아래 자릿수
+        answers (numpy.ndarray): 정답 행렬 (n × 단위 수, 10^scale 배 정수)
+    """
+
+    def __init__(self, quantity, values, unit_codes, answers=None):
+        self.quantity = get_quantity(quantity)
+        self.units = self.quantity.symbols
+        exponents = np.array([exp for _, exp in self.quantity.unit_exponents], dtype=np.int64)
+        self.scale = int(exponents.max())
+        self.values = values
+        self.unit_codes = unit_codes
+        if answers is None:
+            answers = values[:, None] * (10 ** (self.scale - exponents))[None, :]
+        self.answers = answers
+
+    @classmethod
+    def from_bank(cls, quantity_bank, items):
+        """
+        문제 은행의 문제 번호로 묶음 생성 (정답은 은행에 미리 계산한 행을 그대로 씀)
+        Args:
+            quantity_bank (QuantityBank): 영역의 문제 은행 (utils.item_bank)
+            items (numpy.ndarray): 문제 번호 (QuantityBank.sample()의 결과)
+        Returns:
+            ProblemBatch: 같은 문제의 묶음
+        """
+        records = quantity_bank.items[items]
+        values = records['value'].astype(np.int64)
+        return cls(quantity_bank.quantity, values, records['unit_code'].astype(np.int8),
+                   quantity_bank.answer_rows(values))
+
+    def __len__(self):
+        return len(self.values)
+
+    def _row(self, value, unit_code):
+        """기준값과 단위 코드로 문제 딕셔너리 생성 (스칼라 경로와 같은 Decimal 나눗셈)"""
+        base = Decimal(value)
+        row = [base]
+        for _, divisor in self.quantity.divisors:
+            row.append(base / divisor)
+        return {
+            self.quantity.value_key: base,
+            'unit': self.units[unit_code],
+            'display_value': row[unit_code],
+            'correct_answers': row
+        }
+
+    def __getitem__(self, index):
+        """index번째 문제를 generate_problem()과 같은 형식의 딕셔너리로 반환"""
+        return self._row(int(self.values[index]), int(self.unit_codes[index]))
+
+    def __iter__(self):
+        for value, unit_code in zip(self.values.tolist(), self.unit_codes.tolist()):
+            yield self._row(value, unit_code)
+
+    @property
+    def display_values(self):
+        """제시값 열 (10^scale 배 정수)"""
+        return self.answers[np.arange(len(self)), self.unit_codes]
+
+
+def generate_problems(quantity, n, seed=None, **filters):
+    """
+    영역의 변환 문제 n개를 NumPy로 한 번에 생성
+    Args:
+        quantity (str 또는 Quantity): 영역 키
+        n (int): 문제 수
+        seed (int, numpy.random.Generator 또는 None): 난수 시드 (같은 시드면 같은 문제)
+            Generator를 넘기면 그 난수열을 이어서 사용
+        **filters: 문제 은행 특성 조건 (unit_code, decimals, trailing_zeros, shift, 정수 또는 정수 목록)
+            주면 문제 은행(utils.item_bank)에서 조건에 맞는 문제만 뽑음
+    Returns:
+        ProblemBatch: 행 접근 시 generate_problem()과 같은 딕셔너리
+    Raises:
+        ValueError: 조건을 주었는데 문제 은행이 없거나 조건에 맞는 문제가 없을 때
+    """
+    quantity = get_quantity(quantity)
+    rng = np.random.default_rng(seed)
+    if filters:
+        # python -m utils.item_bank 실행 시 패키지 초기화에서 미리 불러오지 않도록 여기서 가져옴
+        from utils.item_bank import get_quantity_bank
+        quantity_bank = get_quantity_bank(quantity)
+        if quantity_bank is None:
+            raise ValueError("특성으로 거르려면 먼저 문제 은행을 만들어 주세요 (python -m utils.item_bank build).")
+        return ProblemBatch.from_bank(quantity_bank, quantity_bank.sample(n, rng, **filters))
+    low, high = quantity.value_range
+    values = rng.integers(low, high + 1, size=n, dtype=np.int64)
+    unit_codes = rng.integers(0, len(quantity.units), size=n, dtype=np.int8)
+    return ProblemBatch(quantity, values, unit_codes)
+
+
+def generate_length_problems(n, seed=None):
+    """
+    길이 변환 문제 n개 일괄 생성 (100mm ~ 100000mm 범위)
+    Args:
+        n (int): 문제 수
+        seed (int 또는 None): 난수 시드 (같은 시드면 같은 문제)
+    Returns:
+        ProblemBatch: 행 접근 시 generate_length_problem()과 같은 딕셔너리
+    """
+    return generate_problems(LENGTH, n, seed)
+
+
+def generate_capacity_problems(n, seed=None):
+    """
+    들이 변환 문제 n개 일괄 생성 (10mL ~ 100000mL 범위)
+    Args:
+        n (int): 문제 수
+        seed (int 또는 None): 난수 시드 (같은 시드면 같은 문제)
+    Returns:
+        ProblemBatch: 행 접근 시 generate_capacity_problem()과 같은 딕셔너리
+    """
+    return generate_problems(CAPACITY, n, seed)
+
+
+def generate_weight_problems(n, seed=None):
+    """
+    무게 변환 문제 n개 일괄 생성 (10000g ~ 1000000g 범위)
+    Args:
+        n (int): 문제 수
+        seed (int 또는 None): 난수 시드 (같은 시드면 같은 문제)
+    Returns:
+        ProblemBatch: 행 접근 시 generate_weight_problem()과 같은 딕셔너리
+    """
+    return generate_problems(WEIGHT, n, seed)
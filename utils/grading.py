@@ -0,0 +1,188 @@
+"""
+일괄 채점 유틸리티 모듈
+학급 전체 답안지(학생, 문제 번호, 단위별 답)를 한 번에 채점
+답은 한 번만 해석하여 정수 행렬로 만들고, 정답 행렬과 NumPy로 비교함
+"""
+
+import numpy as np
+from utils import fixedpoint
+from utils.converter import DEFAULT_TOLERANCE
+
+# int64 범위를 넘지 않도록 벡터 비교에 쓰는 스케일된 정수의 상한
+_INT64_LIMIT = 2 ** 62
+
+
+class BatchGradeResult:
+    """
+    일괄 채점 결과
+    Attributes:
+        students (list): 행별 학생 식별자
+        problem_ids (numpy.ndarray): 행별 문제 번호
+        units (tuple): 단위 기호 (열 순서)
+        correct (numpy.ndarray): 단위별 정답 여부 (행 × 단위, bool)
+        valid (numpy.ndarray): 단위별 숫자 입력 여부 (행 × 단위, bool)
+        hints (list): 행별 틀린 단위 힌트 메시지 (tuple, 같은 조합이면 같은 객체)
+        summary (dict): {'rows', 'correct_rows', 'invalid_cells', 'wrong_by_unit'}
+    """
+
+    def __init__(self, students, problem_ids, units, correct, valid, hints, summary):
+        self.students = students
+        self.problem_ids = problem_ids
+        self.units = units
+        self.correct = correct
+        self.valid = valid
+        self.hints = hints
+        self.summary = summary
+
+    def __len__(self):
+        return len(self.students)
+
+    @property
+    def row_correct(self):
+        """행별 전체 정답 여부 (bool 배열)"""
+        return self.correct.all(axis=1)
+
+
+# 벡터 해석 시 스케일된 정수의 최대 자릿수 (int64 범위 이내)
+_MAX_DIGITS = 18
+
+
+def _parse_cell(answer):
+    """답 하나를 고정소수점 값으로 해석 (숫자가 아니면 None)"""
+    try:
+        return fixedpoint.parse(str(answer))
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_cells(cells, scale):
+    """
+    답 목록을 10^scale 배 정수 배열로 한 번에 해석
+    '[+-]정수부[.소수부]' 형식은 NumPy 문자열 연산으로 처리하고,
+    지수 표기나 너무 긴 숫자 등 나머지는 fixedpoint.parse로 하나씩 처리함
+    Args:
+        cells (list): 답 목록 (str 또는 Decimal)
+        scale (int): 소수점 아래 자릿수
+    Returns:
+        tuple: (스케일된 정수 배열, 숫자 여부 배열, {벡터 비교 불가 칸: 고정소수점 값})
+    """
+    count = len(cells)
+    scaled = np.zeros(count, dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+    if not count:
+        return scaled, valid, {}
+    text = np.char.strip(np.asarray(cells, dtype=str).reshape(count))
+    try:
+        text = text.astype(np.bytes_)
+    except UnicodeEncodeError:
+        simple = np.zeros(count, dtype=bool)
+    else:
+        body = np.char.lstrip(text, b'+-')
+        sign_length = np.char.str_len(text) - np.char.str_len(body)
+        parts = np.char.partition(body, b'.')
+        whole, frac = parts[:, 0], parts[:, 2]
+        digits = np.char.add(whole, frac)
+        frac_length = np.char.str_len(frac)
+        simple = (
+            (sign_length <= 1)
+            & np.char.isdigit(digits)
+            & (frac_length <= scale)
+            & (np.char.str_len(whole) + scale <= _MAX_DIGITS)
+        )
+        mantissa = digits[simple].astype(np.int64)
+        mantissa[np.char.startswith(text[simple], b'-')] *= -1
+        scaled[simple] = mantissa * 10 ** (scale - frac_length[simple])
+        valid[simple] = True
+
+    exact = {}
+    for cell in np.flatnonzero(~simple).tolist():
+        value = _parse_cell(cells[cell])
+        if value is None:
+            continue
+        valid[cell] = True
+        mantissa, exponent = value
+        if exponent >= -scale:
+            shifted = mantissa * 10 ** (exponent + scale)
+            if -_INT64_LIMIT < shifted < _INT64_LIMIT:
+                scaled[cell] = shifted
+                continue
+        exact[cell] = value
+    return scaled, valid, exact
+
+
+def grade_batch(submissions, answer_key, tolerance=DEFAULT_TOLERANCE):
+    """
+    여러 학생의 답안을 정답 행렬과 한 번에 비교하여 채점
+    Args:
+        submissions (iterable): (학생, 문제 번호, 단위별 답 목록) 행
+            - 문제 번호는 answer_key의 행 인덱스
+            - 답은 str 또는 Decimal, 단위 순서는 영역의 정답 순서
+        answer_key (ProblemBatch): 정답지 (generate_problems()의 결과)
+        tolerance (str): 오차 허용범위
+    Returns:
+        BatchGradeResult: 단위별 정답 여부, 행별 힌트, 요약 집계
+    Raises:
+        IndexError: 문제 번호가 정답지 범위를 벗어날 때
+        ValueError: 단위별 답 개수가 영역의 단위 수와 다를 때
+    """
+    quantity = answer_key.quantity
+    unit_count = len(quantity.units)
+    tolerance_fixed = fixedpoint.tolerance(tolerance)[1]
+    # 정답 행렬과 오차 허용범위를 모두 담을 수 있는 공통 소수 자릿수
+    scale = max(answer_key.scale, -tolerance_fixed[1])
+
+    students = []
+    problem_ids = []
+    cells = []
+    for student, problem_id, answers in submissions:
+        if len(answers) != unit_count:
+            raise ValueError(
+                f"{student}: 답 {len(answers)}개, {quantity.name} 단위는 {unit_count}개입니다."
+            )
+        students.append(student)
+        problem_ids.append(problem_id)
+        cells.extend(answers)
+
+    rows = len(students)
+    problem_ids = np.asarray(problem_ids, dtype=np.int64).reshape(rows)
+    if rows and (problem_ids.min() < 0 or problem_ids.max() >= len(answer_key)):
+        raise IndexError("정답지에 없는 문제 번호가 있습니다.")
+
+    # 답을 한 번만 해석하여 공통 스케일의 정수 행렬로 변환
+    user_scaled, valid, exact_cells = _parse_cells(cells, scale)
+    user_scaled = user_scaled.reshape(rows, unit_count)
+    valid = valid.reshape(rows, unit_count)
+    answers = answer_key.answers[problem_ids] * 10 ** (scale - answer_key.scale)
+    tolerance_scaled = tolerance_fixed[0] * 10 ** (tolerance_fixed[1] + scale)
+    # 차이가 허용범위 이하이고, 정답이 0이 아니면 정답 크기의 절반 이하 (fixedpoint.matches()와 같은 판정)
+    # 절반 조건은 2 × 차이 대신 차이 <= |정답| - 차이로 비교하여 int64가 넘치지 않음
+    difference = np.abs(user_scaled - answers)
+    correct = (
+        valid
+        & (difference <= tolerance_scaled)
+        & ((answers == 0) | (difference <= np.abs(answers) - difference))
+    )
+
+    # 소수 자릿수가 너무 많거나 매우 큰 값은 정수 연산으로 정확히 비교
+    for cell, value in exact_cells.items():
+        row, column = divmod(cell, unit_count)
+        answer = (int(answers[row, column]), -scale)
+        correct[row, column] = fixedpoint.matches(value, answer, tolerance_fixed)
+
+    # 틀린 단위 조합(비트마스크)별 힌트 목록을 한 번만 만들고 행에서는 참조만 함
+    wrong_masks = (~correct).astype(np.int64) @ (1 << np.arange(unit_count, dtype=np.int64))
+    hints_by_mask = {}
+    for mask in np.unique(wrong_masks).tolist():
+        hints_by_mask[mask] = tuple(
+            quantity.hint_messages[unit]
+            for column, unit in enumerate(quantity.symbols) if mask >> column & 1
+        )
+    hints = [hints_by_mask[mask] for mask in wrong_masks.tolist()]
+
+    summary = {
+        'rows': rows,
+        'correct_rows': int(correct.all(axis=1).sum()),
+        'invalid_cells': int((~valid).sum()),
+        'wrong_by_unit': dict(zip(quantity.symbols, (~correct).sum(axis=0).tolist()))
+    }
+    return BatchGradeResult(students, problem_ids, quantity.symbols, correct, valid, hints, summary)
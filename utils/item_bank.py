@@ -0,0 +1,342 @@
+"""
+문제 은행 유틸리티 모듈
+영역마다 가능한 모든 문제(기준값 × 제시 단위)를 미리 나열하여
+정답과 난이도 특성(소수 자릿수, 끝자리 0의 수, 자릿수 이동 크기)을 NumPy 파일로 저장함
+
+파일은 np.load(mmap_mode='r')로 열어 서버 프로세스끼리 운영체제 페이지 캐시를 공유하며,
+특성별 색인(연속 구간)을 이용해 조건에 맞는 문제를 전체를 훑지 않고 뽑음
+
+만들기:
+    python -m utils.item_bank build            # bank/ 폴더에 생성
+    python -m utils.item_bank info             # 영역별 문제 수와 특성 분포
+"""
+
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from utils import fixedpoint
+from utils.units import QUANTITIES, get_quantity
+
+DEFAULT_BANK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bank')
+
+# 파일 형식이 바뀌면 올림 (예전 파일은 다시 만들어야 함)
+BANK_VERSION = 1
+
+# 문제 목록 (특성 색인 순서로 정렬)
+ITEM_DTYPE = np.dtype([
+    ('value', np.int32),          # 기준 단위 정수값
+    ('unit_code', np.int8),       # 제시 단위 코드
+    ('decimals', np.int8),        # 제시값의 소수 자릿수
+    ('trailing_zeros', np.int8),  # 기준값 끝자리 0의 수
+    ('shift', np.int8)            # 답할 단위 중 가장 큰 자릿수 이동
+])
+
+# 특성 색인: 같은 (단위, 소수 자릿수, 끝자리 0, 이동 크기) 문제는 items[start:stop]에 모여 있음
+INDEX_DTYPE = np.dtype([
+    ('unit_code', np.int8),
+    ('decimals', np.int8),
+    ('trailing_zeros', np.int8),
+    ('shift', np.int8),
+    ('start', np.int64),
+    ('stop', np.int64)
+])
+
+FEATURES = ('unit_code', 'decimals', 'trailing_zeros', 'shift')
+
+
+def _trailing_zeros(values):
+    """정수 배열 각 값의 끝자리 0의 수"""
+    zeros = np.zeros(len(values), dtype=np.int8)
+    rest = values.copy()
+    while True:
+        mask = (rest % 10 == 0) & (rest != 0)
+        if not mask.any():
+            return zeros
+        zeros[mask] += 1
+        rest[mask] //= 10
+
+
+def build_quantity(quantity):
+    """
+    영역 하나의 문제 은행 배열 생성
+    Args:
+        quantity (str 또는 Quantity): 영역 키
+    Returns:
+        tuple: (items, index, answers, scale)
+            - items: ITEM_DTYPE 배열 (색인 순서로 정렬)
+            - index: INDEX_DTYPE 배열
+            - answers: 기준값별 정답 행렬 (값 개수 × 단위 수, 10^scale 배 정수),
+              행 번호는 value - value_range[0]
+            - scale: answers의 소수점 아래 자릿수
+    """
+    quantity = get_quantity(quantity)
+    low, high = quantity.value_range
+    values = np.arange(low, high + 1, dtype=np.int64)
+    exponents = np.array([unit.exponent for unit in quantity.units], dtype=np.int64)
+    scale = int(exponents.max())
+    answers = values[:, None] * (10 ** (scale - exponents))[None, :]
+
+    units = len(exponents)
+    zeros = _trailing_zeros(values)
+    shifts = np.abs(exponents[:, None] - exponents[None, :]).max(axis=1)
+
+    items = np.empty(len(values) * units, dtype=ITEM_DTYPE)
+    items['value'] = np.repeat(values, units)
+    items['unit_code'] = np.tile(np.arange(units), len(values))
+    items['trailing_zeros'] = np.repeat(zeros, units)
+    items['decimals'] = np.maximum(0, exponents[items['unit_code']] - items['trailing_zeros'])
+    items['shift'] = shifts[items['unit_code']]
+    items = items[np.lexsort([items[name] for name in reversed(FEATURES)])]
+
+    keys = np.stack([items[name] for name in FEATURES], axis=1)
+    starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)])
+    index = np.empty(len(starts), dtype=INDEX_DTYPE)
+    for name in FEATURES:
+        index[name] = items[name][starts]
+    index['start'] = starts
+    index['stop'] = np.r_[starts[1:], len(items)]
+    return items, index, answers, scale
+
+
+def build_bank(directory=DEFAULT_BANK_DIR, quantities=None):
+    """
+    문제 은행 파일 생성 (오프라인에서 한 번 실행)
+    Args:
+        directory (str): 저장할 폴더
+        quantities (list 또는 None): 영역 키 목록 (None이면 모든 영역)
+    Returns:
+        dict: meta.json 내용
+    """
+    os.makedirs(directory, exist_ok=True)
+    # 이미 연 예전 은행은 버리고 다음 load_bank()에서 새 파일을 엶
+    _opened.pop(directory, None)
+    meta = {'version': BANK_VERSION, 'quantities': {}}
+    for key in quantities or QUANTITIES:
+        quantity = get_quantity(key)
+        items, index, answers, scale = build_quantity(quantity)
+        for name, array in (('items', items), ('index', index), ('answers', answers)):
+            np.save(os.path.join(directory, f'{quantity.key}_{name}.npy'), array)
+        meta['quantities'][quantity.key] = {
+            'symbols': list(quantity.symbols),
+            'exponents': [unit.exponent for unit in quantity.units],
+            'value_range': list(quantity.value_range),
+            'scale': scale,
+            'items': len(items)
+        }
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def _matches(column, wanted):
+    """색인 열이 조건(정수, 정수 목록, None)에 맞는지"""
+    if wanted is None:
+        return np.ones(len(column), dtype=bool)
+    return np.isin(column, np.atleast_1d(wanted))
+
+
+class QuantityBank:
+    """
+    영역 하나의 문제 은행 (메모리 매핑된 배열)
+    Attributes:
+        quantity (Quantity): 영역
+        items (numpy.ndarray): 문제 목록 (ITEM_DTYPE, 읽기 전용)
+        index (numpy.ndarray): 특성 색인 (INDEX_DTYPE)
+        answers (numpy.ndarray): 기준값별 정답 행렬 (10^scale 배 정수, 읽기 전용)
+        scale (int): answers의 소수점 아래 자릿수
+    """
+
+    def __init__(self, quantity, items, index, answers, scale):
+        self.quantity = get_quantity(quantity)
+        self.items = items
+        self.index = index
+        self.answers = answers
+        self.scale = scale
+
+    def __len__(self):
+        return len(self.items)
+
+    def _ranges(self, filters):
+        """조건에 맞는 색인 구간 (start, stop 배열)"""
+        unknown = set(filters) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"알 수 없는 특성입니다: {', '.join(sorted(unknown))}")
+        mask = np.ones(len(self.index), dtype=bool)
+        for name, wanted in filters.items():
+            mask &= _matches(self.index[name], wanted)
+        return self.index['start'][mask], self.index['stop'][mask]
+
+    def count(self, **filters):
+        """
+        조건에 맞는 문제 수
+        Args:
+            **filters: unit_code, decimals, trailing_zeros, shift (정수 또는 정수 목록)
+        Returns:
+            int: 문제 수
+        """
+        starts, stops = self._ranges(filters)
+        return int((stops - starts).sum())
+
+    def sample(self, n, rng=None, **filters):
+        """
+        조건에 맞는 문제를 n개 뽑음 (중복 허용, 조건에 맞는 문제 사이에서 고르게)
+        색인 구간만 보고 고르므로 문제 수와 관계없이 빠름
+        Args:
+            n (int): 뽑을 문제 수
+            rng (numpy.random.Generator, int 또는 None): 난수 생성기 또는 시드
+            **filters: unit_code, decimals, trailing_zeros, shift (정수 또는 정수 목록)
+        Returns:
+            numpy.ndarray: 문제 번호 (items의 인덱스)
+        Raises:
+            ValueError: 조건에 맞는 문제가 없을 때
+        """
+        starts, stops = self._ranges(filters)
+        sizes = stops - starts
+        total = int(sizes.sum())
+        if not total:
+            raise ValueError(f"{self.quantity.name}: 조건에 맞는 문제가 없습니다.")
+        offsets = np.random.default_rng(rng).integers(0, total, size=n)
+        bounds = np.cumsum(sizes)
+        ranges = np.searchsorted(bounds, offsets, side='right')
+        return starts[ranges] + offsets - (bounds[ranges] - sizes[ranges])
+
+    def answer_row(self, value):
+        """기준값의 정답 (10^scale 배 정수 배열, 단위 순서)"""
+        return self.answers[value - self.quantity.value_range[0]]
+
+    def answer_rows(self, values):
+        """기준값 배열의 정답 행렬 (값 개수 × 단위 수, 10^scale 배 정수)"""
+        return self.answers[np.asarray(values, dtype=np.int64) - self.quantity.value_range[0]]
+
+    def problem(self, item):
+        """
+        문제 번호의 문제 딕셔너리 (generate_problem()과 같은 형식)
+        정답은 미리 계산한 정수에서 Decimal 나눗셈과 같은 표현으로 바로 만듦
+        Args:
+            item (int): 문제 번호
+        Returns:
+            dict: {value_key, 'unit', 'display_value', 'correct_answers'}
+        """
+        record = self.items[item]
+        value = int(record['value'])
+        unit_code = int(record['unit_code'])
+        answers = [
+            fixedpoint.to_decimal((int(answer), -self.scale))
+            for answer in self.answer_row(value).tolist()
+        ]
+        return {
+            self.quantity.value_key: answers[0],
+            'unit': self.quantity.symbols[unit_code],
+            'display_value': answers[unit_code],
+            'correct_answers': answers
+        }
+
+
+class ItemBank:
+    """
+    영역별 문제 은행 묶음
+    Attributes:
+        directory (str): 문제 은행 폴더
+        meta (dict): meta.json 내용
+    """
+
+    def __init__(self, directory=DEFAULT_BANK_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != BANK_VERSION:
+            raise ValueError(f"문제 은행 형식이 다릅니다 (파일 {self.meta.get('version')}, 필요 {BANK_VERSION}). 다시 만들어 주세요.")
+        self._banks = {}
+
+    def __contains__(self, quantity):
+        return get_quantity(quantity).key in self.meta['quantities']
+
+    def __getitem__(self, quantity):
+        """
+        영역의 문제 은행 (처음 접근할 때 메모리 매핑)
+        Raises:
+            KeyError: 은행에 없는 영역일 때
+            ValueError: 은행을 만든 뒤 단위 레지스트리가 바뀌었을 때
+        """
+        quantity = get_quantity(quantity)
+        bank = self._banks.get(quantity.key)
+        if bank is None:
+            info = self.meta['quantities'][quantity.key]
+            if (info['symbols'] != list(quantity.symbols)
+                    or info['exponents'] != [unit.exponent for unit in quantity.units]
+                    or info['value_range'] != list(quantity.value_range)):
+                raise ValueError(f"{quantity.name}: 단위 레지스트리가 바뀌었습니다. 문제 은행을 다시 만들어 주세요.")
+            arrays = {
+                name: np.load(os.path.join(self.directory, f'{quantity.key}_{name}.npy'), mmap_mode='r')
+                for name in ('items', 'answers')
+            }
+            index = np.load(os.path.join(self.directory, f'{quantity.key}_index.npy'))
+            bank = QuantityBank(quantity, arrays['items'], index, arrays['answers'], info['scale'])
+            self._banks[quantity.key] = bank
+        return bank
+
+
+# 연 문제 은행 {폴더: ItemBank} (연 것만 보관하므로 나중에 만든 은행도 바로 보임)
+_opened = {}
+
+
+def load_bank(directory=DEFAULT_BANK_DIR):
+    """
+    문제 은행 열기 (폴더마다 프로세스당 한 번)
+    Args:
+        directory (str): 문제 은행 폴더
+    Returns:
+        ItemBank 또는 None: 은행을 만들지 않았으면 None (다음 호출에서 다시 확인)
+    """
+    bank = _opened.get(directory)
+    if bank is None:
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            return None
+        bank = _opened[directory] = ItemBank(directory)
+    return bank
+
+
+def get_quantity_bank(quantity, directory=DEFAULT_BANK_DIR):
+    """
+    영역 하나의 문제 은행
+    Args:
+        quantity (str 또는 Quantity): 영역 키
+        directory (str): 문제 은행 폴더
+    Returns:
+        QuantityBank 또는 None: 은행이 없거나 은행에 없는 영역이면 None
+    """
+    bank = load_bank(directory)
+    if bank is None or quantity not in bank:
+        return None
+    return bank[quantity]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('--dir', default=DEFAULT_BANK_DIR, help='문제 은행 폴더')
+    parser.add_argument('--quantity', nargs='*', choices=list(QUANTITIES), help='영역 (생략 시 모두)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        meta = build_bank(args.dir, args.quantity)
+        for key, info in meta['quantities'].items():
+            print(f"{key}: 문제 {info['items']:,}개", file=sys.stderr)
+        return 0
+
+    bank = load_bank(args.dir)
+    if bank is None:
+        print(f"문제 은행이 없습니다: {args.dir} (먼저 build 실행)", file=sys.stderr)
+        return 1
+    for key in args.quantity or bank.meta['quantities']:
+        quantity_bank = bank[key]
+        print(f"{key}: 문제 {len(quantity_bank):,}개")
+        for decimals in np.unique(quantity_bank.index['decimals']).tolist():
+            print(f"  소수 {decimals}자리: {quantity_bank.count(decimals=decimals):,}개")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+실행 지표 유틸리티 모듈
+스크립트 재실행, 문제 생성, 채점 시간을 카운터와 히스토그램으로 모아
+Prometheus 텍스트 형식으로 내보냄 (기존 수집기에서 수업 중 지연 시간 경보에 사용)
+
+환경 변수로 켬 (둘 다 없으면 꺼짐):
+    METRICS_PORT=9108           # http://127.0.0.1:9108/metrics 로 제공 (METRICS_HOST로 주소 변경)
+    METRICS_FILE=/path/app.prom # METRICS_INTERVAL초(기본 15)마다 파일로 기록 (node_exporter textfile 수집기용)
+
+꺼져 있으면 time()은 공유 빈 컨텍스트를, inc()와 observe()는 바로 반환하므로
+재실행마다 드는 비용은 함수 호출 한 번뿐임
+"""
+
+import atexit
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = bool(os.environ.get('METRICS_PORT') or os.environ.get('METRICS_FILE'))
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# register_collector()로 등록할 수 있는 지표 종류
+COLLECTOR_KINDS = ('gauge', 'counter')
+
+_NULL_TIMER = nullcontext()
+_lock = threading.Lock()
+_registry = {}
+_collectors = []
+_exporters = {}
+
+
+def _escape(value):
+    """레이블 값 이스케이프 (Prometheus 텍스트 형식)"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names, values, extra=()):
+    """{name="value",...} 문자열 (레이블이 없으면 빈 문자열)"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    """Prometheus 숫자 표기 (정수는 소수점 없이)"""
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """레이블별 값을 가진 지표 하나 (같은 이름으로 다시 만들면 기존 지표를 돌려줌)"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+
+    def _key(self, labels):
+        """레이블 딕셔너리를 선언 순서의 값 튜플로"""
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name}: 레이블은 {', '.join(self.labels) or '(없음)'}입니다.")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _header(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    """
+    누적 카운터
+    Attributes:
+        name (str): 지표 이름 (관례상 _total로 끝남)
+        help (str): 설명
+        labels (tuple): 레이블 이름
+    """
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """레이블 조합의 값을 amount만큼 올림 (꺼져 있으면 아무것도 하지 않음)"""
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = self._header()
+        for key, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_label_text(self.labels, key)} {_number(value)}')
+        return lines
+
+
+class _Timer:
+    """Histogram.time()의 컨텍스트 (예외로 끝나도 기록)"""
+
+    __slots__ = ('_histogram', '_key', '_start')
+
+    def __init__(self, histogram, key):
+        self._histogram = histogram
+        self._key = key
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram._observe(self._key, time.perf_counter() - self._start)
+        return False
+
+
+class Histogram(_Metric):
+    """
+    구간별 누적 개수, 합계, 개수를 가진 히스토그램 (지연 시간용)
+    Attributes:
+        buckets (tuple): 구간 상한 (오름차순, +Inf는 자동 추가)
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _observe(self, key, value):
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                # [구간별 개수..., 합계, 개수]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def observe(self, value, **labels):
+        """값 하나를 기록 (꺼져 있으면 아무것도 하지 않음)"""
+        if ENABLED:
+            self._observe(self._key(labels), value)
+
+    def time(self, **labels):
+        """
+        with 블록의 실행 시간을 기록하는 컨텍스트
+        Returns:
+            컨텍스트 관리자 (꺼져 있으면 공유 빈 컨텍스트)
+        """
+        if not ENABLED:
+            return _NULL_TIMER
+        return _Timer(self, self._key(labels))
+
+    def render(self):
+        lines = self._header()
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_label_text(self.labels, key, [("le", _number(bound))])} {cumulative}')
+            lines.append(f'{self.name}_bucket{_label_text(self.labels, key, [("le", "+Inf")])} {state[-1]}')
+            lines.append(f'{self.name}_sum{_label_text(self.labels, key)} {_number(state[-2])}')
+            lines.append(f'{self.name}_count{_label_text(self.labels, key)} {state[-1]}')
+        return lines
+
+
+def _get_or_create(cls, name, *args, **kwargs):
+    """같은 이름의 지표가 있으면 돌려주고 없으면 등록 (스크립트 재실행 시 중복 선언 방지)"""
+    with _lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, *args, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(f"{name}: 이미 다른 종류의 지표로 등록되어 있습니다.")
+        return metric
+
+
+def counter(name, help_text, labels=()):
+    """
+    카운터 선언 (프로세스 전체에서 이름으로 공유)
+    Args:
+        name (str): 지표 이름 (예: 'app_submissions_total')
+        help_text (str): 설명
+        labels (tuple): 레이블 이름
+    Returns:
+        Counter: 지표
+    """
+    return _get_or_create(Counter, name, help_text, labels)
+
+
+def histogram(name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+    """
+    히스토그램 선언 (프로세스 전체에서 이름으로 공유)
+    Args:
+        name (str): 지표 이름 (예: 'app_script_run_seconds')
+        help_text (str): 설명
+        labels (tuple): 레이블 이름
+        buckets (tuple): 구간 상한
+    Returns:
+        Histogram: 지표
+    """
+    return _get_or_create(Histogram, name, help_text, labels, buckets)
+
+
+def register_collector(name, help_text, collect, kind='gauge'):
+    """
+    내보낼 때마다 값을 읽는 지표 등록 (예: 풀이 기록 대기 수)
+    같은 이름으로 다시 등록하면 읽는 함수와 종류만 바뀜
+    Args:
+        name (str): 지표 이름 (카운터는 관례상 _total로 끝남)
+        help_text (str): 설명
+        collect (callable): 인자 없이 숫자를 돌려주는 함수
+        kind (str): 'gauge' (오르내리는 현재 값) 또는 'counter' (누적되어 줄지 않는 값)
+    Raises:
+        ValueError: 지원하지 않는 종류일 때
+    """
+    if kind not in COLLECTOR_KINDS:
+        raise ValueError(f"지원하지 않는 지표 종류입니다: {kind} ({', '.join(COLLECTOR_KINDS)} 중 선택)")
+    with _lock:
+        for index, (existing, _, _, _) in enumerate(_collectors):
+            if existing == name:
+                _collectors[index] = (name, help_text, collect, kind)
+                return
+        _collectors.append((name, help_text, collect, kind))
+
+
+def render():
+    """
+    등록된 모든 지표를 Prometheus 텍스트 형식으로
+    Returns:
+        str: 텍스트 (끝에 줄바꿈 포함)
+    """
+    with _lock:
+        metrics = list(_registry.values())
+        collectors = list(_collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+    for name, help_text, collect, kind in collectors:
+        try:
+            value = collect()
+        except Exception:
+            continue
+        lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {_number(value)}'])
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """GET /metrics 요청만 처리"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_file(path):
+    """지표를 파일에 기록 (임시 파일에 쓴 뒤 바꿔치기하여 수집기가 반쯤 쓴 파일을 읽지 않게 함)"""
+    temp = f'{path}.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(render())
+    os.replace(temp, path)
+
+
+def _file_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_file(path)
+        except OSError:
+            pass
+
+
+def start_exporters():
+    """
+    환경 변수에 따라 HTTP 제공 또는 파일 기록 스레드를 시작 (프로세스당 한 번, 여러 번 호출해도 됨)
+    Returns:
+        dict: 시작한 내보내기 {'http': (host, port), 'file': path}
+    """
+    if not ENABLED:
+        return {}
+    with _lock:
+        if _exporters:
+            return dict(_exporters)
+        port = os.environ.get('METRICS_PORT')
+        if port:
+            host = os.environ.get('METRICS_HOST', '127.0.0.1')
+            server = ThreadingHTTPServer((host, int(port)), _Handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name='MetricsHTTP', daemon=True).start()
+            _exporters['http'] = server.server_address[:2]
+        path = os.environ.get('METRICS_FILE')
+        if path:
+            interval = float(os.environ.get('METRICS_INTERVAL', '15'))
+            threading.Thread(target=_file_loop, args=(path, interval), name='MetricsFile', daemon=True).start()
+            atexit.register(write_file, path)
+            _exporters['file'] = path
+        return dict(_exporters)
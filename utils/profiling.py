@@ -0,0 +1,300 @@
+"""
+재실행 프로파일링 유틸리티 모듈
+환경 변수로 켜면 스크립트 재실행 일부를 cProfile과 tracemalloc으로 기록하고,
+모은 결과를 합쳐 시간이 많이 드는 함수와 분류별(Decimal 계산, 앱/HTML 생성, Streamlit 내부) 비율을 보여줌
+(다시 배포하지 않고 환경 변수만 바꿔 운영 중인 서버에서 원인을 찾기 위함)
+
+환경 변수:
+    PROFILE_DIR=/tmp/profiles   # 켜기: 페이지별 하위 폴더에 기록
+    PROFILE_RATE=0.05           # 기록할 재실행 비율 (기본 0.1)
+    PROFILE_KEEP=200            # 페이지별로 남길 최근 기록 수 (오래된 것부터 삭제)
+    PROFILE_MEMORY=0            # tracemalloc 끄기 (기본 켜짐)
+
+보고서:
+    python -m utils.profiling report --dir /tmp/profiles --page length --top 30
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+PROFILE_DIR = os.environ.get('PROFILE_DIR', '')
+PROFILE_RATE = float(os.environ.get('PROFILE_RATE', '0.1'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '200'))
+PROFILE_MEMORY = os.environ.get('PROFILE_MEMORY', '1') != '0'
+
+# 메모리 기록에 남기는 할당 위치 수
+MEMORY_TOP = 30
+
+_NULL = nullcontext()
+_rng = random.Random()
+_local = threading.local()
+# tracemalloc은 프로세스 전체에 하나이므로 동시에 기록 중인 재실행 수를 셈
+_memory_lock = threading.Lock()
+_memory_users = 0
+
+
+def _safe_name(text):
+    """파일/폴더 이름에 쓸 수 있는 문자만 남김"""
+    return ''.join(char if char.isalnum() or char in '-_' else '_' for char in str(text))[:40] or '_'
+
+
+def _start_memory():
+    global _memory_users
+    with _memory_lock:
+        if _memory_users == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+        _memory_users += 1
+
+
+def _stop_memory():
+    """기록 중인 재실행이 없으면 tracemalloc을 멈춤 (스냅샷, 최대 사용량 반환)"""
+    global _memory_users
+    with _memory_lock:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _memory_users -= 1
+        if _memory_users == 0:
+            tracemalloc.stop()
+    return snapshot, peak
+
+
+def _rotate(directory, keep):
+    """폴더에 최근 keep개 기록(.prof와 .json 쌍)만 남김"""
+    stems = sorted({name.rsplit('.', 1)[0] for name in os.listdir(directory) if name.endswith(('.prof', '.json'))})
+    for stem in stems[:-keep] if keep > 0 else []:
+        for suffix in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def _profile(page, session_id):
+    directory = os.path.join(PROFILE_DIR, _safe_name(page))
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # 다른 프로파일러가 이미 켜져 있음
+        yield
+        return
+    if PROFILE_MEMORY:
+        _start_memory()
+    _local.active = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        profiler.disable()
+        _local.active = False
+        info = {
+            'page': page,
+            'session': str(session_id),
+            'pid': os.getpid(),
+            'created_at': time.time(),
+            'wall_ms': round(wall * 1000, 3)
+        }
+        if PROFILE_MEMORY:
+            snapshot, peak = _stop_memory()
+            info['peak_bytes'] = peak
+            info['allocations'] = [
+                [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count]
+                for stat in snapshot.statistics('lineno')[:MEMORY_TOP]
+            ]
+        try:
+            os.makedirs(directory, exist_ok=True)
+            stem = os.path.join(directory, f"{time.time_ns()}_{_safe_name(session_id)[:12]}_{os.getpid()}")
+            profiler.dump_stats(stem + '.prof')
+            with open(stem + '.json', 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+            _rotate(directory, PROFILE_KEEP)
+        except OSError:
+            pass
+
+
+def profile_run(page, session_id=''):
+    """
+    재실행 하나를 (PROFILE_RATE 비율로) 프로파일링하는 컨텍스트
+    꺼져 있거나, 뽑히지 않았거나, 이미 바깥 재실행을 기록 중이면 공유 빈 컨텍스트를 반환
+    Args:
+        page (str): 페이지 (기록 폴더 이름, 예: 'length', 'length-fragment')
+        session_id (str): 세션 식별자 (파일 이름에 포함)
+    Returns:
+        컨텍스트 관리자
+    """
+    if not PROFILE_DIR or getattr(_local, 'active', False) or _rng.random() >= PROFILE_RATE:
+        return _NULL
+    return _profile(page, session_id)
+
+
+# 함수 분류 (앞쪽 조건이 먼저 적용)
+CATEGORIES = ('decimal', 'app', 'utils', 'streamlit', 'python', 'other')
+
+
+def categorize(function):
+    """
+    pstats 함수 키 (파일, 줄, 이름)의 분류
+    Returns:
+        str: CATEGORIES 중 하나
+            - decimal: Decimal 연산 (C 구현 메서드 또는 _pydecimal)
+            - app: streamlit_app.py (HTML 문자열 생성 포함)
+            - utils: utils 패키지
+            - streamlit: Streamlit 내부
+            - python: 표준 라이브러리와 내장 함수
+    """
+    filename, _, name = function
+    path = filename.replace('\\', '/')
+    if 'decimal' in name.lower() or path.endswith('_pydecimal.py'):
+        return 'decimal'
+    if path.endswith('streamlit_app.py'):
+        return 'app'
+    if '/utils/' in path and 'site-packages' not in path:
+        return 'utils'
+    if '/streamlit/' in path:
+        return 'streamlit'
+    if filename == '~' or '/lib/python' in path or path.startswith('<frozen'):
+        return 'python'
+    return 'other'
+
+
+def load_profiles(directory, page=None):
+    """
+    기록 폴더의 프로파일을 합침
+    Args:
+        directory (str): PROFILE_DIR
+        page (str 또는 None): 이 페이지만 (None이면 모두)
+    Returns:
+        tuple: (pstats.Stats 또는 None, 메타 정보 목록)
+    """
+    stats = None
+    infos = []
+    pages = [_safe_name(page)] if page else sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    for name in pages:
+        folder = os.path.join(directory, name)
+        if not os.path.isdir(folder):
+            continue
+        for filename in sorted(os.listdir(folder)):
+            path = os.path.join(folder, filename)
+            if filename.endswith('.prof'):
+                try:
+                    if stats is None:
+                        stats = pstats.Stats(path, stream=sys.stdout)
+                    else:
+                        stats.add(path)
+                except (OSError, EOFError, TypeError, ValueError):
+                    continue
+            elif filename.endswith('.json'):
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        infos.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+    return stats, infos
+
+
+def summarize_profiles(stats, infos, top=20, sort='tottime'):
+    """
+    합친 프로파일의 요약
+    Args:
+        stats (pstats.Stats): load_profiles()의 결과
+        infos (list): 메타 정보 목록
+        top (int): 상위 함수 수
+        sort (str): 'tottime'(함수 자체 시간) 또는 'cumtime'(호출한 함수 포함)
+    Returns:
+        dict: {
+            'runs': 기록 수, 'wall_ms_mean': 평균 재실행 시간,
+            'categories': {분류: 자체 시간 비율},
+            'functions': [{'function', 'category', 'calls', 'tottime', 'cumtime'}, ...],
+            'peak_bytes_max': 최대 메모리, 'allocations': [{'site', 'size', 'count'}, ...]
+        }
+    """
+    result = {
+        'runs': len(infos),
+        'wall_ms_mean': round(sum(info['wall_ms'] for info in infos) / len(infos), 3) if infos else 0.0,
+        'categories': {},
+        'functions': [],
+        'peak_bytes_max': max((info.get('peak_bytes', 0) for info in infos), default=0),
+        'allocations': []
+    }
+    if stats is not None:
+        by_category = Counter()
+        rows = []
+        for function, (_, calls, tottime, cumtime, _) in stats.stats.items():
+            category = categorize(function)
+            by_category[category] += tottime
+            rows.append((function, category, calls, tottime, cumtime))
+        total = sum(by_category.values()) or 1.0
+        result['categories'] = {
+            category: round(by_category[category] / total, 4) for category in CATEGORIES if by_category[category]
+        }
+        column = 3 if sort == 'tottime' else 4
+        rows.sort(key=lambda row: row[column], reverse=True)
+        result['functions'] = [
+            {'function': pstats.func_std_string(function), 'category': category, 'calls': calls,
+             'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)}
+            for function, category, calls, tottime, cumtime in rows[:top]
+        ]
+    sizes = Counter()
+    counts = Counter()
+    for info in infos:
+        for site, size, count in info.get('allocations', ()):
+            sizes[site] += size
+            counts[site] += count
+    result['allocations'] = [
+        {'site': site, 'size': size, 'count': counts[site]} for site, size in sizes.most_common(top)
+    ]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['report'])
+    parser.add_argument('--dir', default=PROFILE_DIR or 'profiles', help='프로파일 폴더 (기본 PROFILE_DIR)')
+    parser.add_argument('--page', help='이 페이지만 (예: length, length-fragment)')
+    parser.add_argument('--top', type=int, default=20, help='상위 함수 수')
+    parser.add_argument('--sort', choices=['tottime', 'cumtime'], default='tottime')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    stats, infos = load_profiles(args.dir, args.page)
+    if stats is None:
+        print(f"프로파일이 없습니다: {args.dir}", file=sys.stderr)
+        return 1
+    report = summarize_profiles(stats, infos, args.top, args.sort)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print(f"기록 {report['runs']}개, 평균 재실행 {report['wall_ms_mean']:.1f}ms, "
+          f"최대 메모리 {report['peak_bytes_max'] / 1024:.0f}KiB")
+    print("\n분류별 자체 시간 비율")
+    for category, share in sorted(report['categories'].items(), key=lambda item: item[1], reverse=True):
+        print(f"  {category:<10} {share:7.1%}")
+    print(f"\n상위 함수 ({args.sort})")
+    print(f"  {'calls':>8} {'tottime':>9} {'cumtime':>9}  분류       함수")
+    for row in report['functions']:
+        print(f"  {row['calls']:>8} {row['tottime']:>9.4f} {row['cumtime']:>9.4f}  {row['category']:<10} {row['function']}")
+    if report['allocations']:
+        print("\n메모리 할당 위치")
+        for row in report['allocations']:
+            print(f"  {row['size'] / 1024:>9.1f}KiB {row['count']:>7}  {row['site']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
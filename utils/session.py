@@ -0,0 +1,296 @@
+"""
+세션 상태 유틸리티 모듈
+세션마다 오래 보관하는 값(현재 문제, 풀이 기록)을 작은 객체로 표현하고
+세션 하나가 차지하는 메모리를 잴 수 있게 함
+외부 저장소(utils.state_store)에 보관할 압축 직렬화(dump_session/load_session)도 제공
+
+수업 시간 내내 수천 개의 세션이 유지되므로
+Decimal 딕셔너리 대신 정수값과 단위 코드만 보관하고, 정답은 필요할 때 계산함
+"""
+
+import json
+import sys
+from collections import deque
+from decimal import Decimal
+from functools import lru_cache
+from types import FunctionType, ModuleType
+from utils.units import QUANTITIES, get_quantity
+
+# 세션마다 보관하는 풀이 기록의 기본 최대 개수
+DEFAULT_HISTORY_CAP = 20
+
+
+class ProblemRecord:
+    """
+    문제 하나의 압축 표현 (기준 단위 정수값과 제시 단위 코드)
+    정답과 제시값은 접근할 때 generate_problem()과 같은 Decimal 나눗셈으로 계산함
+    Attributes:
+        quantity_key (str): 영역 키
+        value (int): 기준 단위 정수값
+        unit_code (int): 제시 단위 코드 (영역 단위 목록의 인덱스)
+    """
+
+    __slots__ = ('quantity_key', 'value', 'unit_code')
+
+    def __init__(self, quantity, value, unit_code):
+        self.quantity_key = get_quantity(quantity).key
+        self.value = value
+        self.unit_code = unit_code
+
+    @classmethod
+    def from_problem(cls, quantity, problem):
+        """
+        문제 딕셔너리(generate_problem()의 결과)를 압축 표현으로 변환
+        Args:
+            quantity (str 또는 Quantity): 영역 키
+            problem (dict): 문제 딕셔너리
+        Returns:
+            ProblemRecord: 같은 문제의 압축 표현
+        """
+        quantity = get_quantity(quantity)
+        return cls(quantity, int(problem[quantity.value_key]), quantity.unit_index[problem['unit']])
+
+    @property
+    def quantity(self):
+        """문제 영역 (Quantity)"""
+        return QUANTITIES[self.quantity_key]
+
+    @property
+    def unit(self):
+        """제시 단위 기호"""
+        return self.quantity.symbols[self.unit_code]
+
+    @property
+    def correct_answers(self):
+        """단위 순서대로의 정답 목록 (Decimal)"""
+        base = Decimal(self.value)
+        answers = [base]
+        for _, divisor in self.quantity.divisors:
+            answers.append(base / divisor)
+        return answers
+
+    @property
+    def display_value(self):
+        """제시값 (Decimal)"""
+        base = Decimal(self.value)
+        if self.unit_code == 0:
+            return base
+        return base / self.quantity.divisors[self.unit_code - 1][1]
+
+    def as_dict(self):
+        """generate_problem()과 같은 형식의 문제 딕셔너리로 변환"""
+        answers = self.correct_answers
+        return {
+            self.quantity.value_key: answers[0],
+            'unit': self.unit,
+            'display_value': answers[self.unit_code],
+            'correct_answers': answers
+        }
+
+    def to_state(self):
+        """외부 저장용 [영역 키, 기준값, 제시 단위 코드]"""
+        return [self.quantity_key, self.value, self.unit_code]
+
+    @classmethod
+    def from_state(cls, state):
+        """to_state()의 결과로 복원"""
+        quantity, value, unit_code = state
+        return cls(quantity, value, unit_code)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProblemRecord):
+            return NotImplemented
+        return (self.quantity_key, self.value, self.unit_code) == \
+            (other.quantity_key, other.value, other.unit_code)
+
+    def __hash__(self):
+        return hash((self.quantity_key, self.value, self.unit_code))
+
+    def __repr__(self):
+        return f"ProblemRecord({self.quantity_key!r}, {self.value}, {self.unit!r})"
+
+
+class AttemptHistory:
+    """
+    최근 풀이 기록을 최대 cap개까지만 보관하는 고리 버퍼
+    오래된 기록은 새 기록이 들어올 때 자동으로 버려짐
+    기록 하나는 (ProblemRecord, 틀린 단위 비트마스크) - 마스크가 0이면 정답
+    """
+
+    __slots__ = ('_attempts',)
+
+    def __init__(self, cap=DEFAULT_HISTORY_CAP):
+        self._attempts = deque(maxlen=cap)
+
+    @property
+    def cap(self):
+        """최대 보관 개수"""
+        return self._attempts.maxlen
+
+    def record(self, problem, wrong_units):
+        """
+        제출 한 번 기록
+        Args:
+            problem (ProblemRecord): 제출한 문제
+            wrong_units (list): 틀린 단위 기호 목록 (비어 있으면 정답)
+        """
+        unit_index = problem.quantity.unit_index
+        mask = 0
+        for unit in wrong_units:
+            mask |= 1 << unit_index[unit]
+        self._attempts.append((problem, mask))
+
+    def __len__(self):
+        return len(self._attempts)
+
+    def __iter__(self):
+        """오래된 순서로 (ProblemRecord, 틀린 단위 tuple) 반환"""
+        for problem, mask in self._attempts:
+            symbols = problem.quantity.symbols
+            yield problem, tuple(symbol for index, symbol in enumerate(symbols) if mask >> index & 1)
+
+    @property
+    def correct_count(self):
+        """보관 중인 기록 가운데 정답 수"""
+        return sum(1 for _, mask in self._attempts if not mask)
+
+    def to_state(self):
+        """외부 저장용 [[영역 키, 기준값, 제시 단위 코드, 틀린 단위 마스크], ...]"""
+        return [problem.to_state() + [mask] for problem, mask in self._attempts]
+
+    @classmethod
+    def from_state(cls, state, cap=DEFAULT_HISTORY_CAP):
+        """to_state()의 결과로 복원 (cap보다 많으면 최근 기록만 남음)"""
+        history = cls(cap)
+        for quantity, value, unit_code, mask in state:
+            history._attempts.append((ProblemRecord(quantity, value, unit_code), mask))
+        return history
+
+
+# ---------------------------------------------------------------------------
+# 외부 저장용 직렬화
+# ---------------------------------------------------------------------------
+
+# 직렬화 형식 버전 (형식이 바뀌면 올림, 다른 버전의 기록은 무시)
+SESSION_FORMAT = 1
+
+
+def _stream_from_state(state):
+    """문제 열 상태의 종류에 맞는 클래스로 복원"""
+    # 세션 모듈을 가볍게 두기 위해 복원할 때만 불러옴
+    if state['kind'] == 'adaptive':
+        from utils.adaptive import AdaptiveStream
+        return AdaptiveStream.from_state(state)
+    from utils.generator import ProblemStream
+    return ProblemStream.from_state(state)
+
+
+def dump_session(state):
+    """
+    학습 진행 상태를 압축 JSON 바이트로 직렬화 (Decimal 없이 정수와 코드만)
+    Args:
+        state (Mapping): 세션 상태 (st.session_state)
+    Returns:
+        bytes: 저장할 값 (같은 상태면 같은 바이트이므로 바뀌었는지 비교에 씀)
+    """
+    problem = state.get('current_problem')
+    stream = state.get('problem_stream')
+    history = state.get('attempt_history')
+    record = {
+        'v': SESSION_FORMAT,
+        'page': state.get('current_page', 'home'),
+        'problem': problem.to_state() if problem is not None else None,
+        'count': state.get('problem_count', 0),
+        'correct': state.get('is_correct'),
+        'hints': list(state.get('current_hints') or ()),
+        'stream': stream.to_state() if stream is not None else None,
+        'history': history.to_state() if history is not None else [],
+        'adaptive': bool(state.get('adaptive_mode')),
+        'class': state.get('class_id', '')
+    }
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def load_session(data, history_cap=DEFAULT_HISTORY_CAP):
+    """
+    dump_session()의 결과를 세션 상태 값으로 복원
+    Args:
+        data (bytes): 저장된 값
+        history_cap (int): 풀이 기록 최대 개수
+    Returns:
+        dict 또는 None: {세션 상태 키: 값} - 형식이 다르거나 깨진 값이면 None
+    """
+    try:
+        record = json.loads(data)
+        if record.get('v') != SESSION_FORMAT:
+            return None
+        return {
+            'current_page': record['page'],
+            'current_problem': ProblemRecord.from_state(record['problem']) if record['problem'] else None,
+            'problem_count': record['count'],
+            'is_correct': record['correct'],
+            'current_hints': record['hints'],
+            'problem_stream': _stream_from_state(record['stream']) if record['stream'] else None,
+            'attempt_history': AttemptHistory.from_state(record['history'], history_cap),
+            'adaptive_mode': record['adaptive'],
+            'class_id': record['class']
+        }
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# 세션 메모리 진단
+# ---------------------------------------------------------------------------
+
+# 내용을 따라가지 않는 원자값 타입
+_ATOMIC_TYPES = (str, bytes, int, float, complex, bool, Decimal, type(None))
+
+
+def _deep_sizeof(obj, seen):
+    """obj와 obj가 참조하는 객체의 크기 합 (seen에 있는 객체는 제외)"""
+    if id(obj) in seen or isinstance(obj, (type, ModuleType, FunctionType)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _ATOMIC_TYPES):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    else:
+        if hasattr(obj, '__dict__'):
+            size += _deep_sizeof(vars(obj), seen)
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if hasattr(obj, slot):
+                    size += _deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+@lru_cache(maxsize=1)
+def _shared_ids():
+    """모든 세션이 함께 쓰는 단위 레지스트리 객체의 id (세션 크기에서 제외)"""
+    seen = set()
+    _deep_sizeof(QUANTITIES, seen)
+    return frozenset(seen)
+
+
+def session_size(state):
+    """
+    세션 상태 하나가 차지하는 메모리 추정 (바이트)
+    단위 레지스트리처럼 세션끼리 공유하는 객체는 세지 않음
+    Args:
+        state (Mapping): 세션 상태 (예: st.session_state.to_dict())
+    Returns:
+        dict: {'total': 전체 바이트, 'by_key': {키: 바이트}} - by_key는 큰 순서
+    """
+    seen = set(_shared_ids())
+    by_key = {}
+    for key, value in state.items():
+        by_key[key] = _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    by_key = dict(sorted(by_key.items(), key=lambda item: item[1], reverse=True))
+    return {'total': sum(by_key.values()), 'by_key': by_key}
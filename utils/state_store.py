@@ -0,0 +1,378 @@
+"""
+세션 상태 외부 저장소 모듈
+학습 진행 상태(utils.session.dump_session()의 바이트)를 프로세스 밖에 보관하여
+여러 Streamlit 프로세스가 학습자를 나누어 맡거나 재시작해도 이어서 풀 수 있게 함
+
+SESSION_STORE 환경 변수의 주소로 저장소를 고름 (없으면 프로세스 안에만 보관):
+    sqlite:///sessions.db                     # 한 서버의 여러 프로세스 (WAL, 상대 경로)
+    sqlite:////var/lib/unit-app/sessions.db   # 절대 경로는 슬래시 4개
+    file:///sessions                          # 학습자마다 파일 하나 (공유 파일 시스템 가능)
+    redis://127.0.0.1:6379/0                  # Redis 프로토콜(RESP) 서버 (GET, SET, DEL, PING만 사용)
+
+저장소는 키(학습자 id)마다 값 하나만 읽고 씀 - 재실행마다 최대 한 번 왕복
+"""
+
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+# 학습 기록 보관 기간 (마지막 저장 후, 초)
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+class StoreError(Exception):
+    """저장소에 연결하거나 읽고 쓰지 못함"""
+
+
+def valid_key(key):
+    """학습자 id로 쓸 수 있는 값인지 (영숫자와 -, _ 만, 64자 이하)"""
+    return bool(key) and len(key) <= 64 and all(char.isascii() and (char.isalnum() or char in '-_') for char in key)
+
+
+class SessionStore:
+    """
+    저장소 공통 인터페이스
+    Attributes:
+        ttl (int): 보관 기간(초)
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+
+    def load(self, key):
+        """
+        저장된 값 읽기
+        Args:
+            key (str): 학습자 id
+        Returns:
+            bytes 또는 None: 없거나 보관 기간이 지났으면 None
+        Raises:
+            StoreError: 저장소 오류
+        """
+        raise NotImplementedError
+
+    def save(self, key, data):
+        """
+        값 저장 (있으면 덮어씀)
+        Args:
+            key (str): 학습자 id
+            data (bytes): 저장할 값
+        Raises:
+            StoreError: 저장소 오류
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """값 삭제 (없어도 오류 아님)"""
+        raise NotImplementedError
+
+    def close(self):
+        """연결 정리"""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 파일 저장소 (WAL 모드, 스레드마다 연결 하나)
+    같은 파일을 쓰는 여러 프로세스가 함께 쓸 수 있음
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        key TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        updated_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        # 경로나 권한 문제를 바로 알리고, 만료된 기록을 정리
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM sessions WHERE updated_at < ?', (time.time() - ttl,))
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(self.path, timeout=5)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute(self._SCHEMA)
+            except sqlite3.Error as error:
+                raise StoreError(f"세션 저장소를 열지 못했습니다: {error}") from error
+            self._local.conn = conn
+        return conn
+
+    def load(self, key):
+        try:
+            row = self._connect().execute(
+                'SELECT data FROM sessions WHERE key = ? AND updated_at >= ?', (key, time.time() - self.ttl)
+            ).fetchone()
+        except sqlite3.Error as error:
+            raise StoreError(str(error)) from error
+        return bytes(row[0]) if row else None
+
+    def save(self, key, data):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT INTO sessions (key, data, updated_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at',
+                    (key, data, time.time())
+                )
+        except sqlite3.Error as error:
+            raise StoreError(str(error)) from error
+
+    def delete(self, key):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM sessions WHERE key = ?', (key,))
+        except sqlite3.Error as error:
+            raise StoreError(str(error)) from error
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class FileSessionStore(SessionStore):
+    """
+    폴더 저장소 (학습자마다 파일 하나, 임시 파일에 쓴 뒤 바꿔치기)
+    보관 기간은 파일 수정 시각으로 판단
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_TTL):
+        super().__init__(ttl)
+        self.directory = directory
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as error:
+            raise StoreError(f"세션 폴더를 만들지 못했습니다: {error}") from error
+
+    def _path(self, key):
+        if not valid_key(key):
+            raise StoreError(f"학습자 id 형식이 아닙니다: {key!r}")
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) < time.time() - self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            raise StoreError(str(error)) from error
+
+    def save(self, key, data):
+        path = self._path(key)
+        try:
+            fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except OSError as error:
+            raise StoreError(str(error)) from error
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            raise StoreError(str(error)) from error
+
+
+class RESPClient:
+    """
+    Redis 직렬화 프로토콜(RESP2) 최소 클라이언트 (외부 패키지 없이 소켓으로 통신)
+    명령 하나를 보내고 응답 하나를 읽음 - 스레드마다 따로 만들어 사용
+    """
+
+    def __init__(self, host='127.0.0.1', port=6379, db=0, password=None, timeout=2.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def _open(self):
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as error:
+            raise StoreError(f"{self.host}:{self.port}에 연결하지 못했습니다: {error}") from error
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile('rb')
+        if self.password:
+            self._call('AUTH', self.password)
+        if self.db:
+            self._call('SELECT', self.db)
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    @staticmethod
+    def _encode(args):
+        """명령을 RESP 배열(벌크 문자열)로"""
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode('utf-8')
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode('ascii')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    def _malformed(self, line):
+        """
+        해석할 수 없는 응답: 남은 응답을 읽지 않은 연결을 다시 쓰지 않도록 닫고 StoreError로 알림
+        Args:
+            line (bytes): 받은 응답 줄
+        Returns:
+            StoreError: 호출한 쪽에서 raise할 오류
+        """
+        self.close()
+        return StoreError(f"{self.host}:{self.port} 잘못된 응답입니다: {line[:20]!r}")
+
+    def _number(self, line):
+        """응답 줄의 정수 부분 (':', '$', '*' 다음)"""
+        try:
+            return int(line[1:-2])
+        except ValueError:
+            raise self._malformed(line) from None
+
+    def _read(self):
+        """응답 하나 읽기"""
+        line = self._file.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError("연결이 끊어졌습니다.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b'+':
+            return body.decode('utf-8', 'replace')
+        if kind == b'-':
+            raise StoreError(body.decode('utf-8', 'replace'))
+        if kind == b':':
+            return self._number(line)
+        if kind == b'$':
+            length = self._number(line)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("연결이 끊어졌습니다.")
+            return data[:-2]
+        if kind == b'*':
+            count = self._number(line)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        raise self._malformed(line)
+
+    def _call(self, *args):
+        self._sock.sendall(self._encode(args))
+        return self._read()
+
+    def execute(self, *args):
+        """
+        명령 실행 (연결이 끊겼으면 한 번 다시 연결)
+        Args:
+            *args: 명령과 인자 (예: 'SET', key, value, 'EX', 60)
+        Returns:
+            응답 (str, int, bytes, list 또는 None)
+        Raises:
+            StoreError: 연결 실패 또는 오류 응답
+        """
+        for attempt in range(2):
+            if self._sock is None:
+                self._open()
+            try:
+                return self._call(*args)
+            except OSError as error:
+                # 서버 재시작 등으로 끊긴 연결은 한 번만 다시 시도 (오류 응답은 그대로 StoreError)
+                self.close()
+                if attempt:
+                    raise StoreError(f"{self.host}:{self.port} 통신 오류: {error}") from error
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 프로토콜 저장소 (GET, SET ... EX, DEL만 사용하므로 호환 서버나 간단한 대역으로도 동작)
+    Attributes:
+        prefix (str): 키 앞에 붙이는 이름 공간
+    """
+
+    def __init__(self, host='127.0.0.1', port=6379, db=0, password=None, ttl=DEFAULT_TTL,
+                 prefix='unit-app:session:'):
+        super().__init__(ttl)
+        self.prefix = prefix
+        self._options = {'host': host, 'port': port, 'db': db, 'password': password}
+        self._local = threading.local()
+        # 연결을 바로 확인
+        self._client().execute('PING')
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = RESPClient(**self._options)
+        return client
+
+    def load(self, key):
+        return self._client().execute('GET', self.prefix + key)
+
+    def save(self, key, data):
+        self._client().execute('SET', self.prefix + key, data, 'EX', int(self.ttl))
+
+    def delete(self, key):
+        self._client().execute('DEL', self.prefix + key)
+
+    def close(self):
+        client = getattr(self._local, 'client', None)
+        if client is not None:
+            client.close()
+
+
+def open_store(url, ttl=DEFAULT_TTL):
+    """
+    주소로 저장소 열기
+    Args:
+        url (str): 'sqlite:///경로', 'file:///폴더', 'redis://[:비밀번호@]호스트:포트/DB번호'
+            (경로는 슬래시 3개면 상대, 4개면 절대)
+        ttl (int): 보관 기간(초)
+    Returns:
+        SessionStore: 저장소
+    Raises:
+        ValueError: 지원하지 않는 주소일 때
+        StoreError: 연결하지 못했을 때
+    """
+    parsed = urlparse(url)
+    # 'scheme:///상대경로', 'scheme:////절대경로' (SQLAlchemy와 같은 관례)
+    path = unquote(parsed.netloc + parsed.path[1:] if parsed.path.startswith('/') else parsed.netloc + parsed.path)
+    if parsed.scheme == 'sqlite':
+        return SQLiteSessionStore(path, ttl)
+    if parsed.scheme == 'file':
+        return FileSessionStore(path, ttl)
+    if parsed.scheme == 'redis':
+        db = parsed.path.strip('/')
+        return RedisSessionStore(parsed.hostname or '127.0.0.1', parsed.port or 6379,
+                                 int(db) if db else 0, unquote(parsed.password) if parsed.password else None, ttl)
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {url} (sqlite://, file://, redis:// 중 선택)")
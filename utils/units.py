@@ -0,0 +1,118 @@
+"""
+단위 레지스트리 모듈
+영역(길이, 들이, 무게)별 단위, 기준 단위 배율, 값 범위, 힌트 메시지를 한곳에서 선언
+변환 배율 행렬은 모듈을 불러올 때 한 번만 계산함
+
+새 영역(예: 넓이)은 QUANTITIES에 Quantity를 추가하는 것만으로
+문제 생성, 채점, 화면 표시가 모두 동작함
+"""
+
+from decimal import Decimal
+
+
+class Unit:
+    """
+    단위 하나의 선언
+    Attributes:
+        symbol (str): 단위 기호 (예: 'km')
+        exponent (int): 기준 단위 대비 10의 거듭제곱 지수 (1 km = 10^6 mm → 6)
+        placeholder (str): 입력칸 예시 문구
+        hint (str): 이 단위가 틀렸을 때 보여줄 힌트 메시지
+    """
+
+    __slots__ = ('symbol', 'exponent', 'placeholder', 'hint')
+
+    def __init__(self, symbol, exponent, placeholder, hint):
+        self.symbol = symbol
+        self.exponent = exponent
+        self.placeholder = placeholder
+        self.hint = hint
+
+
+class Quantity:
+    """
+    측정 영역 하나의 선언과 미리 계산된 변환표
+    Attributes:
+        key (str): 영역 키 (예: 'length')
+        name (str): 영역 이름 (예: '길이')
+        icon (str): 화면 표시용 아이콘
+        value_key (str): 문제 딕셔너리의 기준값 키 (예: 'value_mm')
+        value_range (tuple): 문제 기준값 범위 (low, high), 양 끝 포함
+        units (tuple): Unit 목록 (정답 순서, 첫 단위가 기준 단위)
+        symbols (tuple): 단위 기호 목록
+        unit_index (dict): {단위 기호: 인덱스}
+        unit_exponents (tuple): ((단위 기호, 지수), ...)
+        hint_messages (dict): {단위 기호: 힌트 메시지}
+        shift_matrix (tuple): N×N 지수 이동표, [i][j] = i 단위 값을 j 단위로 바꿀 때의 지수 변화
+        factor_matrix (tuple): N×N 변환 배율표 (Decimal), [i][j] = 10^shift_matrix[i][j]
+        base_unit (str): 기준 단위 기호 (첫 단위)
+        divisors (tuple): 기준 단위를 뺀 나머지 단위의 ((단위 기호, 기준값을 나눌 Decimal), ...)
+    """
+
+    def __init__(self, key, name, icon, value_key, value_range, units):
+        self.key = key
+        self.name = name
+        self.icon = icon
+        self.value_key = value_key
+        self.value_range = value_range
+        self.units = tuple(units)
+        if self.units[0].exponent != 0:
+            raise ValueError(f"{key}: 첫 단위는 기준 단위(지수 0)여야 합니다.")
+
+        self.symbols = tuple(unit.symbol for unit in self.units)
+        self.unit_index = {symbol: index for index, symbol in enumerate(self.symbols)}
+        self.unit_exponents = tuple((unit.symbol, unit.exponent) for unit in self.units)
+        self.hint_messages = {unit.symbol: unit.hint for unit in self.units}
+        self.shift_matrix = tuple(
+            tuple(source.exponent - target.exponent for target in self.units)
+            for source in self.units
+        )
+        self.factor_matrix = tuple(
+            tuple(Decimal(10) ** shift for shift in row)
+            for row in self.shift_matrix
+        )
+        self.base_unit = self.symbols[0]
+        self.divisors = tuple(
+            (unit.symbol, self.factor_matrix[index][0])
+            for index, unit in enumerate(self.units) if index > 0
+        )
+
+    def __repr__(self):
+        return f"Quantity({self.key!r}, units={self.symbols!r})"
+
+
+LENGTH = Quantity('length', '길이', '📏', 'value_mm', (100, 100000), [
+    Unit('mm', 0, "예: 1000", "❌ mm 단위가 틀렸습니다.\n💡 1cm = 10mm 관계를 다시 확인해보세요."),
+    Unit('cm', 1, "예: 100", "❌ cm 단위가 틀렸습니다.\n💡 1m = 100cm 관계를 다시 확인해보세요."),
+    Unit('m', 3, "예: 1", "❌ m 단위가 틀렸습니다.\n💡 1km = 1000m 관계를 다시 확인해보세요."),
+    Unit('km', 6, "예: 0.001", "❌ km 단위가 틀렸습니다.\n💡 1km = 1,000,000mm 관계를 다시 확인해보세요."),
+])
+
+CAPACITY = Quantity('capacity', '들이', '🥤', 'value_ml', (10, 100000), [
+    Unit('mL', 0, "예: 1300", "❌ mL 단위가 틀렸습니다.\n💡 1L = 1,000mL 관계를 다시 확인해보세요."),
+    Unit('L', 3, "예: 1.3", "❌ L 단위가 틀렸습니다.\n💡 1L = 1,000mL 관계를 다시 확인해보세요."),
+])
+
+WEIGHT = Quantity('weight', '무게', '⚖️', 'value_g', (10000, 1000000), [
+    Unit('g', 0, "예: 1500", "❌ g 단위가 틀렸습니다.\n💡 1kg = 1,000g 관계를 다시 확인해보세요."),
+    Unit('kg', 3, "예: 1.5", "❌ kg 단위가 틀렸습니다.\n💡 1kg = 1,000g, 1t = 1,000kg 관계를 다시 확인해보세요."),
+    Unit('t', 6, "예: 0.0015", "❌ t 단위가 틀렸습니다.\n💡 1t = 1,000kg = 1,000,000g 관계를 다시 확인해보세요."),
+])
+
+# 화면에 표시되는 순서대로 등록
+QUANTITIES = {quantity.key: quantity for quantity in (LENGTH, CAPACITY, WEIGHT)}
+
+
+def get_quantity(quantity):
+    """
+    영역 키 또는 Quantity를 Quantity로 변환
+    Args:
+        quantity (str 또는 Quantity): 영역 키 (예: 'length')
+    Returns:
+        Quantity: 등록된 영역
+    Raises:
+        KeyError: 등록되지 않은 영역 키일 때
+    """
+    if isinstance(quantity, Quantity):
+        return quantity
+    return QUANTITIES[quantity]
@@ -0,0 +1,426 @@
+"""
+정의역 검증 모듈 (python -m utils.verify)
+값 범위가 작으므로 (길이 100~100000mm, 들이 10~100000mL, 무게 10000~1000000g)
+정수 기준값 × 모든 제시 단위를 변환, 문제 생성, 채점 함수에 넣어
+NumPy로 만든 정수 기준(기준값 × 10^-지수)과 비교하고 반례를 모두 보고함
+
+    python -m utils.verify                         # 표본 검사 (CI용, 모든 영역, 1~2초)
+    python -m utils.verify --sample 20000 --seed 7 # 표본 크기와 난수 시드 지정
+    python -m utils.verify --full                  # 전수 검사 (코어 하나로 약 65초)
+    python -m utils.verify --quantity length --full --workers 4 --json
+
+표본: 값 범위의 양 끝, 10의 거듭제곱 ±1, 가장 작은 단위의 정답이 오차 허용범위에 들 수 있는
+    작은 기준값 전부(길이는 100~111mm), 그리고 시드로 정한 무작위 기준값 (영역마다 --sample개)
+
+검사 항목:
+    exact: convert_*, convert_fixed, build_problem, ProblemRecord, ProblemBatch의 정답과 제시값이
+        정수 기준과 정확히 같고, 화면에 보이는 문자열이 Decimal 나눗셈 표현(지수 표기 없음, 소수부 끝 0 없음)인지
+        (제시 단위마다 다르게 계산하는 ProblemRecord.display_value와 ProblemBatch는 기준값 × 제시 단위 전부,
+        제시 단위를 고르기만 하는 build_problem과 ProblemBatch 행은 기준값마다 제시 단위를 돌아가며 한 번)
+    accept: 정답을 모든 채점 경로(grade_answers, get_wrong_units_and_hints, grade_batch)가 정답으로 판정하는지
+    power: 10의 거듭제곱만큼 틀린 답(정답 × 10^k, k = ±1..±영역의 최대 자릿수 이동, 그리고 0)을
+        어떤 채점 경로(compare_fixed_values 포함)도 정답으로 판정하지 않는지
+        - 오차 허용범위 안에 들어올 수 있는 작은 정답(차이 ≥ 정답의 0.9배)만 NumPy로 골라 모든 k를 채점 경로에 넣고
+        - 모든 칸의 한 자리 아래 오답(k = -1, 허용범위에 가장 가까운 오답)은 grade_batch로 한 번에 채점함
+
+반례가 하나라도 있으면 종료 코드 1 (숫자 계산 부분을 바꾸면 CI에서 먼저 통과해야 함)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from decimal import Decimal
+from functools import partial
+import numpy as np
+from utils import fixedpoint
+from utils.cli import ordered_map
+from utils.converter import (
+    DEFAULT_TOLERANCE,
+    convert,
+    convert_capacity,
+    convert_fixed,
+    convert_length,
+    convert_weight,
+    compare_fixed_values,
+    get_wrong_units_and_hints,
+    grade_answers
+)
+from utils.generator import ProblemBatch, build_problem
+from utils.grading import grade_batch
+from utils.session import ProblemRecord
+from utils.units import QUANTITIES
+
+# 작업자에게 한 번에 넘기는 기준값 수
+DEFAULT_CHUNK_SIZE = 20000
+
+# 표본 검사에서 영역마다 더 뽑는 무작위 기준값 수
+DEFAULT_SAMPLE = 5000
+
+# 묶음마다 보고서에 남기는 반례 최대 수 (전체 개수는 모두 셈)
+MAX_EXAMPLES = 20
+
+# 영역별 이름 있는 변환 함수 (없는 영역은 convert()로 검사)
+CONVERTERS = {'length': convert_length, 'capacity': convert_capacity, 'weight': convert_weight}
+
+
+def decimal_text(scaled, scale):
+    """
+    10^scale 배 정수 배열을 Decimal 나눗셈 결과와 같은 문자열로 (지수 표기 없음, 소수부 끝 0 없음)
+    Args:
+        scaled (numpy.ndarray): 0 이상의 정수 배열
+        scale (int): 소수점 아래 자릿수 (0 이상)
+    Returns:
+        numpy.ndarray: 문자열 배열 (예: 1230000, 6 → '1.23')
+    """
+    unit = 10 ** scale
+    whole = (scaled // unit).astype(str)
+    if not scale:
+        return whole
+    frac = np.char.rstrip(np.char.zfill((scaled % unit).astype(str), scale), '0')
+    return np.where(frac == '', whole, np.char.add(np.char.add(whole, '.'), frac))
+
+
+def reference(quantity, values):
+    """
+    기준값들의 정답 기준 (정수 연산만 사용)
+    Args:
+        quantity (Quantity): 영역
+        values (numpy.ndarray): 기준 단위 정수값 (int64)
+    Returns:
+        tuple: (scale, 10^scale 배 정답 행렬 (값 × 단위), 정답 문자열 행렬)
+    """
+    exponents = np.array([unit.exponent for unit in quantity.units], dtype=np.int64)
+    scale = int(exponents.max())
+    scaled = values[:, None] * 10 ** (scale - exponents)[None, :]
+    return scale, scaled, decimal_text(scaled.ravel(), scale).reshape(scaled.shape)
+
+
+class _Report:
+    """묶음 하나의 검사 횟수와 반례"""
+
+    def __init__(self, quantity):
+        self.quantity = quantity
+        self.checks = Counter()
+        self.failures = Counter()
+        self.examples = []
+
+    def fail(self, check, path, value, unit, expected, got):
+        self.failures[check] += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append({
+                'check': check, 'path': path, 'quantity': self.quantity.key, 'value': value,
+                'unit': unit, 'expected': expected, 'got': got
+            })
+
+    def compare(self, check, path, values, texts, got):
+        """문자열 행렬 비교 (got은 texts와 같은 모양), 다른 칸마다 반례 기록"""
+        got = np.asarray(got, dtype=str).reshape(texts.shape)
+        self.checks[check] += texts.size
+        for row, column in zip(*np.nonzero(got != texts)):
+            self.fail(check, path, int(values[row]), self.quantity.symbols[column],
+                      str(texts[row, column]), str(got[row, column]))
+
+    def as_dict(self):
+        return {'checks': dict(self.checks), 'failures': dict(self.failures), 'examples': self.examples}
+
+
+def _check_scalar(report, quantity, values, codes, scale, texts, tolerance):
+    """
+    Decimal 경로를 기준값마다 한 번씩 훑음
+    exact: 변환, 문제 생성 결과
+    accept: build_problem의 정답을 입력으로, ProblemRecord의 정답을 정답으로 grade_answers와 힌트 함수가 정답 판정
+        (앱의 입력 문자열과 같은 값인지는 exact에서 문자열로 확인함)
+    """
+    count, width = texts.shape
+    symbols = quantity.symbols
+    converter = CONVERTERS.get(quantity.key) or partial(convert, quantity)
+    # 힌트 함수는 기본 허용범위만 씀
+    check_hints = tolerance == DEFAULT_TOLERANCE
+
+    converted, fixed, record_answers, record_displays, built, built_displays = [], [], [], [], [], []
+    for value, code in zip(values.tolist(), codes.tolist()):
+        conversions = converter(value)
+        if tuple(conversions) != symbols:
+            report.fail('exact', 'convert', value, '', ','.join(symbols), ','.join(conversions))
+        converted.extend(conversions.values())
+        fixed.extend(convert_fixed((value, 0), quantity.unit_exponents).values())
+
+        record = ProblemRecord(quantity, value, 0)
+        answers = record.correct_answers
+        record_answers.extend(answers)
+        for unit_code in range(width):
+            record.unit_code = unit_code
+            record_displays.append(record.display_value)
+
+        problem = build_problem(quantity, value, symbols[code])
+        if problem[quantity.value_key] != value or problem['display_value'] is not problem['correct_answers'][code]:
+            report.fail('exact', 'build_problem', value, symbols[code],
+                        str(problem['correct_answers'][code]), str(problem['display_value']))
+        user = problem['correct_answers']
+        built.extend(user)
+        built_displays.append(problem['display_value'])
+
+        for unit in grade_answers(quantity, user, answers, tolerance)[0]:
+            index = quantity.unit_index[unit]
+            report.fail('accept', 'grade_answers', value, unit, str(answers[index]), str(user[index]))
+        if check_hints:
+            hints = get_wrong_units_and_hints(user, answers, symbols, quantity.hint_messages)
+            if hints:
+                report.fail('accept', 'get_wrong_units_and_hints', value, '', '', ' / '.join(hints))
+    report.checks['accept'] += (1 + check_hints) * texts.size
+
+    report.compare('exact', getattr(converter, '__name__', 'convert'), values, texts, list(map(str, converted)))
+    report.compare('exact', 'ProblemRecord.correct_answers', values, texts, list(map(str, record_answers)))
+    report.compare('exact', 'ProblemRecord.display_value', values, texts, list(map(str, record_displays)))
+    report.compare('exact', 'build_problem', values, texts, list(map(str, built)))
+    rotated = texts[np.arange(count), codes]
+    report.checks['exact'] += count
+    for row in np.flatnonzero(np.asarray(list(map(str, built_displays))) != rotated).tolist():
+        report.fail('exact', 'build_problem', int(values[row]), symbols[codes[row]],
+                    str(rotated[row]), str(built_displays[row]))
+
+    # 고정소수점: 가수 × 10^(지수 + scale)이 정수 기준과 같아야 함 (지수가 -scale보다 작으면 틀린 것)
+    mantissas = np.array([mantissa for mantissa, _ in fixed], dtype=np.int64).reshape(count, width)
+    shifts = np.array([exponent for _, exponent in fixed], dtype=np.int64).reshape(count, width) + scale
+    fixed_scaled = np.where(shifts >= 0, mantissas * 10 ** np.maximum(shifts, 0), 0)
+    report.compare('exact', 'convert_fixed', values, texts, decimal_text(fixed_scaled, scale))
+
+
+def _check_batch(report, quantity, values, codes, scale, scaled, texts, tolerance):
+    """
+    NumPy 경로 검사
+    exact: ProblemBatch 정답 행렬과 제시값 (기준값 × 제시 단위 전부), 행 딕셔너리
+    accept / power: grade_batch가 화면 문자열 그대로의 정답은 모두 맞게, 모든 칸의 한 자리 아래 오답
+        (허용범위에 가장 가까운 10의 거듭제곱 오답)은 모두 틀리게 판정
+    """
+    count, width = texts.shape
+    symbols = quantity.symbols
+    everything = ProblemBatch(quantity, np.repeat(values, width), np.tile(np.arange(width, dtype=np.int8), count))
+    report.compare('exact', 'ProblemBatch.answers', values, texts,
+                   decimal_text(everything.answers[::width] * 10 ** (scale - everything.scale), scale))
+    report.compare('exact', 'ProblemBatch.display_values', values, texts,
+                   decimal_text(everything.display_values * 10 ** (scale - everything.scale), scale))
+
+    key = ProblemBatch(quantity, values, codes.astype(np.int8))
+    report.compare('exact', 'ProblemBatch[]', values, texts,
+                   [str(answer) for problem in key for answer in problem['correct_answers']])
+
+    for check, label, submitted in (
+        ('accept', 'grade_batch', texts),
+        ('power', 'grade_batch', decimal_text(scaled.ravel(), scale + 1).reshape(texts.shape))
+    ):
+        result = grade_batch(zip(values.tolist(), range(count), submitted.tolist()), key, tolerance)
+        report.checks[check] += result.correct.size
+        failed = ~result.correct if check == 'accept' else result.correct
+        for row, column in zip(*np.nonzero(failed)):
+            report.fail(check, label, int(values[row]), symbols[column],
+                        str(texts[row, column]), str(submitted[row, column]))
+
+
+def _max_shift(quantity):
+    """영역에서 가장 큰 단위 간 자릿수 이동"""
+    exponents = [unit.exponent for unit in quantity.units]
+    return max(exponents) - min(exponents)
+
+
+def _check_power(report, quantity, values, codes, scale, scaled, texts, tolerance):
+    """
+    오차 허용범위에 들어오는 10의 거듭제곱 오답(정답 × 10^k, 그리고 0)을 모든 채점 경로가 틀리게 판정하는지
+    정답 c와 c × 10^k의 차이는 c × |10^k - 1| ≥ 0.9c 이므로 허용범위에 들 수 있는 칸은 c ≤ 허용범위 / 0.9 뿐
+    (그런 칸만 NumPy로 골라 모든 k를 넣음, compare_fixed_values는 이 칸들의 정답도 함께 확인)
+    """
+    symbols = quantity.symbols
+    tolerance_dec, tolerance_fixed = fixedpoint.tolerance(tolerance)
+    max_shift = _max_shift(quantity)
+    shifts = [shift for shift in range(-max_shift, max_shift + 1) if shift]
+    check_hints = tolerance == DEFAULT_TOLERANCE
+
+    common = max(scale, -tolerance_fixed[1])
+    tolerance_scaled = tolerance_fixed[0] * 10 ** (tolerance_fixed[1] + common)
+    near = scaled * 10 ** (common - scale) * 9 <= tolerance_scaled * 10
+    candidates = []
+    for row, column in zip(*np.nonzero(near)):
+        value = int(values[row])
+        unit = symbols[column]
+        answers = ProblemRecord(quantity, value, 0).correct_answers
+        correct = answers[column]
+        correct_fixed = fixedpoint.from_decimal(correct)
+        report.checks['accept'] += 1
+        if not compare_fixed_values(fixedpoint.parse(str(texts[row, column])), correct_fixed, tolerance):
+            report.fail('accept', 'compare_fixed_values', value, unit, str(correct), str(texts[row, column]))
+        for wrong in [correct.scaleb(shift) for shift in shifts] + [Decimal(0)]:
+            if abs(wrong - correct) > tolerance_dec:
+                continue
+            text = format(wrong, 'f')
+            user = texts[row].tolist()
+            user[column] = text
+            report.checks['power'] += 3 + check_hints
+            if unit not in grade_answers(quantity, user, answers, tolerance)[0]:
+                report.fail('power', 'grade_answers', value, unit, str(correct), text)
+            if check_hints and not get_wrong_units_and_hints(user, answers, symbols, quantity.hint_messages):
+                report.fail('power', 'get_wrong_units_and_hints', value, unit, str(correct), text)
+            if compare_fixed_values(fixedpoint.parse(text), correct_fixed, tolerance):
+                report.fail('power', 'compare_fixed_values', value, unit, str(correct), text)
+            candidates.append((row, column, user))
+
+    if candidates:
+        key = ProblemBatch(quantity, values, codes.astype(np.int8))
+        result = grade_batch(((int(values[row]), row, user) for row, column, user in candidates), key, tolerance)
+        columns = [column for _, column, _ in candidates]
+        accepted = result.correct[np.arange(len(candidates)), columns]
+        for (row, column, user), wrong in zip(candidates, accepted.tolist()):
+            if wrong:
+                report.fail('power', 'grade_batch', int(values[row]), symbols[column],
+                            str(texts[row, column]), user[column])
+
+
+def sample_values(quantity, sample=DEFAULT_SAMPLE, seed=0, tolerance=DEFAULT_TOLERANCE):
+    """
+    표본 검사에 쓸 기준값 (반례가 나기 쉬운 값은 항상 포함)
+    - 값 범위의 양 끝과 10의 거듭제곱 ±1
+    - 가장 작은 단위의 정답이 오차 허용범위에 들 수 있는 기준값 전부
+      (10의 거듭제곱 오답과의 차이는 정답의 0.9배 이상이므로 기준값 ≤ 허용범위 × 10^최대지수 / 0.9, 그 다음 값까지)
+    - (시드, 영역 순서)로 정한 무작위 기준값 sample개
+    Args:
+        quantity (Quantity): 영역
+        sample (int): 무작위 기준값 수
+        seed (int): 난수 시드
+        tolerance (str): 오차 허용범위
+    Returns:
+        numpy.ndarray: 중복 없이 정렬된 기준값 (int64)
+    """
+    low, high = quantity.value_range
+    max_exponent = max(unit.exponent for unit in quantity.units)
+    near = int(fixedpoint.tolerance(tolerance)[0].scaleb(max_exponent) * 10 / 9) + 1
+    powers = [10 ** digits + offset for digits in range(len(str(high)) + 1) for offset in (-1, 0, 1)]
+    rng = np.random.default_rng([seed, list(QUANTITIES).index(quantity.key)])
+    values = np.concatenate([
+        np.array([low, high] + powers, dtype=np.int64),
+        np.arange(low, min(near, high) + 1, dtype=np.int64),
+        rng.integers(low, high + 1, size=sample, dtype=np.int64)
+    ])
+    return np.unique(values[(values >= low) & (values <= high)])
+
+
+def verify_chunk(task):
+    """
+    기준값 묶음 하나 검사 (작업자 프로세스에서 실행)
+    Args:
+        task (tuple): (영역 키, 기준값 배열, 오차 허용범위)
+    Returns:
+        dict: {'quantity', 'values', 'checks', 'failures', 'examples'}
+    """
+    key, values, tolerance = task
+    quantity = QUANTITIES[key]
+    # build_problem, ProblemBatch 행의 제시 단위는 기준값마다 돌아가며 고름
+    codes = values % len(quantity.units)
+    scale, scaled, texts = reference(quantity, values)
+
+    report = _Report(quantity)
+    _check_scalar(report, quantity, values, codes, scale, texts, tolerance)
+    _check_batch(report, quantity, values, codes, scale, scaled, texts, tolerance)
+    _check_power(report, quantity, values, codes, scale, scaled, texts, tolerance)
+    return {'quantity': key, 'values': len(values), **report.as_dict()}
+
+
+def verify_tasks(quantities, chunk_size, tolerance=DEFAULT_TOLERANCE, sample=DEFAULT_SAMPLE, seed=0):
+    """영역별 기준값(sample이 None이면 값 범위 전체, 아니면 sample_values())을 chunk_size개씩 나눈 작업 목록"""
+    for key in quantities:
+        quantity = QUANTITIES[key]
+        if sample is None:
+            low, high = quantity.value_range
+            for start in range(low, high + 1, chunk_size):
+                yield key, np.arange(start, min(start + chunk_size, high + 1), dtype=np.int64), tolerance
+            continue
+        values = sample_values(quantity, sample, seed, tolerance)
+        for start in range(0, len(values), chunk_size):
+            yield key, values[start:start + chunk_size], tolerance
+
+
+def verify(quantities=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, tolerance=DEFAULT_TOLERANCE,
+           sample=DEFAULT_SAMPLE, seed=0):
+    """
+    영역의 정의역 검사 (표본 또는 전수)
+    Args:
+        quantities (list 또는 None): 영역 키 목록 (None이면 모두)
+        workers (int): 작업자 프로세스 수
+        chunk_size (int): 작업자에게 한 번에 넘기는 기준값 수
+        tolerance (str): 채점 경로에 넘길 오차 허용범위
+        sample (int 또는 None): 영역마다 뽑는 무작위 기준값 수 (None이면 값 범위 전체를 검사)
+        seed (int): 표본 난수 시드
+    Returns:
+        dict: {영역 키: {'values', 'domain', 'cells', 'checks', 'failures', 'examples'}}
+    """
+    quantities = quantities or list(QUANTITIES)
+    summary = {
+        key: {
+            'values': 0, 'domain': QUANTITIES[key].value_range[1] - QUANTITIES[key].value_range[0] + 1,
+            'cells': 0, 'checks': Counter(), 'failures': Counter(), 'examples': []
+        }
+        for key in quantities
+    }
+    tasks = verify_tasks(quantities, chunk_size, tolerance, sample, seed)
+    for result in ordered_map(verify_chunk, tasks, workers):
+        total = summary[result['quantity']]
+        total['values'] += result['values']
+        total['cells'] += result['values'] * len(QUANTITIES[result['quantity']].units)
+        total['checks'].update(result['checks'])
+        total['failures'].update(result['failures'])
+        total['examples'].extend(result['examples'][:MAX_EXAMPLES - len(total['examples'])])
+    for total in summary.values():
+        total['checks'] = dict(total['checks'])
+        total['failures'] = dict(total['failures'])
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m utils.verify', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quantity', nargs='*', choices=list(QUANTITIES), help='영역 (생략 시 모두)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='작업자 프로세스 수 (기본: 코어 수)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='작업자에게 한 번에 넘기는 기준값 수')
+    parser.add_argument('--tolerance', default=DEFAULT_TOLERANCE, help='오차 허용범위')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                      help=f'영역마다 뽑는 무작위 기준값 수 (기본: {DEFAULT_SAMPLE})')
+    mode.add_argument('--full', action='store_true', help='값 범위 전체를 검사 (코어 하나로 약 65초)')
+    parser.add_argument('--seed', type=int, default=0, help='표본 난수 시드 (기본: 0)')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size는 1 이상이어야 합니다.')
+    if args.sample < 0:
+        parser.error('--sample은 0 이상이어야 합니다.')
+
+    start = time.perf_counter()
+    summary = verify(args.quantity, args.workers, args.chunk_size, args.tolerance,
+                     None if args.full else args.sample, args.seed)
+    elapsed = time.perf_counter() - start
+    failures = sum(sum(total['failures'].values()) for total in summary.values())
+
+    if args.json:
+        json.dump({'seconds': elapsed, 'failures': failures, 'quantities': summary}, sys.stdout,
+                  ensure_ascii=False, indent=2)
+        print()
+        return 1 if failures else 0
+    for key, total in summary.items():
+        checks = ', '.join(f"{name} {count:,}" for name, count in total['checks'].items())
+        status = '통과' if not total['failures'] else \
+            '반례 ' + ', '.join(f"{name} {count:,}" for name, count in total['failures'].items())
+        values = f"{total['values']:,}개" if total['values'] == total['domain'] else \
+            f"{total['values']:,}개 (전체 {total['domain']:,}개 중 표본)"
+        print(f"{QUANTITIES[key].name}: 기준값 {values} × 단위 {len(QUANTITIES[key].units)}개 "
+              f"({checks}) - {status}")
+        for example in total['examples']:
+            print(f"  [{example['check']}] {example['path']}: {example['value']}{QUANTITIES[key].units[0].symbol} "
+                  f"→ {example['unit']} 정답 {example['expected']}, 받은 값 {example['got']}")
+    mode = '전수' if args.full else f'표본 {args.sample:,}개, 시드 {args.seed}'
+    print(f"{elapsed:.2f}초 ({mode}, 작업자 {args.workers}개)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())